@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from telegram import Update
+from telegram.ext import Application
+from telegram.warnings import PTBUserWarning
+
+sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from benchmarks.stand_ins import FakeBot, SimulatedProcessor, StandInServer, configure
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+from elitemikobot.job_queue import StickerJobQueue
+
+
+@dataclass
+class RequestRecord:
+    user_id: int
+    dccon_id: int
+    arrived_at: float
+    handled_at: float = 0.0
+    result: str = ""   # started | coalesced | rejected
+    fast: bool = False
+    finished_at: Optional[float] = None
+    success: bool = False
+
+
+def percentiles(values: List[float]) -> dict:
+    if not values:
+        return {}
+
+    ordered = sorted(values)
+    def pick(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))], 4)
+
+    return {"p50": pick(50), "p90": pick(90), "p99": pick(99), "max": round(ordered[-1], 4), "count": len(ordered)}
+
+
+# 이벤트 루프 응답성, interval마다 깨어나 예정보다 늦어진 시간을 기록
+class LoopLagMonitor:
+    def __init__(self, interval_sec: float = 0.01) -> None:
+        self.interval_sec = interval_sec
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval_sec)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval_sec))
+
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+class LoadTest:
+    def __init__(self, args: argparse.Namespace, work_dir: Path) -> None:
+        self.args = args
+        self.work_dir = work_dir
+        self.records: List[RequestRecord] = []
+        self.owners: Dict[int, RequestRecord] = {}   # dccon_id → 작업을 시작한 요청
+        self.started_at: Dict[int, float] = {}       # dccon_id → 대기열 슬롯을 받은 시각
+        self._update_ids = iter(range(1, 1_000_000))
+
+
+    # /create 명령 Update 생성 (사용자 id = 채팅 id)
+    def _make_update(self, bot: FakeBot, user_id: int, dccon_id: int, fast: bool = False) -> Update:
+        text = f"/create -f {dccon_id}" if fast else f"/create {dccon_id}"
+        return Update.de_json({
+            "update_id": next(self._update_ids),
+            "message": {
+                "message_id": next(self._update_ids),
+                "date": int(datetime.now(timezone.utc).timestamp()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}", "username": f"user{user_id}"},
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len("/create")}]
+            }
+        }, bot)
+
+
+    # 작업 시작/종료 시각을 기록하도록 처리 메서드를 감쌈
+    def _instrument(self, bot: EliteMikoBot) -> None:
+        process_sticker_request = bot._process_sticker_request
+        img_processing = bot._img_processing
+
+        async def timed_process_sticker_request(chat_id, sticker_data, manifest=None, **kwargs):
+            subscribers = BotConfig.sticker_subscribers[sticker_data.id]
+            try:
+                await process_sticker_request(chat_id, sticker_data, manifest, **kwargs)
+            finally:
+                now = time.perf_counter()
+                success = sticker_data.url.startswith("https://t.me/addstickers/")
+                for record in self.records:
+                    if record.dccon_id == sticker_data.id and record.user_id in subscribers and record.finished_at is None:
+                        record.finished_at, record.success = now, success
+
+        async def timed_img_processing(sticker_data, manifest):
+            self.started_at.setdefault(sticker_data.id, time.perf_counter())
+            return await img_processing(sticker_data, manifest)
+
+        bot._process_sticker_request = timed_process_sticker_request
+        bot._img_processing = timed_img_processing
+
+
+    async def _handle(self, application: Application, bot: FakeBot, user_id: int, dccon_id: int, fast: bool = False) -> None:
+        record = RequestRecord(user_id=user_id, dccon_id=dccon_id, arrived_at=time.perf_counter(), fast=fast)
+        self.records.append(record)
+
+        await application.process_update(self._make_update(bot, user_id, dccon_id, fast))
+        record.handled_at = time.perf_counter()
+
+        running = BotConfig.sticker_task_data.get(dccon_id)
+        if user_id not in BotConfig.sticker_subscribers.get(dccon_id, set()):
+            record.result = "rejected"
+        elif running is not None and running.user_id == user_id:
+            record.result = "started"
+            self.owners[dccon_id] = record
+        else:
+            record.result = "coalesced"
+
+
+    async def run(self) -> dict:
+        args = self.args
+        rng = random.Random(args.seed)
+
+        server = StandInServer(db_latency_sec=args.db_latency_ms / 1000)
+        await server.start()
+        configure(self.work_dir, server)
+        BotConfig.job_queue = StickerJobQueue(
+            slots=args.slots,
+            max_depth=args.queue_size,
+            wait_timeout=BotConfig.QUEUE_WAIT_TIMEOUT,
+            aging_rate=args.aging_rate
+        )
+        BotConfig.fast_job_queue = StickerJobQueue(
+            slots=args.fast_slots,
+            max_depth=args.queue_size,
+            wait_timeout=BotConfig.QUEUE_WAIT_TIMEOUT,
+            aging_rate=args.aging_rate
+        )
+
+        fake_bot = FakeBot(latency_sec=args.telegram_latency_ms / 1000)
+        bot = EliteMikoBot(BotConfig.BOT_TOKEN)
+        bot.bot = fake_bot
+        bot.application = Application.builder().bot(fake_bot).build()
+        bot._setup_handlers()
+        bot.processor = SimulatedProcessor(
+            BotConfig.STICKER_IMG_PATH, work_sec=args.work_sec, seed=args.seed, fast_work_sec=args.fast_work_sec
+        )
+        self._instrument(bot)
+
+        await bot.application.initialize()
+        await bot._post_init(bot.application)
+        monitor = LoopLagMonitor()
+        monitor.start()
+
+        started = time.perf_counter()
+        handlers = []
+        try:
+            # 도착 간격은 지수 분포 (rate가 0이면 모든 요청이 동시에 도착)
+            # 빠른 생성(-f) 요청은 다른 디시콘 번호 범위를 사용 (옵션이 다르면 합쳐지지 않으므로)
+            for user_id in range(1, args.users + 1):
+                fast = rng.random() < args.fast_share
+                dccon_id = (9200000 if fast else 9100000) + rng.randrange(args.dccons)
+                handlers.append(asyncio.create_task(self._handle(bot.application, fake_bot, user_id, dccon_id, fast)))
+                if args.rate > 0:
+                    await asyncio.sleep(rng.expovariate(args.rate))
+
+            await asyncio.gather(*handlers)
+            while BotConfig.sticker_tasks and time.perf_counter() - started < args.timeout:
+                await asyncio.sleep(0.05)
+        finally:
+            elapsed = time.perf_counter() - started
+            await monitor.stop()
+            for task in list(BotConfig.sticker_tasks.values()):
+                task.cancel()
+            await bot._post_shutdown(bot.application)
+            await bot.application.shutdown()
+            await server.stop()
+
+        return self._report(elapsed, monitor)
+
+
+    def _report(self, elapsed: float, monitor: LoopLagMonitor) -> dict:
+        counts = {result: sum(1 for r in self.records if r.result == result) for result in ("started", "coalesced", "rejected")}
+        accepted = [r for r in self.records if r.result != "rejected"]
+        finished = [r for r in accepted if r.finished_at is not None]
+
+        return {
+            "config": {key: value for key, value in vars(self.args).items() if key != "out"},
+            "elapsed_sec": round(elapsed, 3),
+            "requests": len(self.records),
+            "results": counts,
+            "acceptance_rate": round(len(accepted) / len(self.records), 4) if self.records else 0,
+            "completed": sum(1 for r in finished if r.success),
+            "failed": sum(1 for r in finished if not r.success),
+            "unfinished": len(accepted) - len(finished),
+            "handler_latency_sec": percentiles([r.handled_at - r.arrived_at for r in self.records]),
+            "queue_delay_sec": percentiles([
+                self.started_at[dccon_id] - r.arrived_at for dccon_id, r in self.owners.items() if dccon_id in self.started_at
+            ]),
+            "end_to_end_sec": percentiles([r.finished_at - r.arrived_at for r in finished if r.success]),
+            "fast_end_to_end_sec": percentiles([r.finished_at - r.arrived_at for r in finished if r.success and r.fast]),
+            "loop_lag_sec": percentiles(monitor.lags)
+        }
+
+
+# python -m benchmarks.load_test --users 50 --rate 0 --slots 3 --work-sec 2
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for EliteMikoBot handlers")
+    parser.add_argument("--users", type=int, default=50, help="number of distinct users sending /create")
+    parser.add_argument("--rate", type=float, default=0, help="arrivals per second (0: all at once)")
+    parser.add_argument("--dccons", type=int, default=20, help="number of distinct dccon ids requested")
+    parser.add_argument("--work-sec", type=float, default=1.0, help="mean simulated processing time per job")
+    parser.add_argument("--slots", type=int, default=BotConfig.MAX_CONCURRENT_TASKS)
+    parser.add_argument("--queue-size", type=int, default=BotConfig.QUEUE_MAX_SIZE)
+    parser.add_argument("--fast-share", type=float, default=0.0, help="fraction of requests sent with -f")
+    parser.add_argument("--fast-work-sec", type=float, default=0.1, help="mean simulated processing time per -f job")
+    parser.add_argument("--fast-slots", type=int, default=BotConfig.FAST_CONCURRENT_TASKS)
+    parser.add_argument("--aging-rate", type=float, default=BotConfig.QUEUE_AGING_RATE, help="large values approach FIFO order")
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    parser.add_argument("--telegram-latency-ms", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=600, help="max seconds to wait for jobs to finish")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", type=Path, help="JSON report path (default: stdout)")
+    args = parser.parse_args()
+
+    # JobQueue 없이 실행하므로 conversation_timeout 경고는 무시
+    warnings.filterwarnings("ignore", category=PTBUserWarning)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="elitemikobot-load-"))
+    try:
+        report = asyncio.run(LoadTest(args, work_dir).run())
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
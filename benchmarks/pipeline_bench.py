@@ -0,0 +1,244 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from benchmarks.stand_ins import CORPUS_PRESETS, DcconSpec, FakeBot, StandInServer, configure
+from elitemikobot.dccon import Dccon
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.memory import current_rss
+from elitemikobot.metrics import STAGE_SECONDS
+from elitemikobot.render_cache import RenderCache
+from elitemikobot.sticker_data import StickerData
+from elitemikobot.upscale_backend import BACKENDS, UpscaleConfig
+from elitemikobot.upscaler import Upscaler
+
+
+# RSS를 주기적으로 읽어 구간별 최대 RSS 측정
+class RssSampler:
+    def __init__(self, interval_sec: float = 0.01) -> None:
+        self.interval_sec = interval_sec
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval_sec)
+
+
+    def __enter__(self):
+        self.peak = current_rss()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+
+# 구간별 wall/CPU 시간, 최대 RSS (ffmpeg 자식 프로세스 CPU 포함)
+# minor_faults: 새로 할당한 메모리를 처음 건드릴 때 생기는 페이지 폴트 수 (할당 부담 지표)
+@contextmanager
+def measure(stages: Dict[str, dict], name: str) -> Iterator[None]:
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    faults = resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+    wall, cpu = time.perf_counter(), time.process_time()
+
+    with RssSampler() as sampler:
+        yield
+
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    stages[name] = {
+        "wall_sec": round(time.perf_counter() - wall, 4),
+        "cpu_sec": round(time.process_time() - cpu, 4),
+        "child_cpu_sec": round(
+            (children_after.ru_utime + children_after.ru_stime) - (children.ru_utime + children.ru_stime), 4
+        ),
+        "peak_rss_mb": round(sampler.peak / (1024 * 1024), 1),
+        "minor_faults": resource.getrusage(resource.RUSAGE_SELF).ru_minflt - faults
+    }
+
+
+# 파이프라인 내부 단계(stage_timer) 합계
+def _stage_totals() -> Dict[str, tuple]:
+    return {labels[0]: totals for labels, totals in STAGE_SECONDS.totals().items()}
+
+
+def _stage_breakdown(before: Dict[str, tuple], after: Dict[str, tuple]) -> Dict[str, dict]:
+    breakdown = {}
+    for stage, (count, total) in after.items():
+        prev_count, prev_total = before.get(stage, (0, 0.0))
+        if count - prev_count:
+            breakdown[stage] = {"count": count - prev_count, "sum_sec": round(total - prev_total, 4)}
+    return breakdown
+
+
+async def _run_case(bot: EliteMikoBot, spec: DcconSpec, input_bytes: int, cache: Optional[RenderCache] = None, fast: bool = False,
+                    backend: Optional[str] = None) -> dict:
+    sticker_data = StickerData(id=spec.id, user_id=1, user_name="benchmark", merge_nums=list(spec.merge_nums))
+    manifest = JobManifest.create(BotConfig.JOB_PATH, 0, sticker_data)
+    stages: Dict[str, dict] = {}
+    before = _stage_totals()
+
+    with measure(stages, "dccon"):
+        dccon_data = await Dccon().process_dccon(dccon_id=spec.id, save_path=str(BotConfig.IMG_PATH / str(spec.id)))
+    if dccon_data is None or dccon_data.err:
+        raise RuntimeError(f"dccon stage failed: {spec.name}")
+    sticker_data.update_from_dccon_data(dccon_data)
+
+    sticker_path = BotConfig.STICKER_IMG_PATH / str(spec.id)
+    with measure(stages, "upscale"):
+        async with bot.workspaces.use(spec.id) as workspace:
+            upscaler = Upscaler(
+                dccon_data=dccon_data,
+                sticker_path=str(sticker_path),
+                merge_nums=sticker_data.merge_nums,
+                checkpoint=manifest,
+                scratch_path=str(workspace.path),
+                cache=cache,
+                fast=fast,
+                backend=backend
+            )
+            if not await upscaler.upscaler():
+                raise RuntimeError(f"upscale stage failed: {spec.name}")
+
+    # Upscaler는 인코딩 실패를 로그로만 남기므로 결과 파일로 확인
+    outputs = [sticker_path / sticker_data.sticker_file_name(num) for num in sticker_data.sticker_nums()]
+    missing = [path.name for path in outputs if not path.exists()]
+    if missing:
+        raise RuntimeError(f"missing outputs for {spec.name}: {missing} (is ffmpeg on PATH?)")
+
+    with measure(stages, "prepare"):
+        stickers = await bot._prepare_stickers(sticker_data, manifest)
+
+    sizes = [path.stat().st_size for path in outputs]
+
+    return {
+        "name": spec.name,
+        "id": spec.id,
+        "items": len(spec.items),
+        "frames": sum(item.frames for item in spec.items),
+        "input_bytes": input_bytes,
+        "stages": stages,
+        "pipeline_stages": _stage_breakdown(before, _stage_totals()),
+        "outputs": {
+            "stickers": len(stickers),
+            "total_bytes": sum(sizes),
+            "max_bytes": max(sizes, default=0)
+        }
+    }
+
+
+async def run_benchmark(preset: str, repeat: int, work_dir: Path, render_cache: bool = False, fast: bool = False,
+                        backend: Optional[str] = None) -> dict:
+    server = StandInServer()
+    await server.start()
+    try:
+        configure(work_dir, server)
+        specs = CORPUS_PRESETS[preset]
+        input_sizes = {spec.id: server.add_dccon(spec) for spec in specs}
+
+        bot = EliteMikoBot(BotConfig.BOT_TOKEN)
+        bot.bot = FakeBot()
+        # 두 번째 반복부터는 캐시에서 복사 (/create -o 재생성)
+        cache = RenderCache(BotConfig.RENDER_CACHE_PATH, BotConfig.RENDER_CACHE_QUOTA_MB) if render_cache else None
+
+        cases: List[dict] = []
+        for run in range(repeat):
+            for spec in specs:
+                result = await _run_case(bot, spec, input_sizes[spec.id], cache, fast, backend)
+                result["run"] = run
+                cases.append(result)
+                await bot._delete_job_files(spec.id)
+    finally:
+        await server.stop()
+
+    totals: Dict[str, dict] = {}
+    for case in cases:
+        for stage, values in case["stages"].items():
+            total = totals.setdefault(stage, {"wall_sec": 0.0, "cpu_sec": 0.0, "child_cpu_sec": 0.0, "peak_rss_mb": 0.0, "minor_faults": 0})
+            for key in ("wall_sec", "cpu_sec", "child_cpu_sec", "minor_faults"):
+                total[key] = round(total[key] + values[key], 4)
+            total["peak_rss_mb"] = max(total["peak_rss_mb"], values["peak_rss_mb"])
+
+    return {
+        "preset": preset,
+        "repeat": repeat,
+        "render_cache": render_cache,
+        "fast": fast,
+        "backend": backend or UpscaleConfig.BACKEND,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "cases": cases,
+        "totals": totals
+    }
+
+
+# 기준 결과 대비 단계별 wall 시간이 threshold 배 이상 늘어난 항목
+def compare(report: dict, baseline: dict, threshold: float) -> List[str]:
+    regressions = []
+    for stage, values in report["totals"].items():
+        base = baseline.get("totals", {}).get(stage)
+        if base and base["wall_sec"] > 0 and values["wall_sec"] / base["wall_sec"] > threshold:
+            regressions.append(f"{stage}: {base['wall_sec']}s → {values['wall_sec']}s")
+    return regressions
+
+
+# python -m benchmarks.pipeline_bench --preset small --out bench.json [--baseline old.json]
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline Dccon → Upscaler → Converter → sticker prep benchmark")
+    parser.add_argument("--preset", choices=sorted(CORPUS_PRESETS), default="small")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--out", type=Path, help="JSON report path (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="allowed wall time ratio against the baseline")
+    parser.add_argument("--render-cache", action="store_true", help="reuse finished stickers across --repeat runs")
+    parser.add_argument("--fast", action="store_true", help="resample instead of waifu2x (/create -f)")
+    parser.add_argument("--backend", choices=sorted(BACKENDS) + ["auto"], help="upscale backend (default: UPSCALE_BACKEND)")
+    parser.add_argument("--work-dir", type=Path, help="keep intermediate files here instead of a temp dir")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or Path(tempfile.mkdtemp(prefix="elitemikobot-bench-"))
+    try:
+        report = asyncio.run(run_benchmark(args.preset, args.repeat, work_dir, args.render_cache, args.fast, args.backend))
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"regression {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
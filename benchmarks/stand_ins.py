@@ -0,0 +1,419 @@
+import asyncio
+import io
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+from aiohttp import web
+from PIL import Image, ImageDraw
+from telegram import Bot, Chat, File, Message, User
+
+from elitemikobot.dccon import Dccon
+from elitemikobot.dccon_data import DcconData
+from elitemikobot.elitemikobot import BotConfig
+from elitemikobot.job_estimate import JobEstimate
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.option_flag import OptionFlag
+from elitemikobot.sticker_data import StickerData
+
+
+# 디시콘 하나의 이미지 구성 (kind: png | gif)
+@dataclass
+class ItemSpec:
+    kind: str
+    size: Tuple[int, int]
+    frames: int = 1
+    frame_ms: Optional[int] = None    # 없으면 40/60/100ms 중 무작위
+
+
+@dataclass
+class DcconSpec:
+    id: int
+    name: str
+    items: List[ItemSpec]
+    merge_nums: List[int] = field(default_factory=list)
+
+
+# 실제 디시콘과 비슷하게 도형 + 노이즈로 이미지 생성 (압축률이 지나치게 좋아지지 않도록)
+def _render_frame(size: Tuple[int, int], index: int, rng: random.Random) -> Image.Image:
+    width, height = size
+    img = Image.new("RGBA", size, (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+
+    for _ in range(6):
+        x, y = rng.randrange(width), rng.randrange(height)
+        r = rng.randrange(max(4, width // 8), max(5, width // 3))
+        color = (rng.randrange(256), rng.randrange(256), rng.randrange(256), 255)
+        draw.ellipse((x - r + index * 3, y - r, x + r + index * 3, y + r), fill=color)
+
+    noise = Image.effect_noise(size, 32).convert("L")
+    img.putalpha(Image.composite(img.getchannel("A"), noise, img.getchannel("A")))
+    return img
+
+
+def render_item(spec: ItemSpec, seed: int) -> bytes:
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+
+    if spec.kind == "gif":
+        frames = [_render_frame(spec.size, i, rng) for i in range(spec.frames)]
+        frames[0].save(
+            buffer, format="GIF", save_all=True, append_images=frames[1:],
+            duration=[spec.frame_ms or rng.choice([40, 60, 100]) for _ in frames], loop=0, disposal=2
+        )
+    else:
+        _render_frame(spec.size, 0, rng).save(buffer, format="PNG")
+
+    return buffer.getvalue()
+
+
+# 벤치마크/부하 테스트용 디시콘 세트
+CORPUS_PRESETS: Dict[str, List[DcconSpec]] = {
+    "small": [
+        DcconSpec(9000001, "static_small", [ItemSpec("png", (100, 100)), ItemSpec("png", (160, 160))]),
+        DcconSpec(9000002, "gif_short", [ItemSpec("gif", (100, 100), 8)]),
+        DcconSpec(9000003, "gif_merge", [ItemSpec("gif", (100, 100), 6), ItemSpec("gif", (100, 100), 6)], merge_nums=[1]),
+    ],
+    "full": [
+        DcconSpec(9000011, "static_mixed", [ItemSpec("png", (100, 100)), ItemSpec("png", (200, 200)), ItemSpec("png", (300, 300))]),
+        DcconSpec(9000012, "static_merge", [ItemSpec("png", (150, 150)), ItemSpec("png", (150, 150))], merge_nums=[1]),
+        DcconSpec(9000013, "gif_short", [ItemSpec("gif", (100, 100), 10)]),
+        DcconSpec(9000014, "gif_long", [ItemSpec("gif", (100, 100), 60)]),
+        DcconSpec(9000015, "gif_large", [ItemSpec("gif", (250, 250), 24)]),
+        DcconSpec(9000016, "gif_merge", [ItemSpec("gif", (120, 120), 20), ItemSpec("gif", (120, 120), 20)], merge_nums=[1]),
+        DcconSpec(9000017, "mixed_pack", [ItemSpec("png", (100, 100))] * 4 + [ItemSpec("gif", (100, 100), 12)] * 4),
+        DcconSpec(9000018, "gif_fast", [ItemSpec("gif", (100, 100), 90, frame_ms=20)]),
+    ],
+}
+
+
+# 디시콘 서버(package_detail, dccon.php)와 DB API를 대신하는 로컬 서버
+class StandInServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, db_latency_sec: float = 0.0) -> None:
+        self.host = host
+        self.port = port
+        self.db_latency_sec = db_latency_sec
+        self.images: Dict[str, Tuple[str, bytes]] = {}   # path → (ext, data)
+        self.packages: Dict[int, dict] = {}
+        self.registered: List[dict] = []
+        self._runner: Optional[web.AppRunner] = None
+
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+
+    def add_dccon(self, spec: DcconSpec) -> int:
+        detail = []
+        total = 0
+        for num, item in enumerate(spec.items, start=1):
+            path = f"{spec.id}_{num}"
+            data = render_item(item, seed=spec.id * 100 + num)
+            self.images[path] = (item.kind, data)
+            detail.append({"path": path, "ext": item.kind})
+            total += len(data)
+
+        self.packages[spec.id] = {"info": {"title": spec.name}, "detail": detail}
+        return total
+
+
+    async def _package_detail(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        package = self.packages.get(int(form.get("package_idx", 0)))
+        # 실제 서버처럼 JSON을 text/html로 응답
+        return web.json_response(package, content_type="text/html")
+
+
+    async def _dccon_image(self, request: web.Request) -> web.Response:
+        image = self.images.get(request.query.get("no", ""))
+        if image is None:
+            return web.Response(status=404)
+        return web.Response(body=image[1], content_type=f"image/{image[0]}")
+
+
+    async def _db_delay(self) -> None:
+        if self.db_latency_sec:
+            await asyncio.sleep(self.db_latency_sec)
+
+
+    async def _sticker_exists(self, request: web.Request) -> web.Response:
+        await self._db_delay()
+        return web.json_response({"exists": False})
+
+
+    async def _sticker_url(self, request: web.Request) -> web.Response:
+        await self._db_delay()
+        return web.Response(status=404)
+
+
+    async def _check_url(self, request: web.Request) -> web.Response:
+        await self._db_delay()
+        return web.json_response({"exists": False})
+
+
+    async def _check_urls(self, request: web.Request) -> web.Response:
+        await self._db_delay()
+        return web.json_response({"exists": []})
+
+
+    async def _changes(self, request: web.Request) -> web.Response:
+        await self._db_delay()
+        return web.json_response([])
+
+
+    async def _register(self, request: web.Request) -> web.Response:
+        await self._db_delay()
+        payload = await request.json()
+        self.registered.append(payload)
+        return web.json_response(payload, status=201)
+
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/index/package_detail", self._package_detail)
+        app.router.add_get("/dccon.php", self._dccon_image)
+        app.router.add_get("/api/stickers/changes", self._changes)
+        app.router.add_get("/api/stickers/checkurl", self._check_url)
+        app.router.add_post("/api/stickers/checkurls", self._check_urls)
+        app.router.add_get("/api/stickers/{id}/{flag}/exists", self._sticker_exists)
+        app.router.add_get("/api/stickers/{id}/{flag}/url", self._sticker_url)
+        app.router.add_post("/api/stickers/", self._register)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# 텔레그램 API 대신 호출만 기록하는 봇 (네트워크 요청 없음)
+class FakeBot(Bot):
+    def __init__(self, latency_sec: float = 0.0) -> None:
+        super().__init__(token="0:stand-in")
+        with self._unfrozen():
+            self.latency_sec = latency_sec
+            self.calls: List[Tuple[str, dict]] = []
+            self.call_times: List[float] = []   # calls와 같은 순서의 호출 시각 (perf_counter)
+            self.sticker_sets: Dict[str, list] = {}
+            self._ids = itertools.count(1)
+            self._me = User(id=0, first_name="EliteMikoBot", is_bot=True, username="stand_in_bot")
+
+
+    async def _call(self, method: str, **kwargs) -> None:
+        self.calls.append((method, kwargs))
+        self.call_times.append(time.perf_counter())
+        if self.latency_sec:
+            await asyncio.sleep(self.latency_sec)
+
+
+    async def initialize(self) -> None:
+        pass
+
+
+    async def shutdown(self) -> None:
+        pass
+
+
+    async def get_me(self, *args, **kwargs) -> User:
+        return self._me
+
+
+    @property
+    def bot(self) -> User:
+        return self._me
+
+
+    def _message(self, chat_id: int, text: str) -> Message:
+        message = Message(
+            message_id=next(self._ids),
+            date=datetime.now(timezone.utc),
+            chat=Chat(id=chat_id, type=Chat.PRIVATE),
+            from_user=self._me,
+            text=text
+        )
+        message.set_bot(self)
+        return message
+
+
+    async def send_message(self, chat_id, text, *args, **kwargs) -> Message:
+        await self._call("send_message", chat_id=chat_id, text=text)
+        return self._message(chat_id, text)
+
+
+    async def edit_message_text(self, text, chat_id=None, message_id=None, *args, **kwargs) -> Message:
+        await self._call("edit_message_text", chat_id=chat_id, message_id=message_id, text=text)
+        return self._message(chat_id, text)
+
+
+    async def delete_message(self, chat_id, message_id, *args, **kwargs) -> bool:
+        await self._call("delete_message", chat_id=chat_id, message_id=message_id)
+        return True
+
+
+    async def send_document(self, chat_id, document, *args, **kwargs) -> Message:
+        size = len(document.input_file_content) if hasattr(document, "input_file_content") else 0
+        await self._call("send_document", chat_id=chat_id, size=size, document=document)
+        return self._message(chat_id, "")
+
+
+    async def upload_sticker_file(self, user_id, sticker, sticker_format, *args, **kwargs) -> File:
+        size = len(sticker.input_file_content) if hasattr(sticker, "input_file_content") else 0
+        await self._call("upload_sticker_file", user_id=user_id, format=sticker_format, size=size)
+        file_id = f"stand-in-{next(self._ids)}"
+        return File(file_id=file_id, file_unique_id=file_id, file_size=size)
+
+
+    async def create_new_sticker_set(self, user_id, name, title, stickers, *args, **kwargs) -> bool:
+        await self._call("create_new_sticker_set", user_id=user_id, name=name, count=len(stickers))
+        self.sticker_sets[name] = list(stickers)
+        return True
+
+
+    async def add_sticker_to_set(self, user_id, name, sticker, *args, **kwargs) -> bool:
+        await self._call("add_sticker_to_set", user_id=user_id, name=name)
+        self.sticker_sets.setdefault(name, []).append(sticker)
+        return True
+
+
+    async def delete_sticker_set(self, name, *args, **kwargs) -> bool:
+        await self._call("delete_sticker_set", name=name)
+        return self.sticker_sets.pop(name, None) is not None
+
+
+    async def set_webhook(self, url, *args, secret_token=None, **kwargs) -> bool:
+        await self._call("set_webhook", url=url, secret_token=secret_token)
+        return True
+
+
+    async def delete_webhook(self, *args, **kwargs) -> bool:
+        await self._call("delete_webhook")
+        return True
+
+
+# 텔레그램 서버 대신 webhook으로 Update를 보내는 클라이언트
+class TelegramWebhookSender:
+    SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+    def __init__(self, url: str, secret_token: str) -> None:
+        self.url = url
+        self.secret_token = secret_token
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._update_ids = itertools.count(1)
+
+
+    async def start(self) -> None:
+        self._session = aiohttp.ClientSession()
+
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+    # 사용자(= 개인 채팅) 명령 메세지 Update
+    def message_update(self, user_id: int, text: str) -> dict:
+        command = text.split()[0]
+        return {
+            "update_id": next(self._update_ids),
+            "message": {
+                "message_id": next(self._update_ids),
+                "date": int(datetime.now(timezone.utc).timestamp()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}", "username": f"user{user_id}"},
+                "text": text,
+                "entities": [{"type": "bot_command", "offset": 0, "length": len(command)}] if command.startswith("/") else []
+            }
+        }
+
+
+    # 응답 상태 코드 리턴, secret_token을 지정하면 잘못된 토큰 테스트에 사용
+    async def send(self, update: dict, secret_token: Optional[str] = None) -> int:
+        headers = {self.SECRET_HEADER: self.secret_token if secret_token is None else secret_token}
+        async with self._session.post(self.url, json=update, headers=headers) as response:
+            await response.read()
+            return response.status
+
+
+# 다운로드/업스케일 대신 처리 시간만 흉내 내는 프로세서 (부하 테스트용)
+# 처리 시간은 평균 work_sec의 지수 분포, 결과로 작은 PNG 스티커 파일을 생성
+# prepare에서 정한 처리 시간을 그대로 예상 처리 시간으로 알려줌 (정확한 추정치 기준 스케줄링)
+class SimulatedProcessor:
+    def __init__(self, sticker_path: Path, work_sec: float, items: int = 2, seed: int = 0, fast_work_sec: float = 0.0) -> None:
+        self.sticker_path = Path(sticker_path)
+        self.work_sec = work_sec
+        self.fast_work_sec = fast_work_sec   # 빠른 생성(-f) 작업 평균 처리 시간
+        self.items = items
+        self._rng = random.Random(seed)
+        self._durations: Dict[int, float] = {}
+        buffer = io.BytesIO()
+        Image.new("RGBA", (512, 512), (255, 0, 0, 255)).save(buffer, format="PNG")
+        self._png = buffer.getvalue()
+
+
+    def _draw(self, sticker_data: StickerData) -> float:
+        mean = self.fast_work_sec if OptionFlag.has_flag(sticker_data.option_flag, OptionFlag.FAST) else self.work_sec
+        return self._rng.expovariate(1 / mean) if mean > 0 else 0.0
+
+
+    async def prepare(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[JobEstimate]:
+        if sticker_data.id not in self._durations:
+            self._durations[sticker_data.id] = self._draw(sticker_data)
+        return JobEstimate(cost=self._durations[sticker_data.id], images=self.items)
+
+
+    async def process(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[DcconData]:
+        duration = self._durations.pop(sticker_data.id, None)
+        if duration is None:
+            duration = self._draw(sticker_data)
+        if duration > 0:
+            await asyncio.sleep(duration)
+
+        out_dir = self.sticker_path / str(sticker_data.id)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for num in range(1, self.items + 1):
+            (out_dir / f"{num}.png").write_bytes(self._png)
+
+        dccon_data = DcconData(
+            id=sticker_data.id,
+            title=f"simulated {sticker_data.id}",
+            path=str(out_dir),
+            count=self.items,
+            ext={num: "png" for num in range(1, self.items + 1)}
+        )
+        sticker_data.update_from_dccon_data(dccon_data)
+        return dccon_data
+
+
+# 로컬 대체 서버와 임시 작업 폴더를 사용하도록 설정
+def configure(work_dir: Path, server: StandInServer) -> None:
+    Dccon.DETAIL_URL = f"{server.base_url}/index/package_detail"
+    Dccon.IMAGE_URL = f"{server.base_url}/dccon.php"
+
+    BotConfig.BOT_TOKEN = "0:stand-in"
+    BotConfig.DEVELOPER_ID = 1
+    BotConfig.DEVELOPER_NAME = "benchmark"
+    BotConfig.GROUP_CHAT_ID = 0
+    BotConfig.BASE_URL = f"{server.base_url}/api"
+    BotConfig.STICKER_TITLE_TAG = "@stand_in_bot"
+    BotConfig.STICKER_URL_TAG = "_by_stand_in_bot"
+    BotConfig.IMG_PATH = work_dir / "img"
+    BotConfig.STICKER_IMG_PATH = work_dir / "sticker"
+    BotConfig.JOB_PATH = work_dir / "jobs"
+    BotConfig.SCRATCH_PATH = work_dir / "scratch"
+    BotConfig.CATALOG_PATH = work_dir / "sticker_catalog.sqlite3"
+    BotConfig.RENDER_CACHE_PATH = work_dir / "render_cache"
+    BotConfig.init_dir()
+    BotConfig.init_queues()
@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(ROOT.as_posix())
+
+
+# 이전 실행에서 남은 작업 폴더 흉내 (디시콘 폴더 dirs개 × 파일 files_per_dir개)
+def populate_stale(work_dir: Path, dirs: int, files_per_dir: int) -> None:
+    for root in ("img", "sticker", "scratch"):
+        for num in range(dirs):
+            path = work_dir / root / str(100000 + num)
+            path.mkdir(parents=True, exist_ok=True)
+            for index in range(files_per_dir):
+                (path / f"{index}.png").write_bytes(b"\0" * 1024)
+
+
+# 자식 프로세스: import → init_dir → post_init(업데이트 수신 가능) → 백그라운드 정리/워밍업 완료 시간
+async def run_child(work_dir: Path) -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+
+    start = time.perf_counter()
+    importlib.import_module("elitemikobot.elitemikobot")
+    timings["import_sec"] = time.perf_counter() - start
+
+    # 대체 서버/봇은 측정 대상이 아니므로 import 시간 측정 후에 불러옴
+    from telegram.ext import Application
+    from telegram.warnings import PTBUserWarning
+    from benchmarks.stand_ins import FakeBot, StandInServer, configure
+    from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+
+    warnings.filterwarnings("ignore", category=PTBUserWarning)
+    server = StandInServer()
+    await server.start()
+
+    start = time.perf_counter()
+    configure(work_dir, server)
+    timings["init_dir_sec"] = time.perf_counter() - start
+
+    fake_bot = FakeBot()
+    bot = EliteMikoBot(BotConfig.BOT_TOKEN)
+    bot.bot = fake_bot
+    bot.application = Application.builder().bot(fake_bot).build()
+    bot._setup_handlers()
+
+    start = time.perf_counter()
+    await bot.application.initialize()
+    await bot._post_init(bot.application)
+    timings["post_init_sec"] = time.perf_counter() - start
+    timings["ready_sec"] = timings["import_sec"] + timings["init_dir_sec"] + timings["post_init_sec"]
+
+    start = time.perf_counter()
+    await bot._startup_task
+    timings["background_sec"] = time.perf_counter() - start
+    timings["upscaler_loaded"] = "elitemikobot.upscaler" in sys.modules
+    timings["trash_left"] = sum(path.exists() for path in BotConfig.trash_dirs())
+
+    await bot._post_shutdown(bot.application)
+    await bot.application.shutdown()
+    await server.stop()
+    return timings
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    keys = [key for key, value in runs[0].items() if isinstance(value, float)]
+    return {key: round(statistics.median(run[key] for run in runs), 4) for key in keys}
+
+
+# python -m benchmarks.startup_bench --repeat 5 --stale-dirs 200 --files-per-dir 40
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bot import time and time until updates can be received")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stale-dirs", type=int, default=100, help="leftover dccon folders per work directory")
+    parser.add_argument("--files-per-dir", type=int, default=40)
+    parser.add_argument("--out", type=Path, help="JSON report path (default: stdout)")
+    parser.add_argument("--child", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(asyncio.run(run_child(args.child))))
+        return
+
+    runs: List[Dict[str, float]] = []
+    for _ in range(args.repeat):
+        work_dir = Path(tempfile.mkdtemp(prefix="elitemikobot-startup-"))
+        try:
+            populate_stale(work_dir, args.stale_dirs, args.files_per_dir)
+            start = time.perf_counter()
+            proc = subprocess.run(
+                [sys.executable, "-m", "benchmarks.startup_bench", "--child", str(work_dir)],
+                cwd=ROOT, capture_output=True, text=True, check=True, env={**os.environ, "PYTHONWARNINGS": "ignore"}
+            )
+            run = json.loads(proc.stdout.strip().splitlines()[-1])
+            run["process_sec"] = time.perf_counter() - start
+            runs.append(run)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("out", "child")},
+        "median": summarize(runs),
+        "upscaler_loaded": all(run["upscaler_loaded"] for run in runs),
+        "trash_left": max(run["trash_left"] for run in runs),
+        "runs": runs
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import argparse
+import io
+import json
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from benchmarks.stand_ins import CORPUS_PRESETS, render_item
+from elitemikobot.frame_pool import FramePool
+from elitemikobot.upscale_backend import BACKENDS, choose_backend, create_backend
+
+
+# 디시콘 세트의 이미지별 프레임 목록 (RGBA 배열, 최종 크기), 병합되는 이미지는 256x256
+def load_frames(preset: str) -> List[Tuple[List[np.ndarray], Tuple[int, int]]]:
+    items = []
+    for spec in CORPUS_PRESETS[preset]:
+        merged = {num for start in spec.merge_nums for num in (start, start + 1)}
+        for num, item in enumerate(spec.items, start=1):
+            target = (256, 256) if num in merged else (512, 512)
+            with Image.open(io.BytesIO(render_item(item, seed=spec.id * 100 + num))) as img:
+                frames = []
+                for index in range(getattr(img, "n_frames", 1)):
+                    img.seek(index)
+                    frames.append(np.array(img.convert("RGBA")))
+            items.append((frames, target))
+    return items
+
+
+# auto 정책이 디시콘 세트에서 고르는 백엔드 (이미지 단위)
+def policy_choices(preset: str) -> Dict[str, int]:
+    choices: Dict[str, int] = {}
+    for spec in CORPUS_PRESETS[preset]:
+        merged = {num for start in spec.merge_nums for num in (start, start + 1)}
+        for num, item in enumerate(spec.items, start=1):
+            name = choose_backend("auto", *item.size, item.frames, target=256 if num in merged else 512)
+            choices[name] = choices.get(name, 0) + 1
+    return choices
+
+
+# 백엔드 하나로 전체 프레임을 최종 크기까지 처리 (frames_per_token만큼 묶어서 threads개 스레드로)
+# pool이 있으면 Upscaler처럼 결과 버퍼를 반납해서 다음 프레임에 재사용
+# buffer_allocs: 백엔드가 새로 만든 프레임 버퍼 수 (waifu2x 등 라이브러리 내부 할당 제외)
+# minor_faults: 새로 할당한 메모리를 처음 건드릴 때 생기는 페이지 폴트 수
+def run_backend(name: str, items: List[Tuple[List[np.ndarray], Tuple[int, int]]], threads: int, pooled: bool, trace: bool) -> dict:
+    try:
+        backend = create_backend(name)
+        backend.process(items[0][0][0], items[0][1])   # 모델 로드/초기화는 측정에서 제외
+    except Exception as e:
+        return {"error": f"{e}"}
+
+    pool = FramePool() if pooled else FramePool(max_per_key=0)
+
+    def run(batch):
+        frames, target = batch
+        pool.release(*[backend.process(frame, target, pool) for frame in frames])
+
+    if trace:
+        tracemalloc.start()
+    faults = resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        # Upscaler처럼 이미지 하나가 끝나면 풀을 비움
+        for frames, target in items:
+            size = backend.frames_per_token
+            list(executor.map(run, [(frames[i:i + size], target) for i in range(0, len(frames), size)]))
+            pool.clear()
+    elapsed = time.perf_counter() - start
+    faults = resource.getrusage(resource.RUSAGE_SELF).ru_minflt - faults
+    peak = tracemalloc.get_traced_memory()[1] if trace else None
+    if trace:
+        tracemalloc.stop()
+
+    count = sum(len(frames) for frames, _ in items)
+    megapixels = sum(len(frames) * target[0] * target[1] for frames, target in items) / 1e6
+    return {
+        "frames": count,
+        "frames_per_token": backend.frames_per_token,
+        "wall_sec": round(elapsed, 4),
+        "frames_per_sec": round(count / elapsed, 2) if elapsed else None,
+        "output_megapixels_per_sec": round(megapixels / elapsed, 2) if elapsed else None,
+        "buffer_allocs_per_frame": round(pool.allocated / count, 3),
+        "minor_faults_per_frame": round(faults / count, 2),
+        "traced_peak_mb": round(peak / (1024 * 1024), 1) if peak is not None else None
+    }
+
+
+# python -m benchmarks.upscale_bench --preset full --threads 4 [--no-pool] [--trace-memory]
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Upscale backend throughput on the benchmark corpus")
+    parser.add_argument("--preset", choices=sorted(CORPUS_PRESETS), default="full")
+    parser.add_argument("--backends", nargs="*", default=sorted(BACKENDS), help="backends to compare")
+    parser.add_argument("--threads", type=int, default=1, help="concurrent batches (CPU tokens)")
+    parser.add_argument("--no-pool", action="store_true", help="allocate new frame buffers for every frame")
+    parser.add_argument("--trace-memory", action="store_true", help="report the tracemalloc peak (slower)")
+    parser.add_argument("--out", type=Path, help="JSON report path (default: stdout)")
+    args = parser.parse_args()
+
+    items = load_frames(args.preset)
+    report = {
+        "preset": args.preset,
+        "threads": args.threads,
+        "pool": not args.no_pool,
+        "available": {name: BACKENDS[name].available() for name in sorted(BACKENDS)},
+        "auto_policy": policy_choices(args.preset),
+        "backends": {
+            name: run_backend(name, items, args.threads, not args.no_pool, args.trace_memory)
+            if BACKENDS[name].available() else {"error": "not available"}
+            for name in args.backends
+        }
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import json
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+from typing import Dict, List
+
+from telegram.ext import Application
+from telegram.warnings import PTBUserWarning
+
+sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from benchmarks.load_test import percentiles
+from benchmarks.stand_ins import FakeBot, StandInServer, TelegramWebhookSender, configure
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+
+
+# webhook 모드로 봇을 실행하고 /start Update를 보내서 수신(200 응답)까지, 답장까지 걸린 시간 측정
+async def run_intake(args: argparse.Namespace, work_dir: Path) -> dict:
+    server = StandInServer()
+    await server.start()
+    configure(work_dir, server)
+    BotConfig.UPDATE_MODE = "webhook"
+    BotConfig.WEBHOOK_URL = "https://stand-in.invalid/telegram"
+    BotConfig.WEBHOOK_SECRET = "stand-in-secret"
+    BotConfig.WEBHOOK_HOST = "127.0.0.1"
+    BotConfig.WEBHOOK_PORT = 0
+
+    fake_bot = FakeBot(latency_sec=args.telegram_latency_ms / 1000)
+    bot = EliteMikoBot(BotConfig.BOT_TOKEN)
+    bot.bot = fake_bot
+    bot.application = Application.builder().bot(fake_bot).concurrent_updates(args.concurrent_updates).build()
+    bot._setup_handlers()
+
+    run_task = asyncio.create_task(bot._run_webhook())
+    while not any(method == "set_webhook" for method, _ in fake_bot.calls):
+        if run_task.done():
+            await run_task
+        await asyncio.sleep(0.01)
+
+    sender = TelegramWebhookSender(
+        url=f"http://{BotConfig.WEBHOOK_HOST}:{bot.webhook_server.port}{BotConfig.WEBHOOK_PATH}",
+        secret_token=BotConfig.WEBHOOK_SECRET
+    )
+    await sender.start()
+
+    sent_at: Dict[int, float] = {}
+    acks: List[float] = []
+    statuses: Dict[int, int] = {}
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def send(user_id: int) -> None:
+        async with limit:
+            sent_at[user_id] = time.perf_counter()
+            status = await sender.send(sender.message_update(user_id, "/start"))
+            acks.append(time.perf_counter() - sent_at[user_id])
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    try:
+        forbidden = await sender.send(sender.message_update(0, "/start"), secret_token="wrong")
+        await asyncio.gather(*(send(user_id) for user_id in range(1, args.updates + 1)))
+
+        def replies() -> Dict[int, float]:
+            return {
+                kwargs["chat_id"]: at for (method, kwargs), at in zip(fake_bot.calls, fake_bot.call_times)
+                if method == "send_message" and kwargs["chat_id"] in sent_at
+            }
+
+        while len(replies()) < args.updates and time.perf_counter() - started < args.timeout:
+            await asyncio.sleep(0.01)
+        elapsed = time.perf_counter() - started
+        replied = replies()
+    finally:
+        await sender.close()
+        bot._stop_event.set()
+        await run_task
+        await server.stop()
+
+    return {
+        "config": {key: value for key, value in vars(args).items() if key != "out"},
+        "elapsed_sec": round(elapsed, 3),
+        "statuses": statuses,
+        "wrong_secret_status": forbidden,
+        "replied": len(replied),
+        "ack_latency_sec": percentiles(acks),
+        "reply_latency_sec": percentiles([at - sent_at[user_id] for user_id, at in replied.items()])
+    }
+
+
+# python -m benchmarks.webhook_intake --updates 500 --concurrency 20
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Webhook update intake latency with a stand-in Telegram sender")
+    parser.add_argument("--updates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20, help="requests in flight from the sender")
+    parser.add_argument("--concurrent-updates", type=int, default=1, help="Application.concurrent_updates")
+    parser.add_argument("--telegram-latency-ms", type=float, default=0)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--out", type=Path, help="JSON report path (default: stdout)")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=PTBUserWarning)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="elitemikobot-webhook-"))
+    try:
+        report = asyncio.run(run_intake(args, work_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
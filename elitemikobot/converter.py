@@ -3,6 +3,8 @@ import asyncio
 import aiofiles
 from pathlib import Path
 from elitemikobot.logger import Logger
+from elitemikobot.metrics import stage_timer
+from elitemikobot.cpu_pool import CPU_POOL
 
 
 class Converter:
@@ -11,11 +13,18 @@ class Converter:
     TOLERANCE_KB = 25
     MAX_ATTEMPTS = 5
     DEFAULT_FRAME_DURATION_MS = 60
+    # 출력 webm 프레임 레이트, 원본 프레임은 이 간격에 맞춰 선택/반복됨
+    FPS = 30
 
     FORMAT = "yuva420p"
     PIX_FMT = "yuva420p"
+    # 인코딩 스레드 수 = CPU 토큰 수
+    THREADS = 2
+    # 빠른 생성 인코딩 설정 (화질보다 속도 우선)
+    FAST_ARGS = "-deadline realtime -cpu-used 8 -row-mt 1"
 
-    def __init__(self,dccon_id: int, num: int, input_folder: str, out_path: str, frame_durations: list[int], x_size: int = 512, y_size: int = 512):        
+    # planned: frame_durations가 plan_timeline 결과면 True (이미 3초 맞춤과 출력 프레임 간격이 적용됨)
+    def __init__(self,dccon_id: int, num: int, input_folder: str, out_path: str, frame_durations: list[int], x_size: int = 512, y_size: int = 512, fast: bool = False, planned: bool = False):        
         self.dccon_id = dccon_id
         self.num = num
         self.logger = Logger(name="Converter_Log")
@@ -25,12 +34,26 @@ class Converter:
         self.frame_info = self.input_folder / "frame_info.txt"
         self.x_size = x_size
         self.y_size = y_size
+        self.fast = fast
+        self.planned = planned
+
+
+    # 결과 파일에 영향을 주는 인코딩 설정 (렌더 캐시 키)
+    @classmethod
+    def render_version(cls, fast: bool = False) -> str:
+        return (
+            f"vp9-{cls.PIX_FMT}-{cls.MAX_SIZE_KB}kb-{cls.TOLERANCE_KB}-{cls.MAX_ATTEMPTS}"
+            f"-{cls.MAX_DURATION_MS}ms-{cls.DEFAULT_FRAME_DURATION_MS}ms-{cls.FPS}fps"
+            + (f"-{cls.FAST_ARGS}" if fast else "")
+        )
 
 
     # GIF → webm
     async def convert_video(self) -> None:        
         try:
-            await self._adjust_durations()
+            # plan_timeline 듀레이션을 다시 조절하면 출력 프레임 간격에서 어긋남
+            if not self.planned:
+                await self._adjust_durations()
             total_duration = await self._generate_frame_info()
             bitrate_kbps = self._calculate_bitrate(self.MAX_SIZE_KB, total_duration)
             await self._optimize_bitrate(bitrate_kbps)
@@ -60,15 +83,52 @@ class Converter:
 
     # 듀레이션 조절
     async def _adjust_durations(self) -> None:        
-        total_duration = sum(self.frame_durations)
+        self.frame_durations = self.adjust_durations(self.frame_durations)
+
+
+    @classmethod
+    def adjust_durations(cls, frame_durations: list) -> list:
+        total_duration = sum(frame_durations)
 
         # 듀레이션 정보가 없는 경우 임의의 듀레이션 부여
         if total_duration == 0:        
-            self.frame_durations = [self.DEFAULT_FRAME_DURATION_MS for _ in self.frame_durations]
+            frame_durations = [cls.DEFAULT_FRAME_DURATION_MS for _ in frame_durations]
+
+        if total_duration > cls.MAX_DURATION_MS:
+            scale_factor = cls.MAX_DURATION_MS / total_duration
+            frame_durations = [int(duration * scale_factor) for duration in frame_durations]
+        return frame_durations
+
+
+    # webm에 들어갈 수 있는 최대 프레임 수
+    @classmethod
+    def max_frames(cls) -> int:
+        return max(int(cls.MAX_DURATION_MS * cls.FPS / 1000), 1)
+
+
+    # 원본 프레임 듀레이션 → webm 타임라인 (사용할 원본 프레임 번호, 프레임별 듀레이션(ms))
+    # 3초 맞춤 후 ffmpeg fps 필터처럼 각 프레임 시작 시각을 가장 가까운 출력 프레임에 배치
+    # 같은 출력 프레임에 겹치는 원본 프레임은 마지막 것만 남으므로 나머지는 업스케일할 필요가 없음
+    @classmethod
+    def plan_timeline(cls, frame_durations: list) -> tuple[list[int], list[float]]:
+        frame_ms = 1000 / cls.FPS
+        durations = cls.adjust_durations(frame_durations)
+        end = max(min(int(sum(durations) / frame_ms + 0.5), cls.max_frames()), 1)
+
+        picks: list[tuple[int, int]] = []     # (출력 프레임 번호, 원본 프레임 번호)
+        start = 0.0
+        for index, duration in enumerate(durations):
+            tick = int(start / frame_ms + 0.5)
+            start += duration
+            if tick >= end:
+                break
+            if picks and picks[-1][0] == tick:
+                picks[-1] = (tick, index)
+            else:
+                picks.append((tick, index))
 
-        if total_duration > self.MAX_DURATION_MS:
-            scale_factor = self.MAX_DURATION_MS / total_duration
-            self.frame_durations = [int(duration * scale_factor) for duration in self.frame_durations]
+        ticks = [tick for tick, _ in picks] + [end]
+        return [index for _, index in picks], [(ticks[i + 1] - ticks[i]) * frame_ms for i in range(len(picks))]
 
 
     # FFmpeg concat 파일 포맷에 맞는 frame_info.txt 생성
@@ -122,10 +182,17 @@ class Converter:
 
     # FFmpeg 비디오 인코딩
     async def _encode_video(self, bitrate_kbps: int) -> None:        
+        async with CPU_POOL.token(self.dccon_id, self.THREADS):
+            with stage_timer("encode_attempt"):
+                await self._run_ffmpeg(bitrate_kbps)
+
+
+    async def _run_ffmpeg(self, bitrate_kbps: int) -> None:
+        speed_args = f"{self.FAST_ARGS} " if self.fast else ""
         command = (
             f'ffmpeg -f concat -safe 0 -i "{str(self.frame_info)}" '
-            f'-vf scale={self.x_size}:{self.y_size},format={self.FORMAT},fps=30 '            
-            f'-c:v libvpx-vp9 -b:v {bitrate_kbps}k -pix_fmt {self.PIX_FMT} '
+            f'-vf scale={self.x_size}:{self.y_size},format={self.FORMAT},fps={self.FPS} '            
+            f'-c:v libvpx-vp9 -b:v {bitrate_kbps}k -pix_fmt {self.PIX_FMT} -threads {self.THREADS} {speed_args}'
             f'-an -sn -y -loglevel warning -hide_banner -stats '            
             f'"{str(self.output_path)}"'
         )
@@ -0,0 +1,120 @@
+import asyncio
+import os
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Tuple
+
+from elitemikobot.metrics import REGISTRY, Gauge, stage_timer
+
+
+# 프로세스 전체 CPU 토큰, 업스케일 프레임 / 정지 이미지 처리 / 압축 / ffmpeg 인코딩이 토큰을 받아서 실행
+# 토큰이 모자라면 현재 토큰을 가장 적게 쓰고 있는 작업의 요청부터 배정
+# → 작업이 하나면 모든 코어를 쓰고, 여러 작업이면 코어를 나눠 씀
+class CpuTokenPool:
+    def __init__(self, tokens: int = 0) -> None:
+        self.tokens = tokens or os.cpu_count() or 1
+        self.in_use = 0
+        self._held: Dict[str, int] = {}
+        self._waiters: "OrderedDict[str, Deque[Tuple[asyncio.Future, int]]]" = OrderedDict()
+
+
+    # 설정 파일을 읽은 뒤 토큰 수 지정, 0이면 호스트 코어 수
+    def configure(self, tokens: int = 0) -> None:
+        self.tokens = tokens or os.cpu_count() or 1
+        self._dispatch()
+
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+
+    # job: 작업 구분 키 (디시콘 id), weight: 사용할 코어 수
+    @asynccontextmanager
+    async def token(self, job, weight: int = 1) -> AsyncIterator[None]:
+        job = str(job)
+        weight = max(1, min(weight, self.tokens))
+        await self._acquire(job, weight)
+        try:
+            yield
+        finally:
+            self._release(job, weight)
+
+
+    async def _acquire(self, job: str, weight: int) -> None:
+        if not self._waiters and self.in_use + weight <= self.tokens:
+            self._grant(job, weight)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(job, deque()).append((future, weight))
+        try:
+            with stage_timer("cpu_wait"):
+                await future
+        except asyncio.CancelledError:
+            # 배정 직후 취소되었으면 반납
+            if future.done() and not future.cancelled():
+                self._release(job, weight)
+            else:
+                self._withdraw(job, future)
+            raise
+
+
+    def _grant(self, job: str, weight: int) -> None:
+        self.in_use += weight
+        self._held[job] = self._held.get(job, 0) + weight
+
+
+    def _release(self, job: str, weight: int) -> None:
+        self.in_use = max(self.in_use - weight, 0)
+        held = self._held.get(job, 0) - weight
+        if held > 0:
+            self._held[job] = held
+        else:
+            self._held.pop(job, None)
+        self._dispatch()
+
+
+    def _withdraw(self, job: str, future: asyncio.Future) -> None:
+        waiters = self._waiters.get(job)
+        if waiters is None:
+            return
+
+        for entry in list(waiters):
+            if entry[0] is future:
+                waiters.remove(entry)
+        if not waiters:
+            del self._waiters[job]
+        self._dispatch()
+
+
+    # 토큰을 가장 적게 쓰고 있는 작업부터 (같으면 먼저 기다린 작업)
+    # 취소된 대기자는 _withdraw가 실행되기 전에 여기서 먼저 만날 수 있으므로 배정하지 않고 버림
+    def _dispatch(self) -> None:
+        while self._waiters:
+            job = min(self._waiters, key=lambda key: self._held.get(key, 0))
+            waiters = self._waiters[job]
+            future, weight = waiters[0]
+            if not future.done() and self.in_use + weight > self.tokens:
+                break
+
+            waiters.popleft()
+            if not waiters:
+                del self._waiters[job]
+            if future.done():
+                continue
+            self._grant(job, weight)
+            future.set_result(None)
+
+
+# 토큰 수는 봇/워커의 load_config에서 CPU_TOKENS로 지정 (기본값: 호스트 코어 수)
+CPU_POOL = CpuTokenPool()
+
+REGISTRY.register(Gauge(
+    "elitemikobot_cpu_tokens_in_use", "Number of CPU tokens held by pipeline stages",
+    func=lambda: CPU_POOL.in_use
+))
+REGISTRY.register(Gauge(
+    "elitemikobot_cpu_tokens_waiting", "Number of pipeline stages waiting for a CPU token",
+    func=lambda: CPU_POOL.waiting
+))
@@ -1,7 +1,10 @@
 from enum import Enum
-import json
+import asyncio
+import datetime as dt
+import random
+import time
 import aiohttp
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from yarl import URL
 from elitemikobot.logger import Logger
@@ -15,39 +18,139 @@ class HttpMethod(Enum):
     PUT = "PUT"
     DELETE = "DELETE"
     PATCH = "PATCH"
-    
 
-class DbApiClient:    
-    def __init__(self, base_url: str, sticker: StickerData) -> None:
-        self.base_url = base_url        
-        self.sticker = sticker
+
+# 서킷이 열려 있어 요청을 보내지 않고 바로 실패
+class CircuitOpenError(aiohttp.ClientError):
+    pass
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+
+    # 요청 가능 여부, OPEN 상태에서 reset_timeout이 지나면 요청 1개만 통과(HALF_OPEN)
+    def allow_request(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+
+        return True
+
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+    # 시험 요청이 성공/실패로 기록되지 않고 끝난 경우 (취소, 응답 파싱 오류 등) 다음 요청이 다시 시험하도록 함
+    def end_probe(self) -> None:
+        self._probing = False
+
+
+class DbApiClient:
+    MAX_ATTEMPTS = 3
+    BACKOFF_BASE_SEC = 0.2
+    BACKOFF_MAX_SEC = 2.0
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout_sec: float = 5.0,
+        pool_size: int = 20,
+        keepalive_sec: float = 30.0,
+        failure_threshold: int = 5,
+        reset_timeout_sec: float = 30.0
+    ) -> None:
+        self.base_url = base_url
+        self.timeout = aiohttp.ClientTimeout(total=timeout_sec)
+        self.pool_size = pool_size
+        self.keepalive_sec = keepalive_sec
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout_sec)
         self._session: Optional[aiohttp.ClientSession] = None
         self.logger = Logger(name="DbApiClient_Log")
 
 
-    async def __aenter__(self):
-        self._session = aiohttp.ClientSession()
-        return self
+    # 애플리케이션 시작 시 1회 호출, 세션(커넥션 풀)은 종료 시까지 재사용
+    async def start(self) -> None:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=self.keepalive_sec)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
 
 
-    async def __aexit__(self, exc_type, exc_value, traceback):       
+    async def close(self) -> None:
         if self._session:
             await self._session.close()
             self._session = None
 
 
-    def _get_url(self, endpoint: str, is_use_option_flag: bool = True) -> str:        
-        if is_use_option_flag:
-            return f"{self.base_url}/stickers/{self.sticker.id}/{self.sticker.option_flag}/{endpoint}"       
-        
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+    def _get_url(self, endpoint: str, sticker: Optional[StickerData] = None) -> str:
+        if sticker is not None:
+            return f"{self.base_url}/stickers/{sticker.id}/{sticker.option_flag}/{endpoint}"
+
         return f"{self.base_url}/stickers/{endpoint}"
 
 
+    # 지수 백오프 + 지터
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = min(self.BACKOFF_MAX_SEC, self.BACKOFF_BASE_SEC * (2 ** attempt))
+        return random.uniform(0, delay)
+
+
     # API 요청
-    async def _request(self, method: HttpMethod, url: str, **kwargs) -> Optional[Dict[str, Any]]:        
-        for attempt in range(3):  # 최대 3번 재시도
+    async def _request(self, method: HttpMethod, url: str, **kwargs) -> Optional[Dict[str, Any]]:
+        if self._session is None:
+            raise RuntimeError("DbApiClient is not started")
+
+        last_exception = None
+
+        for attempt in range(self.MAX_ATTEMPTS):
+            if not self.breaker.allow_request():
+                raise CircuitOpenError(f"DB API circuit is open: {self.base_url}")
+            probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+
             try:
                 async with self._session.request(method.value, url, **kwargs) as response:
+                    # 4xx는 서버가 정상 응답한 것이므로 재시도하지 않음
+                    if response.status < 500:
+                        self.breaker.record_success()
+
                     if method is HttpMethod.HEAD:
                         if response.status in {200, 201}:
                             return True
@@ -55,7 +158,7 @@ class DbApiClient:
                             return False
                         else:
                             response.raise_for_status()
-                    else:    
+                    else:
                         if response.status in {200, 201}:
                             return await response.json()
                         elif response.status == 404:
@@ -63,52 +166,86 @@ class DbApiClient:
                         else:
                             response.raise_for_status()
 
-            except aiohttp.ClientError as e:
-                self.logger.error(
-                    action="ClientError DbApiClient",
-                    user=" ",
-                    data={"method": f"{method}", "url": f"{url}", "kwargs": f"{kwargs}"},
-                    message=f"재시도 {attempt + 1}/3 - {e}"
-                )
+            except aiohttp.ClientResponseError as e:
+                if e.status < 500:
+                    raise
+                self.breaker.record_failure()
                 last_exception = e
-            except Exception as e:
-                self.logger.error(
-                    action="Exception DbApiClient",
-                    user=" ",
-                    data={"method": f"{method}", "url": f"{url}", "kwargs": f"{kwargs}"},
-                    message=f"재시도 {attempt + 1}/3 - {e}"
-                )
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.breaker.record_failure()
                 last_exception = e
+            finally:
+                if probe:
+                    self.breaker.end_probe()
+
+            self.logger.error(
+                action="ClientError DbApiClient",
+                user=" ",
+                data={"method": f"{method}", "url": f"{url}", "breaker": self.breaker.state},
+                message=f"재시도 {attempt + 1}/{self.MAX_ATTEMPTS} - {last_exception!r}"
+            )
+
+            if attempt + 1 < self.MAX_ATTEMPTS:
+                await asyncio.sleep(self._backoff_delay(attempt))
 
         if last_exception is not None:
             raise last_exception
-        
+
         return None
 
 
     # 스티커 존재 여부 확인
-    async def check_sticker_exists(self) -> bool:        
-        url = self._get_url("exists")
+    async def check_sticker_exists(self, sticker: StickerData) -> bool:
+        url = self._get_url("exists", sticker)
         response = await self._request(HttpMethod.GET, url)
         return response.get("exists", True) if response else False
-                
+
 
     # 스티커 URL 존재 여부 확인
-    async def check_url_exists(self) -> bool:        
-        url = str(URL(self._get_url("checkurl", is_use_option_flag=False)).with_query({"url": self.sticker.url}))
+    async def check_url_exists(self, sticker_url: str) -> bool:
+        url = str(URL(self._get_url("checkurl")).with_query({"url": sticker_url}))
         response = await self._request(HttpMethod.GET, url)
         return response.get("exists", False) if response else False
-                
+
+
+    # 후보 URL 목록 중 사용 가능한(DB에 없는) URL만 반환, 요청 1회로 처리
+    async def filter_free_urls(self, sticker_urls: List[str]) -> List[str]:
+        url = self._get_url("checkurls")
+        response = await self._request(HttpMethod.POST, url, json={"urls": sticker_urls})
+
+        # 일괄 조회 엔드포인트가 없는 서버인 경우 개별 조회로 대체
+        if response is None:
+            self.logger.warning(
+                action="filter_free_urls fallback",
+                user=" ",
+                data={"count": len(sticker_urls)},
+                message="checkurls endpoint not found, falling back to checkurl"
+            )
+            return [u for u in sticker_urls if not await self.check_url_exists(u)]
+
+        taken = set(response.get("exists", []))
+        return [u for u in sticker_urls if u not in taken]
+
 
     # 스티커 URL 가져오기
-    async def get_sticker_url(self) -> Optional[str]:        
-        url = self._get_url("url")
+    async def get_sticker_url(self, sticker: StickerData) -> Optional[str]:
+        url = self._get_url("url", sticker)
         response = await self._request(HttpMethod.GET, url)
-        return response.get("url") if response else None   
+        return response.get("url") if response else None
+
+
+    # since 이후 등록/변경된 스티커 목록 (since가 None이면 전체)
+    async def get_sticker_changes(self, since: Optional[dt.datetime] = None) -> List[StickerData]:
+        url = URL(self._get_url("changes"))
+        if since is not None:
+            url = url.with_query({"since": since.isoformat()})
+
+        response = await self._request(HttpMethod.GET, str(url))
+        return [StickerData.from_csharp_dto(item) for item in response] if response else []
 
 
     # 스티커 등록
-    async def register_sticker(self) -> Dict[str, Any]:        
-        url = self._get_url("", is_use_option_flag=False)
-        json_payload = self.sticker.to_csharp_dto()
-        return await self._request(HttpMethod.POST, url, json=json_payload)      
\ No newline at end of file
+    async def register_sticker(self, sticker: StickerData) -> Dict[str, Any]:
+        url = self._get_url("")
+        json_payload = sticker.to_csharp_dto()
+        return await self._request(HttpMethod.POST, url, json=json_payload)
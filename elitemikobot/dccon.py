@@ -3,25 +3,31 @@ from pathlib import Path
 from typing import Any, Dict
 import aiohttp
 import os
-from PIL import Image
-from aiofiles import open as aio_open
 from elitemikobot.logger import Logger
 from elitemikobot.dccon_data import DcconData
+from elitemikobot.metrics import stage_timer
 
 
 class Dccon:
+    # 디시콘 서버 주소 (벤치마크 등에서 로컬 서버로 대체 가능)
+    DETAIL_URL = os.getenv("DCCON_DETAIL_URL", "https://dccon.dcinside.com/index/package_detail")
+    IMAGE_URL = os.getenv("DCCON_IMAGE_URL", "https://dcimg5.dcinside.com/dccon.php")
+    REFERER = "https://dccon.dcinside.com/"
+
     def __init__(self):        
         self.logger = Logger(name="Dccon_Log")
 
     async def process_dccon(self, dccon_id: int, save_path: str) -> DcconData:            
         try:
-            dccon_meta = await self._fetch_dccon(dccon_id)
+            with stage_timer("metadata_fetch"):
+                dccon_meta = await self._fetch_dccon(dccon_id)
             if dccon_meta is None:
                 return None                    
 
             max_try = 3
             for _ in range(max_try):
-                data_dict = await self._save_dccon_data(dccon_meta, dccon_id, save_path)                      
+                with stage_timer("download"):
+                    data_dict = await self._save_dccon_data(dccon_meta, dccon_id, save_path)                      
                 
                 if data_dict["count"] == 0:
                     self.logger.warning(
@@ -32,7 +38,8 @@ class Dccon:
                     )                    
                     return None
 
-                is_success, err = await self._validate_dccon(save_path)
+                with stage_timer("validation"):
+                    is_success, err = await self._validate_dccon(save_path)
                 if is_success:                                                
                     return DcconData(**data_dict)                
             
@@ -66,7 +73,7 @@ class Dccon:
 
     # 디시콘 메타데이터 수집
     async def _fetch_dccon(self, dccon_id: int) -> Dict[str, Any]:        
-        url = "https://dccon.dcinside.com/index/package_detail"
+        url = self.DETAIL_URL
         headers = {
             "Content-Type": "application/x-www-form-urlencoded",
             "X-Requested-With": "XMLHttpRequest"
@@ -103,7 +110,7 @@ class Dccon:
         async with aiohttp.ClientSession() as session:
             tasks = []
             for i, detail in enumerate(metadata['detail'], start=1):                
-                img_url = f"https://dcimg5.dcinside.com/dccon.php?no={detail['path']}"
+                img_url = f"{self.IMAGE_URL}?no={detail['path']}"
                 dccon_data['ext'][i] = detail['ext']                                
                 tasks.append(self._download_dccon(session, img_url, save_dir, i, detail['ext']))
 
@@ -117,6 +124,9 @@ class Dccon:
 
     # GIF 파일 중 프레임이 1개인 파일을 PNG로 변환
     async def _convert_single_frame_gif_to_png(self, save_dir: Path, dccon_id: int, dccon_data: Dict[str, Any]) -> None:               
+        # PIL/aiofiles는 봇 시작 시간을 줄이기 위해 처음 사용할 때 import
+        from PIL import Image
+
         for file_path in save_dir.glob("*.gif"):
             try:                
                 with Image.open(file_path) as img:
@@ -137,7 +147,9 @@ class Dccon:
                 )
 
     async def _download_dccon(self, session: aiohttp.ClientSession, url: str, save_dir: Path, num: int, ext: str) -> None:        
-        headers = {"referer": "https://dccon.dcinside.com/"}
+        from aiofiles import open as aio_open
+
+        headers = {"referer": self.REFERER}
         file_path = save_dir / f"{num}.{ext}"
 
         async with session.get(url, headers=headers) as response:
@@ -147,6 +159,8 @@ class Dccon:
 
     # 이미지 유효성 검사
     async def _validate_dccon(self, path: str) -> tuple[bool, str | None]:
+        from PIL import Image
+
         img_path = Path(path)
         imgs = list(img_path.glob('*'))
         
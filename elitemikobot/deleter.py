@@ -2,19 +2,25 @@ import asyncio
 import shutil
 import logging
 from pathlib import Path
-from typing import Union
+from typing import Dict, Iterable, Union
 
 class Deleter:
-    _lock = asyncio.Lock()
+    # 경로별 잠금 (다른 작업의 삭제를 기다리지 않음)
+    _locks: Dict[Path, asyncio.Lock] = {}
     
 
     @staticmethod
     async def _delete_path(path: Path) -> None:
+        lock = Deleter._locks.setdefault(path, asyncio.Lock())
         try:
-            if path.exists():
-                await asyncio.to_thread(shutil.rmtree, path)
+            async with lock:
+                if path.exists():
+                    await asyncio.to_thread(shutil.rmtree, path)
         except Exception as e:
             pass
+        finally:
+            if not lock.locked() and Deleter._locks.get(path) is lock:
+                del Deleter._locks[path]
     
 
     @staticmethod
@@ -23,21 +29,27 @@ class Deleter:
         img_path = Path(img_path) if not isinstance(img_path, Path) else img_path
         sticker_path = Path(sticker_path) if not isinstance(sticker_path, Path) else sticker_path
 
-        async with Deleter._lock: 
-            try:
-                await asyncio.gather(
-                    Deleter._delete_path(img_path),
-                    Deleter._delete_path(sticker_path)
-                )
-            except Exception as e:
-                pass
+        try:
+            await asyncio.gather(
+                Deleter._delete_path(img_path),
+                Deleter._delete_path(sticker_path)
+            )
+        except Exception as e:
+            pass
         
         
+    @staticmethod
+    async def delete_paths(paths: Iterable[Union[str, Path]]) -> None:
+        try:
+            await asyncio.gather(*(Deleter._delete_path(Path(path)) for path in paths))
+        except Exception as e:
+            pass
+
+
     @staticmethod
     async def delete_dccon(img_path: Union[str, Path]) -> None:
         img_path = Path(img_path) if not isinstance(img_path, Path) else img_path
-        async with Deleter._lock:
-            try:
-                await Deleter._delete_path(img_path)
-            except Exception as e:
-                pass
+        try:
+            await Deleter._delete_path(img_path)
+        except Exception as e:
+            pass
@@ -1,10 +1,13 @@
 from collections import defaultdict
 from pathlib import Path
+import importlib
 import random
 import string
+import uuid
 from typing import Dict, List, Optional, Union
 import aiohttp
-from telegram import Update, Bot, InputSticker, User
+from telegram import Update, Bot, InputFile, InputSticker, User
+from telegram.error import BadRequest, NetworkError, RetryAfter, TimedOut
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -13,23 +16,36 @@ from telegram.ext import (
     MessageHandler,
     filters
 )
-import shutil
 import asyncio
 import datetime as dt
+import signal
+import time
+import tracemalloc
 from enum import Enum
 from dotenv import load_dotenv
 import sys
 import os
 
 sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from elitemikobot.cpu_pool import CPU_POOL
 from elitemikobot.db_apiclient import DbApiClient
+from elitemikobot.sticker_catalog import StickerCatalog
 from elitemikobot.sticker_data import StickerData
-from elitemikobot.dccon import Dccon
-from elitemikobot.upscaler import Upscaler
 from elitemikobot.logger import Logger
 from elitemikobot.deleter import Deleter
 from elitemikobot.option_flag import OptionFlag
-from elitemikobot.dccon_data import DcconData
+from elitemikobot.sticker_processor import RemoteStickerProcessor, StickerProcessor
+from elitemikobot.work_queue import open_work_queue
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.metrics import REGISTRY, Gauge, MetricsServer, collect_stages, stage_timer
+from elitemikobot.job_queue import QueueFullError, QueueTimeoutError, StickerJobQueue
+from elitemikobot.workspace import WorkspaceManager
+from elitemikobot.profiler import SamplingProfiler, format_stage_breakdown
+from elitemikobot.memory import current_rss
+from elitemikobot.job_estimate import JOB_COST_RATIO, JobEstimate
+from elitemikobot.webhook import WebhookServer
+from elitemikobot.render_cache import open_render_cache
+from elitemikobot.upscale_backend import UpscaleConfig
 
 
 class BotConfig:    
@@ -38,9 +54,62 @@ class BotConfig:
     ENV_FILE = Path(os.getenv("ENV_FILE", BASE_DIR / "config.env"))
     IMG_PATH = Path(os.getenv("IMG_PATH", BASE_DIR / "img"))
     STICKER_IMG_PATH = Path(os.getenv("STICKER_IMG_PATH", BASE_DIR / "sticker"))
+    JOB_PATH = Path(os.getenv("JOB_PATH", BASE_DIR / "jobs"))   # 작업 체크포인트
+    # 작업별 임시 폴더 (GIF 프레임), /dev/shm/elitemikobot 처럼 tmpfs 경로 지정 가능
+    SCRATCH_PATH = BASE_DIR / "scratch"
+    SCRATCH_QUOTA_MB = 2048   # 0이면 제한 없음
+    SCRATCH_GC_INTERVAL = 60   # 초
+    TRASH_DIR = ".trash"   # 시작 시 정리할 이전 작업 폴더
+    # 완성된 스티커 파일 캐시, 시작 시 정리하지 않음
+    RENDER_CACHE_PATH = BASE_DIR / "render_cache"
+    RENDER_CACHE_QUOTA_MB = 1024   # 0이면 캐시 사용 안 함
       
     IMG_PROCESSING_TIMEOUT = 1800   # 30분
     STICKER_PROCESSING_TIMEOUT = 900   # 15분
+    CHECKPOINT_TTL = 86400   # 1일, 지난 체크포인트는 재개하지 않고 삭제
+    CHECKPOINT_MAX_ATTEMPTS = 3   # 이만큼 시도하고도 남은 체크포인트는 재시작 시 재개하지 않고 삭제 (항상 실패하는 작업)
+    RESUME_RETRY_INTERVAL = 30   # 초, 재시작 시 대기열이 가득 차서 재개하지 못한 체크포인트 재시도 간격
+
+    # 이미지 처리 방식 (local | remote), remote면 python -m elitemikobot.worker 워커가 처리
+    # remote는 봇에서 디시콘을 내려받지 않아 작업 추정이 없으므로 메모리 예산 없이 작업 수로만 제한 (init_queues)
+    PROCESSING_MODE = "local"
+    WORK_QUEUE_URL = f"sqlite:///{BASE_DIR / 'work_queue.sqlite3'}"
+    WORK_QUEUE_SECRET = ""   # http(s) 작업 큐 서버 secret
+
+    # DB API 클라이언트 (커넥션 풀, 요청 타임아웃, 서킷 브레이커)
+    DB_API_TIMEOUT = float(os.getenv("DB_API_TIMEOUT", 5))
+    DB_API_POOL_SIZE = int(os.getenv("DB_API_POOL_SIZE", 20))
+    DB_API_FAILURE_THRESHOLD = 5
+    DB_API_RESET_TIMEOUT = 30
+    # 스티커 세트 이름 후보 수 (한 번의 요청으로 검사)
+    STICKER_URL_CANDIDATES = 10
+
+    # 스티커 테이블 로컬 복제본
+    CATALOG_PATH = Path(os.getenv("CATALOG_PATH", BASE_DIR / "sticker_catalog.sqlite3"))
+    CATALOG_SYNC_INTERVAL = 60   # 초
+    CATALOG_RECONCILE_INTERVAL = 3600   # 초, 전체 목록을 받아 서버에서 지운 스티커 반영
+
+    # Prometheus 지표 엔드포인트 (/metrics), 포트가 0이면 비활성화
+    METRICS_HOST = "127.0.0.1"
+    METRICS_PORT = 0
+
+    # 업데이트 수신 방식 (polling | webhook)
+    # webhook이면 리버스 프록시가 WEBHOOK_URL로 받은 요청을 WEBHOOK_HOST:WEBHOOK_PORT + WEBHOOK_PATH로 전달
+    UPDATE_MODE = "polling"
+    WEBHOOK_URL = None
+    WEBHOOK_SECRET = None
+    WEBHOOK_HOST = "127.0.0.1"
+    WEBHOOK_PORT = 8080
+    WEBHOOK_PATH = "/telegram"
+
+    # /profile 샘플링 간격
+    PROFILE_INTERVAL = 0.005   # 초
+    # 단계별 Python 힙 최댓값 기록 (tracemalloc, 처리 속도가 느려지므로 보정할 때만 사용)
+    MEMORY_TRACE = os.getenv("MEMORY_TRACE", "0") == "1"
+
+    # 스티커 파일 사전 업로드 동시 요청 수, 최대 시도 횟수
+    STICKER_UPLOAD_CONCURRENCY = 4
+    STICKER_UPLOAD_MAX_ATTEMPTS = 5
 
     @classmethod
     def init(cls):
@@ -49,10 +118,34 @@ class BotConfig:
 
     @classmethod
     def init_dir(cls):        
-        for path in [cls.IMG_PATH, cls.STICKER_IMG_PATH]:
-            if path.exists():
-                shutil.rmtree(path)
+        # 체크포인트가 남아 있는 작업 폴더는 재개를 위해 유지
+        # 나머지는 휴지통 폴더로 옮기기만 하고(rename) 실제 삭제는 봇 시작 후 백그라운드에서 처리
+        pending_ids = {path.stem for path in cls.JOB_PATH.glob("*.json")} if cls.JOB_PATH.exists() else set()
+
+        for path in cls.work_dirs():
             path.mkdir(parents=True, exist_ok=True)          
+            trash = path / cls.TRASH_DIR
+            for child in path.iterdir():
+                if child.name in pending_ids or child.name == cls.TRASH_DIR:
+                    continue
+                trash.mkdir(exist_ok=True)
+                child.rename(trash / f"{child.name}-{uuid.uuid4().hex[:8]}")
+
+        cls.JOB_PATH.mkdir(parents=True, exist_ok=True)
+
+    @classmethod
+    def work_dirs(cls) -> List[Path]:
+        return [cls.IMG_PATH, cls.STICKER_IMG_PATH, cls.SCRATCH_PATH]
+
+    @classmethod
+    def trash_dirs(cls) -> List[Path]:
+        return [path / cls.TRASH_DIR for path in cls.work_dirs()]
+
+    @classmethod
+    def queue_for(cls, sticker_data: StickerData) -> StickerJobQueue:
+        if OptionFlag.has_flag(sticker_data.option_flag, OptionFlag.FAST):
+            return cls.fast_job_queue
+        return cls.job_queue
     
     @classmethod
     def load_config(cls):        
@@ -65,15 +158,75 @@ class BotConfig:
         sticker_tag = os.getenv("STICKER_TAG")        
         cls.STICKER_TITLE_TAG = f"@{sticker_tag}"
         cls.STICKER_URL_TAG = f"_by_{sticker_tag}"
+        cls.UPDATE_MODE = os.getenv("UPDATE_MODE", cls.UPDATE_MODE)
+        cls.WEBHOOK_URL = os.getenv("WEBHOOK_URL", cls.WEBHOOK_URL)
+        cls.WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", cls.WEBHOOK_SECRET)
+        cls.WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", cls.WEBHOOK_HOST)
+        cls.WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", cls.WEBHOOK_PORT))
+        cls.WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", cls.WEBHOOK_PATH)
+        cls.PROCESSING_MODE = os.getenv("PROCESSING_MODE", cls.PROCESSING_MODE)
+        cls.WORK_QUEUE_URL = os.getenv("WORK_QUEUE_URL", cls.WORK_QUEUE_URL)
+        cls.WORK_QUEUE_SECRET = os.getenv("WORK_QUEUE_SECRET", cls.WORK_QUEUE_SECRET)
+        cls.METRICS_HOST = os.getenv("METRICS_HOST", cls.METRICS_HOST)
+        cls.METRICS_PORT = int(os.getenv("METRICS_PORT", cls.METRICS_PORT))
+        cls.SCRATCH_PATH = Path(os.getenv("SCRATCH_PATH", cls.SCRATCH_PATH))
+        cls.SCRATCH_QUOTA_MB = int(os.getenv("SCRATCH_QUOTA_MB", cls.SCRATCH_QUOTA_MB))
+        cls.RENDER_CACHE_PATH = Path(os.getenv("RENDER_CACHE_PATH", cls.RENDER_CACHE_PATH))
+        cls.RENDER_CACHE_QUOTA_MB = int(os.getenv("RENDER_CACHE_QUOTA_MB", cls.RENDER_CACHE_QUOTA_MB))
+        cls.MAX_CONCURRENT_TASKS = int(os.getenv("MAX_CONCURRENT_TASKS", cls.MAX_CONCURRENT_TASKS))
+        cls.MEMORY_BUDGET_MB = int(os.getenv("MEMORY_BUDGET_MB", cls.MEMORY_BUDGET_MB))
+        cls.QUEUE_MAX_SIZE = int(os.getenv("QUEUE_MAX_SIZE", cls.QUEUE_MAX_SIZE))
+        cls.QUEUE_AGING_RATE = float(os.getenv("QUEUE_AGING_RATE", cls.QUEUE_AGING_RATE))
+        cls.FAST_CONCURRENT_TASKS = int(os.getenv("FAST_CONCURRENT_TASKS", cls.FAST_CONCURRENT_TASKS))
+        cls.FAST_MEMORY_BUDGET_MB = int(os.getenv("FAST_MEMORY_BUDGET_MB", cls.FAST_MEMORY_BUDGET_MB))
+        CPU_POOL.configure(int(os.getenv("CPU_TOKENS", 0)))
+        UpscaleConfig.load_config()
+        cls.init_queues()
+
+    # remote면 메모리 예산을 쓰지 않음, 대기열은 사용자별로 번갈아 도착 순서대로 실행 (워커 메모리는 WORKER_CONCURRENCY로 제한)
+    @classmethod
+    def init_queues(cls):
+        remote = cls.PROCESSING_MODE == "remote"
+        cls.job_queue = StickerJobQueue(
+            slots=cls.MAX_CONCURRENT_TASKS,
+            max_depth=cls.QUEUE_MAX_SIZE,
+            wait_timeout=cls.QUEUE_WAIT_TIMEOUT,
+            memory_budget=0 if remote else cls.MEMORY_BUDGET_MB * 1024 * 1024,
+            aging_rate=cls.QUEUE_AGING_RATE
+        )
+        cls.fast_job_queue = StickerJobQueue(
+            slots=cls.FAST_CONCURRENT_TASKS,
+            max_depth=cls.QUEUE_MAX_SIZE,
+            wait_timeout=cls.QUEUE_WAIT_TIMEOUT,
+            memory_budget=0 if remote else cls.FAST_MEMORY_BUDGET_MB * 1024 * 1024,
+            aging_rate=cls.QUEUE_AGING_RATE
+        )
 
-    # 스티커 생성 동시 작업 수 제한
-    task_semaphore = asyncio.Semaphore(3)
+    # 스티커 생성 동시 작업 제한, 초과 요청은 대기열(예상 처리 시간이 짧은 작업 우선)에서 대기
+    # 실행 중인 작업의 메모리 추정치(프레임 수 x 크기 x 업스케일 배율) 합이 MEMORY_BUDGET_MB 안에서 실행, 작업 수는 MAX_CONCURRENT_TASKS까지
+    MAX_CONCURRENT_TASKS = 6
+    MEMORY_BUDGET_MB = 2048   # 0이면 작업 수로만 제한
+    QUEUE_MAX_SIZE = 20
+    QUEUE_WAIT_TIMEOUT = 1800   # 30분
+    # 대기 1초당 줄어드는 예상 처리 시간(초), 클수록 도착 순서에 가까워짐
+    QUEUE_AGING_RATE = 1.0
+    # 빠른 생성(-f) 전용 대기열, 일반 작업과 슬롯/메모리 예산을 따로 사용해서 긴 작업 뒤에서 기다리지 않음
+    FAST_CONCURRENT_TASKS = 4
+    FAST_MEMORY_BUDGET_MB = 512
+    # load_config에서 위 설정으로 생성
+    job_queue: StickerJobQueue
+    fast_job_queue: StickerJobQueue
     # 사용자별로 세마포어와 작업중인 디시콘 아이디 관리
     user_semaphore: Dict[int, Dict[str, asyncio.Semaphore | None]] = defaultdict(
         lambda: {'semaphore': asyncio.Semaphore(1), 'request_id': None}
     )
     # 현재 작업중인 목록
     sticker_tasks = {}
+    sticker_task_data: Dict[int, StickerData] = {}
+    # 작업 결과를 받을 채팅 목록 (같은 디시콘 요청은 하나의 작업으로 합침)
+    sticker_subscribers: Dict[int, set[int]] = defaultdict(set)
+    # /profile로 실행 중인 디시콘 (결과 스티커가 없으므로 다른 요청과 합치지 않음)
+    profiling_ids: set[int] = set()
     
     # 일일 요청 제한
     MAX_REQUESTS_PER_DAY = 10
@@ -92,16 +245,65 @@ class EliteMikoBot:
         self.logger = Logger(name="EliteMikoBot_Log")              
         self._validate_config()
         self.bot = Bot(token=token)
-        self.application = Application.builder().token(token).build()                        
+        self.db = DbApiClient(
+            base_url=BotConfig.BASE_URL,
+            timeout_sec=BotConfig.DB_API_TIMEOUT,
+            pool_size=BotConfig.DB_API_POOL_SIZE,
+            failure_threshold=BotConfig.DB_API_FAILURE_THRESHOLD,
+            reset_timeout_sec=BotConfig.DB_API_RESET_TIMEOUT
+        )
+        self.catalog = StickerCatalog(db_path=BotConfig.CATALOG_PATH, db=self.db)
+        self.workspaces = WorkspaceManager(
+            root=BotConfig.SCRATCH_PATH,
+            quota_mb=BotConfig.SCRATCH_QUOTA_MB,
+            ttl_sec=BotConfig.CHECKPOINT_TTL
+        )
+        self.processor = self._create_processor()
+        self._catalog_sync_task: Optional[asyncio.Task] = None
+        self._workspace_gc_task: Optional[asyncio.Task] = None
+        self._startup_task: Optional[asyncio.Task] = None
+        self._resume_task: Optional[asyncio.Task] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.webhook_server: Optional[WebhookServer] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.application = (
+            Application.builder()
+            .token(token)
+            .post_init(self._post_init)
+            .post_shutdown(self._post_shutdown)
+            .build()
+        )
         self._setup_handlers()                                        
 
     
+    # local: 봇 프로세스에서 직접 처리, remote: 공유 작업 큐를 통해 워커에서 처리
+    def _create_processor(self) -> Union[StickerProcessor, RemoteStickerProcessor]:
+        if BotConfig.PROCESSING_MODE == "remote":
+            return RemoteStickerProcessor(
+                queue=open_work_queue(BotConfig.WORK_QUEUE_URL, BotConfig.WORK_QUEUE_SECRET),
+                sticker_path=BotConfig.STICKER_IMG_PATH
+            )
+
+        return StickerProcessor(
+            img_path=BotConfig.IMG_PATH,
+            sticker_path=BotConfig.STICKER_IMG_PATH,
+            workspaces=self.workspaces,
+            cache=open_render_cache(BotConfig.RENDER_CACHE_PATH, BotConfig.RENDER_CACHE_QUOTA_MB)
+        )
+
+
     def _validate_config(self) -> None:              
         missing_configs = [
             config for config in ["BOT_TOKEN", "DEVELOPER_ID", "DEVELOPER_NAME"]
             if getattr(BotConfig, config) is None
         ]
 
+        if BotConfig.UPDATE_MODE == "webhook":
+            missing_configs += [
+                config for config in ["WEBHOOK_URL", "WEBHOOK_SECRET"]
+                if getattr(BotConfig, config) is None
+            ]
+
         if missing_configs:
             print(f"Missing configuration: {missing_configs}")
             exit(1)
@@ -145,17 +347,165 @@ class EliteMikoBot:
         self.application.add_handler(CommandHandler("help", self._help))
         self.application.add_handler(CommandHandler("cancel", self._cancel))
         self.application.add_handler(CommandHandler("stop", self._stop))
+        self.application.add_handler(CommandHandler("profile", self._profile))
         self.application.add_handler(CommandHandler("remove_sticker_set", self._remove_sticker_set))                           
 
 
+    # 애플리케이션 시작/종료 시 DB 클라이언트 세션, 스티커 카탈로그 생성/정리
+    async def _post_init(self, application: Application) -> None:
+        if BotConfig.MEMORY_TRACE and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        await self.db.start()
+        await self.catalog.open()
+        self._catalog_sync_task = asyncio.create_task(
+            self.catalog.run_sync_loop(BotConfig.CATALOG_SYNC_INTERVAL, BotConfig.CATALOG_RECONCILE_INTERVAL)
+        )
+        self._workspace_gc_task = asyncio.create_task(
+            self.workspaces.run_gc_loop(BotConfig.SCRATCH_GC_INTERVAL)
+        )
+        await self._resume_pending_jobs()
+        self._startup_task = asyncio.create_task(self._finish_startup())
+
+        if BotConfig.METRICS_PORT:
+            self._register_job_metrics()
+            self.metrics_server = MetricsServer(BotConfig.METRICS_HOST, BotConfig.METRICS_PORT)
+            await self.metrics_server.start()
+
+
+    async def _post_shutdown(self, application: Application) -> None:
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        for task in [self._catalog_sync_task, self._workspace_gc_task, self._startup_task, self._resume_task]:
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        await self.catalog.close()
+        await self.db.close()
+        if isinstance(self.processor, RemoteStickerProcessor):
+            await self.processor.queue.close()
+
+
+    # 업데이트 수신을 시작한 뒤 백그라운드에서 이전 작업 폴더 삭제, 이미지 처리 모듈 불러오기
+    async def _finish_startup(self) -> None:
+        start = time.perf_counter()
+        await asyncio.gather(
+            Deleter.delete_paths(BotConfig.trash_dirs()),
+            self._warmup()
+        )
+        self.logger.info(
+            action="finish startup",
+            user="EliteMikoBot",
+            data={"elapsed": round(time.perf_counter() - start, 2)},
+            message="Cleared old work directories and warmed up image modules"
+        )
+
+
+    # cv2/numpy/waifu2x 모듈을 미리 불러와서 첫 작업이 import 시간을 기다리지 않도록 함
+    async def _warmup(self) -> None:
+        if not isinstance(self.processor, StickerProcessor):
+            return
+
+        try:
+            await asyncio.to_thread(importlib.import_module, "elitemikobot.upscaler")
+        except Exception as e:
+            self.logger.warning(
+                action="Exception _warmup",
+                user="EliteMikoBot",
+                data=None,
+                message=f"{e}"
+            )
+
+
+    # 대기열 길이, 실행 중인 작업 수, 슬롯 포화도, 메모리 예약량
+    def _register_job_metrics(self) -> None:
+        REGISTRY.register(Gauge(
+            "elitemikobot_queue_depth", "Number of sticker jobs waiting for a slot",
+            func=lambda: BotConfig.job_queue.waiting
+        ))
+        REGISTRY.register(Gauge(
+            "elitemikobot_active_jobs", "Number of sticker jobs holding a slot",
+            func=lambda: BotConfig.job_queue.active
+        ))
+        REGISTRY.register(Gauge(
+            "elitemikobot_slot_saturation", "Ratio of busy job slots",
+            func=lambda: BotConfig.job_queue.active / BotConfig.job_queue.slots
+        ))
+        REGISTRY.register(Gauge(
+            "elitemikobot_reserved_memory_bytes", "Sum of memory estimates of running sticker jobs",
+            func=lambda: BotConfig.job_queue.memory_used
+        ))
+        REGISTRY.register(Gauge(
+            "elitemikobot_process_rss_bytes", "Resident set size of the bot process",
+            func=current_rss
+        ))
+
+        REGISTRY.register(Gauge(
+            "elitemikobot_fast_queue_depth", "Number of fast (-f) sticker jobs waiting for a slot",
+            func=lambda: BotConfig.fast_job_queue.waiting
+        ))
+        REGISTRY.register(Gauge(
+            "elitemikobot_fast_active_jobs", "Number of fast (-f) sticker jobs holding a slot",
+            func=lambda: BotConfig.fast_job_queue.active
+        ))
+        REGISTRY.register(Gauge(
+            "elitemikobot_fast_slot_saturation", "Ratio of busy fast (-f) job slots",
+            func=lambda: BotConfig.fast_job_queue.active / BotConfig.fast_job_queue.slots
+        ))
+
+
     def run(self) -> None:        
         self.logger.info(
             action="start bot",
             user=f"{BotConfig.DEVELOPER_NAME}({BotConfig.DEVELOPER_ID})",
-            data=None,
+            data={"update_mode": BotConfig.UPDATE_MODE},
             message="Start EliteMikoBot"
         )
-        self.application.run_polling(allowed_updates=Update.ALL_TYPES, drop_pending_updates=True)
+        if BotConfig.UPDATE_MODE == "webhook":
+            asyncio.run(self._run_webhook())
+        else:
+            self.application.run_polling(allowed_updates=Update.ALL_TYPES, drop_pending_updates=True)
+
+
+    # webhook 모드, 종료 신호(SIGINT/SIGTERM)나 /stop까지 실행
+    async def _run_webhook(self) -> None:
+        self._stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._stop_event.set)
+            except NotImplementedError:
+                # Windows는 KeyboardInterrupt로 종료
+                pass
+
+        self.webhook_server = WebhookServer(
+            application=self.application,
+            host=BotConfig.WEBHOOK_HOST,
+            port=BotConfig.WEBHOOK_PORT,
+            path=BotConfig.WEBHOOK_PATH,
+            secret_token=BotConfig.WEBHOOK_SECRET
+        )
+
+        await self.application.initialize()
+        try:
+            await self._post_init(self.application)
+            await self.application.start()
+            await self.webhook_server.start()
+            await self.application.bot.set_webhook(
+                url=BotConfig.WEBHOOK_URL,
+                secret_token=BotConfig.WEBHOOK_SECRET,
+                allowed_updates=Update.ALL_TYPES,
+                drop_pending_updates=True
+            )
+            await self._stop_event.wait()
+        finally:
+            await self.webhook_server.stop()
+            if self.application.running:
+                await self.application.stop()
+            await self._post_shutdown(self.application)
+            await self.application.shutdown()
 
 
     # 시작
@@ -187,7 +537,9 @@ class EliteMikoBot:
             "/cancel [dccon id] 를 통해 작업중인 스티커를 취소할 수 있습니다. \n\n"
             "등록되어 있는 스티커가 이상할 경우 -o 옵션을 통해 다시 만들 수 있습니다. \n"
             " ex) /create -o 138771 \n\n"
-            "작업을 거절당하면 잠시 후에 다시 시도해주세요."
+            "-f 옵션을 사용하면 인공지능 업스케일 없이 빠르게 만들 수 있습니다. (화질은 낮아집니다) \n"
+            " ex) /create -f 138771 \n\n"
+            "작업이 많으면 대기열에서 순서대로 처리되며, 대기열이 가득 차서 거절당하면 잠시 후에 다시 시도해주세요."
         )
 
     async def _create(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -245,11 +597,10 @@ class EliteMikoBot:
                 await update.message.reply_text("합칠 디시콘 번호를 입력해줘 (예: 1 3 5 7)")
                 return HandlerState.ASK_MERGE_NUMS
             else:            
-                await update.message.reply_text("작업을 시작한다 니에")
-                task = asyncio.create_task(
-                    self._process_sticker_request(update, context, sticker_data)
-                )
-                BotConfig.sticker_tasks[sticker_data.id] = task
+                # 응답을 기다리는 동안 같은 디시콘 요청이 들어오면 합쳐지도록 작업부터 등록
+                start_message = self._start_message(sticker_data)
+                self._start_sticker_task(update.effective_chat.id, sticker_data)
+                await update.message.reply_text(start_message)
                 return ConversationHandler.END
             
         except asyncio.TimeoutError:
@@ -296,7 +647,7 @@ class EliteMikoBot:
 
 
     def _parse_command(self, user_text: str) -> Optional[tuple[int, OptionFlag]]:        
-        # ex) /create 138771 or /create -m 138771
+        # ex) /create 138771 or /create -m 138771 or /create -f 138771
         parts = user_text.split()
         if not parts:
             return None
@@ -311,17 +662,24 @@ class EliteMikoBot:
             option_flag = OptionFlag.set_flag(option_flag, OptionFlag.OVERWRITE)
         if "-m" in parts:
             option_flag = OptionFlag.set_flag(option_flag, OptionFlag.MERGE)  
+        if "-f" in parts:
+            option_flag = OptionFlag.set_flag(option_flag, OptionFlag.FAST)
                     
         return int(dccon_id), option_flag
     
 
     async def _get_sticker_url(self, sticker_data: StickerData) -> Union[str, None, bool]:
+        # 로컬 복제본에 있으면 바로 응답, 없으면 다음 동기화 전에 등록됐을 수 있으므로 DB에 확인
+        if self.catalog.ready:
+            url = self.catalog.get_url(sticker_data)
+            if url:
+                return url
+
         try:
-            async with DbApiClient(BotConfig.BASE_URL, sticker_data) as db:
-                if await db.check_sticker_exists():
-                    return await db.get_sticker_url()
-                else:
-                    return False
+            if await self.db.check_sticker_exists(sticker_data):
+                return await self.db.get_sticker_url(sticker_data)
+            else:
+                return False
         except Exception as e:            
             return None
 
@@ -348,25 +706,26 @@ class EliteMikoBot:
         
         sticker_data.merge_nums = merge_nums
 
-        await update.message.reply_text(f"작업을 시작한다 니에")
-        task = asyncio.create_task(
-            self._process_sticker_request(update, context, sticker_data)
-        )
-        BotConfig.sticker_tasks[sticker_data.id] = task
+        await update.message.reply_text(self._start_message(sticker_data))
+        self._start_sticker_task(update.effective_chat.id, sticker_data)
         return ConversationHandler.END
     
                       
     async def _is_request_permitted(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, sticker_data: StickerData) -> bool:    
-        if BotConfig.task_semaphore.locked():
+        # 같은 디시콘이 이미 작업중이면 새 작업을 만들지 않고 완료 시 결과를 같이 받도록 등록
+        if await self._subscribe_running_task(update, context, user, sticker_data):
+            return False
+
+        if BotConfig.queue_for(sticker_data).is_full():
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
-                text=f"{user.id}번 디씨콘 작업을 거절당했다 니에... (동시 작업 수 초과)"
+                text=f"{sticker_data.id}번 디씨콘 작업을 거절당했다 니에... (대기열 초과)"
             )
             self.logger.info(
                 action="request denied",
                 user=f"{user.name}({user.id})",
                 data={"dccon_id":sticker_data.id, "status":"denied"},
-                message="Request denied due to exceeding the concurrent task limit"
+                message="Request denied due to exceeding the job queue limit"
             )
             return False
         
@@ -380,32 +739,157 @@ class EliteMikoBot:
         if sticker_data.id in BotConfig.sticker_tasks:
             await context.bot.send_message(
                 chat_id=update.effective_chat.id,
-                text=f"{sticker_data.id}번 디씨콘은 이미 작업중이니에~ 조금만 기다려줘"
+                text=f"{sticker_data.id}번 디씨콘은 다른 옵션으로 작업중이니에~ 끝나면 다시 요청해줘"
             )
             return False
 
         BotConfig.user_semaphore[user.id]['request_id'] = sticker_data.id
         return True
+
+
+    async def _subscribe_running_task(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user: User, sticker_data: StickerData) -> bool:
+        running = BotConfig.sticker_task_data.get(sticker_data.id)
+        if running is None or sticker_data.id not in BotConfig.sticker_tasks or sticker_data.id in BotConfig.profiling_ids:
+            return False
+
+        # 병합(-m), 빠른 생성(-f) 여부가 다르면 결과물이 다르므로 합치지 않음
+        for flag in (OptionFlag.MERGE, OptionFlag.FAST):
+            if OptionFlag.has_flag(running.option_flag, flag) != OptionFlag.has_flag(sticker_data.option_flag, flag):
+                return False
+
+        BotConfig.sticker_subscribers[sticker_data.id].add(update.effective_chat.id)
+        await context.bot.send_message(
+            chat_id=update.effective_chat.id,
+            text=f"{sticker_data.id}번 디씨콘은 이미 작업중이니에~ 완료되면 같이 보내줄게"
+        )
+        self.logger.info(
+            action="subscribe sticker request",
+            user=f"{user.name}({user.id})",
+            data={"dccon_id": sticker_data.id, "status": "subscribed"},
+            message="Coalesced onto the running task"
+        )
+        return True
+
+
+    # 작업 시작, 요청한 채팅은 결과를 받을 구독자로 등록
+    # 다운로드 전에 대기열 자리를 예약해서 다운로드가 끝난 작업이 대기열 초과로 버려지지 않게 함
+    def _start_sticker_task(self, chat_id: int, sticker_data: StickerData, manifest: Optional[JobManifest] = None, profile: bool = False) -> None:
+        BotConfig.sticker_task_data[sticker_data.id] = sticker_data
+        BotConfig.sticker_subscribers[sticker_data.id].add(chat_id)
+        BotConfig.queue_for(sticker_data).reserve()
+        BotConfig.sticker_tasks[sticker_data.id] = asyncio.create_task(
+            self._process_sticker_request(chat_id, sticker_data, manifest, profile=profile)
+        )
+
+
+    # 작업 결과를 받을 채팅 목록 (요청한 채팅 + 같은 디시콘을 요청한 채팅)
+    def _subscriber_chat_ids(self, chat_id: int, dccon_id: int) -> List[int]:
+        subscribers = BotConfig.sticker_subscribers.get(dccon_id, set())
+        return [chat_id] + [sub for sub in subscribers if sub != chat_id]
+
+
+    # 실패 처리 중에도 호출되므로 전송 오류는 기록만 하고 다음 구독자에게 계속 보냄
+    async def _send_to_subscribers(self, chat_id: int, dccon_id: int, text: str) -> None:
+        for subscriber in self._subscriber_chat_ids(chat_id, dccon_id):
+            try:
+                await self.application.bot.send_message(chat_id=subscriber, text=text)
+            except Exception as e:
+                self.logger.warning(
+                    action="Exception _send_to_subscribers",
+                    user=" ",
+                    data={"dccon_id": dccon_id, "chat_id": subscriber},
+                    message=f"{e}"
+                )
+
+
+    def _start_message(self, sticker_data: StickerData) -> str:
+        if BotConfig.queue_for(sticker_data).has_free_slot():
+            return "작업을 시작한다 니에"
+        return "작업을 대기열에 등록했다 니에"
+
+
+    # 대기 순번 안내 메세지, 첫 메세지를 보낸 뒤 순번이 바뀔 때마다 수정
+    def _queue_position_notifier(self, chat_id: int, dccon_id: int):
+        message = None
+
+        async def notify(position: int) -> None:
+            nonlocal message
+            text = (
+                f"{dccon_id}번 디씨콘 차례가 되어 작업을 시작한다 니에" if position == 0
+                else f"{dccon_id}번 디씨콘 대기 순번: {position}번째"
+            )
+            try:
+                if message is None:
+                    message = await self.application.bot.send_message(chat_id=chat_id, text=text)
+                else:
+                    await message.edit_text(text)
+            except Exception as e:
+                self.logger.warning(
+                    action="Exception _queue_position_notifier",
+                    user=" ",
+                    data={"dccon_id": dccon_id, "position": position},
+                    message=f"{e}"
+                )
+
+        return notify
         
 
-    # 이미지 처리 → 업스케일 → 스티커 세트 생성
-    async def _process_sticker_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE, sticker_data: StickerData) -> None:        
+    # 다운로드 → (메모리/처리 시간 추정치로 예약한 대기열 자리에 등록) → 업스케일 → 스티커 세트 생성
+    # 단계마다 체크포인트를 저장하고, 실패/시간 초과 시 체크포인트를 남겨 다음 요청이나 재시작 때 이어서 진행
+    # profile이면 스티커 세트를 만들지 않고 처리 과정만 프로파일링해서 결과를 보냄
+    async def _process_sticker_request(self, chat_id: int, sticker_data: StickerData, manifest: Optional[JobManifest] = None, profile: bool = False) -> None:        
+        user_log = f"{sticker_data.user_name}({sticker_data.user_id})"
+        keep_checkpoint = not profile
+        reserved = True
+
         try:            
-            user = update.message.from_user
-            user_semaphore = BotConfig.user_semaphore[user.id]['semaphore']                                                                        
+            user_semaphore = BotConfig.user_semaphore[sticker_data.user_id]['semaphore']                                                                        
+            on_position = self._queue_position_notifier(chat_id, sticker_data.id)
+
+            # 다운로드 후 작업 메모리/처리 시간 추정 (profile도 같은 추정치로 대기열에 등록하고, 다운로드 단계 시간은 프로파일 결과에 포함)
+            if profile:
+                manifest = JobManifest.create(BotConfig.JOB_PATH, chat_id, sticker_data)
+            else:
+                manifest = manifest or await self._load_or_create_manifest(chat_id, sticker_data)
+                manifest.attempts += 1
+                await manifest.save()
+            prepare_start = time.perf_counter()
+            with collect_stages() as prepare_stages:
+                estimate = await asyncio.wait_for(
+                    self._prepare_processing(sticker_data=sticker_data, manifest=manifest),
+                    timeout=BotConfig.IMG_PROCESSING_TIMEOUT
+                )
+            prepare_elapsed = time.perf_counter() - prepare_start
+            # 다운로드 실패는 대기열에서 기다리지 않고 바로 알림
+            if estimate is None:
+                await self._send_to_subscribers(chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업을 실패했다니에...")
+                self.logger.warning(
+                    action="Fail send sticker url",
+                    user=user_log,
+                    data={"dccon_id":sticker_data.id, "status":"fail"},
+                    message="_prepare_processing is fail"
+                )
+                return
+
+            # 대기열 슬롯, user_semaphore 세마포어 획득 (예약한 자리는 slot에 들어가면서 사용)
+            reserved = False
+            async with BotConfig.queue_for(sticker_data).slot(sticker_data.user_id, sticker_data.id, on_position, estimate.memory, estimate.cost, reserved=True), user_semaphore:
+                if profile:
+                    await self._profile_sticker_request(chat_id, sticker_data, manifest, prepare_stages, prepare_elapsed)
+                    return
+
+                started = time.perf_counter()
 
-            # task_semaphore, user_semaphore 세마포어 획득
-            async with BotConfig.task_semaphore, user_semaphore:
                 # 이미지 처리(timeout 제한)
                 img_processing_result = await asyncio.wait_for(
-                    self._img_processing(update=update, user=user, sticker_data=sticker_data),
+                    self._img_processing(sticker_data=sticker_data, manifest=manifest),
                     timeout=BotConfig.IMG_PROCESSING_TIMEOUT
                 )
 
                 # 스티커 처리(timeout 제한)
                 if img_processing_result:
                     sticker_processing_result = await asyncio.wait_for(
-                    self._sticker_processing(user=user, sticker_data=sticker_data),
+                    self._sticker_processing(sticker_data=sticker_data, manifest=manifest),
                     timeout=BotConfig.STICKER_PROCESSING_TIMEOUT
                 )
                 else:
@@ -413,201 +897,343 @@ class EliteMikoBot:
 
                 # 처리 결과 확인                
                 if sticker_processing_result:
+                    keep_checkpoint = False
                     sticker_data.url = f"https://t.me/addstickers/{sticker_data.url}"
+                    if estimate.cost:
+                        JOB_COST_RATIO.observe((time.perf_counter() - started) / estimate.cost)
 
-                    await self._send_sticker_url(update, context, sticker_data)          
+                    await self._send_sticker_url(chat_id, sticker_data)          
 
                     self.logger.info(
                         action="Send sticker url",
-                        user=f"{user.name}({user.id})",
+                        user=user_log,
                         data={"dccon_id":sticker_data.id, "status":"complete"},
                         message="Send sticker url Success"
                     )     
                     
                     # 스티커 DB에 저장
-                    async with DbApiClient(BotConfig.BASE_URL, sticker_data) as db:
-                        sticker_data.date_time = dt.datetime.now()                        
-                        await db.register_sticker()
+                    sticker_data.date_time = dt.datetime.now()                        
+                    with stage_timer("db_register"):
+                        await self.db.register_sticker(sticker_data)
+                    await self.catalog.record(sticker_data)
                 else:                    
-                    await context.bot.send_message(
-                        chat_id=update.effective_chat.id, 
-                        text=f"{sticker_data.id}번 디씨콘 작업을 실패했다니에..."
-                    )   
+                    await self._send_to_subscribers(chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업을 실패했다니에...")
                     self.logger.warning(
                         action="Fail send sticker url",
-                        user=f"{user.name}({user.id})",
+                        user=user_log,
                         data={"dccon_id":sticker_data.id, "status":"fail"},
                         message="_img_processing is fail"
                     )           
 
         except aiohttp.ClientError as e:
+            await self._send_to_subscribers(chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업을 실패했다니에...")
             self.logger.error(
                 action="aiohttp.ClientError _process_sticker_request",
-                user=f"{user.name}({user.id})",
+                user=user_log,
                 data={"dccon_id":sticker_data.id, "status":"aiohttp.ClientError"},
                 message=f"{e}"
             ) 
             raise
+        except (QueueTimeoutError, QueueFullError) as e:
+            await self._send_to_subscribers(
+                chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업이 대기 중에 취소됐다 니에... 잠시 후에 다시 시도해줘"
+            )
+            self.logger.warning(
+                action="Queue _process_sticker_request",
+                user=user_log,
+                data={"dccon_id": sticker_data.id, "status": "dropped"},
+                message=f"{e}"
+            )
         except asyncio.TimeoutError as e:
+            await self._send_to_subscribers(
+                chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업이 시간 초과로 중단됐다 니에... 다시 요청하면 이어서 진행한다 니에"
+            )
             self.logger.error(
                 action="TimeoutError _process_sticker_request",
-                user=f"{user.name}({user.id})",
+                user=user_log,
                 data={"dccon_id": sticker_data.id, "status": "timeout"},
                 message="The task timed out"
             )
             raise
         except FileNotFoundError as e:
+            await self._send_to_subscribers(chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업을 실패했다니에...")
             self.logger.error(
                 action="Exception _process_sticker_request",
-                user=f"{user.name}({user.id})",
+                user=user_log,
                 data={"dccon_id":sticker_data.id, "status":"FileNotFoundError"},
                 message=f"{e}"
             )
             raise
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
+            await self._send_to_subscribers(chat_id, sticker_data.id, f"{sticker_data.id}번 디씨콘 작업을 실패했다니에...")
             self.logger.error(
                 action="Exception _process_sticker_request",
-                user=f"{user.name}({user.id})",
+                user=user_log,
                 data={"dccon_id":sticker_data.id, "status":"except"},
                 message=f"{e}"
             )   
             raise
         finally:                        
-            await self._cleanup_sticker_task(user_id=user.id, dccon_id=sticker_data.id)
+            if reserved:
+                BotConfig.queue_for(sticker_data).cancel_reservation()
+            BotConfig.profiling_ids.discard(sticker_data.id)
+            await self._cleanup_sticker_task(
+                user_id=sticker_data.user_id,
+                dccon_id=sticker_data.id,
+                keep_checkpoint=keep_checkpoint
+            )
+
+
+    # 같은 요청의 체크포인트가 있으면 재사용, 옵션이 다르면 버리고 새로 시작
+    async def _load_or_create_manifest(self, chat_id: int, sticker_data: StickerData) -> JobManifest:
+        path = BotConfig.JOB_PATH / f"{sticker_data.id}.json"
+
+        if path.exists():
+            try:
+                manifest = await asyncio.to_thread(JobManifest.load, path)
+                if manifest.matches(sticker_data):
+                    # 사용자가 다시 요청하면 시도 횟수를 처음부터 셈
+                    manifest.attempts = 0
+                    manifest.chat_id = chat_id
+                    manifest.sticker.user_id = sticker_data.user_id
+                    manifest.sticker.user_name = sticker_data.user_name
+                    await manifest.save()
+                    return manifest
+            except Exception as e:
+                self.logger.warning(
+                    action="Exception _load_or_create_manifest",
+                    user=" ",
+                    data={"dccon_id": sticker_data.id},
+                    message=f"{e}"
+                )
+
+            await self._delete_job_files(sticker_data.id)
+
+        manifest = JobManifest.create(BotConfig.JOB_PATH, chat_id, sticker_data)
+        await manifest.save()
+        return manifest
+
+
+    # 재시작 시 남아 있는 체크포인트 작업 재개
+    # 대기열이 가득 차면 나머지는 자리가 날 때까지 RESUME_RETRY_INTERVAL마다 다시 시도
+    async def _resume_pending_jobs(self) -> None:
+        pending = []
+        for manifest in await asyncio.to_thread(JobManifest.load_all, BotConfig.JOB_PATH):
+            sticker_data = manifest.sticker
+
+            if time.time() - manifest.updated_at > BotConfig.CHECKPOINT_TTL:
+                await self._delete_job_files(sticker_data.id)
+                continue
+
+            # 여러 번 시도해도 실패한 작업은 재시작마다 다시 실행하지 않음
+            if manifest.attempts >= BotConfig.CHECKPOINT_MAX_ATTEMPTS:
+                await self._delete_job_files(sticker_data.id)
+                self.logger.warning(
+                    action="drop sticker request",
+                    user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                    data={"dccon_id": sticker_data.id, "status": "dropped", "attempts": manifest.attempts},
+                    message="Checkpoint failed too many times, not resuming"
+                )
+                continue
+
+            pending.append(manifest)
+
+        deferred = self._resume_jobs(pending)
+        if deferred:
+            self.logger.warning(
+                action="defer sticker request",
+                user="EliteMikoBot",
+                data={"dccon_ids": [manifest.sticker.id for manifest in deferred], "status": "deferred"},
+                message="Job queue is full, resuming the remaining checkpoints later"
+            )
+            self._resume_task = asyncio.create_task(self._resume_deferred_jobs(deferred))
+
+
+    # 대기열에 자리가 있는 만큼 체크포인트 작업 시작, 시작하지 못한 체크포인트 리턴
+    # 기다리는 사이 같은 요청이 들어와 처리됐거나 처리 중이면 건너뜀
+    def _resume_jobs(self, manifests: List[JobManifest]) -> List[JobManifest]:
+        deferred = []
+        for manifest in manifests:
+            sticker_data = manifest.sticker
+
+            if sticker_data.id in BotConfig.sticker_tasks or not manifest.path.exists():
+                continue
+
+            if BotConfig.queue_for(sticker_data).is_full():
+                deferred.append(manifest)
+                continue
+
+            BotConfig.user_semaphore[sticker_data.user_id]['request_id'] = sticker_data.id
+            self._start_sticker_task(manifest.chat_id, sticker_data, manifest)
+            self.logger.info(
+                action="resume sticker request",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                data={"dccon_id": sticker_data.id, "status": "resume"},
+                message="Resume sticker request from checkpoint"
+            )
+        return deferred
+
+
+    async def _resume_deferred_jobs(self, manifests: List[JobManifest]) -> None:
+        while manifests:
+            await asyncio.sleep(BotConfig.RESUME_RETRY_INTERVAL)
+            manifests = self._resume_jobs(manifests)
                         
 
-    # 이미지 처리
-    async def _img_processing(self, update: Update, user: User, sticker_data: StickerData) -> int:
+    # 다운로드, 작업 메모리/처리 시간 추정치 리턴, 실패하면 None
+    async def _prepare_processing(self, sticker_data: StickerData, manifest: JobManifest) -> Optional[JobEstimate]:
         try:
-            dccon_data = await self._process_dccon(sticker_data)
-            if not dccon_data:            
-                return False
-            
-            sticker_data.update_from_dccon_data(dccon_data)
+            estimate = await self.processor.prepare(sticker_data, manifest)
+        except Exception as e:
+            self.logger.error(
+                action="Exception _prepare_processing",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                data={"dccon_id": sticker_data.id, "status": "except"},
+                message=f"{e}"
+            )
+            return None
 
-            upscale_result = await self._process_upscaler(dccon_data, sticker_data)
-            if not upscale_result:                
-                return False
+        if estimate is not None and estimate.images:
+            self.logger.info(
+                action="estimate job",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                data={"dccon_id": sticker_data.id, **estimate.to_dict()},
+                message="Estimated job memory and cost for admission"
+            )
+        return estimate
 
-            return True
+
+    # 이미지 처리 (로컬 처리 또는 워커에 위임)
+    async def _img_processing(self, sticker_data: StickerData, manifest: JobManifest) -> int:
+        try:
+            dccon_data = await self.processor.process(sticker_data, manifest)
+            return dccon_data is not None
         
         except Exception as e: 
             self.logger.error(
                 action="Exception _img_processing",
-                user=f"{user.name}({user.id})",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
                 data={"dccon_id":sticker_data.id, "status":"except"},
                 message=f"{e}"           
             )
             return False
             
 
-    async def _process_dccon(self, sticker_data: StickerData) -> Optional[DcconData]:
-        dccon = Dccon()        
-        save_path = Path(BotConfig.IMG_PATH) / str(sticker_data.id)
-        dccon_data = await dccon.process_dccon(
-            dccon_id=sticker_data.id, 
-            save_path=str(save_path)
-        )
-
-        if dccon_data.err:
-            self.logger.warning(
-                action="dccon_data fail",
-                user=f"{sticker_data.user_name}({sticker_data.user_id})",
-                data={"dccon_id":sticker_data.id, "status":"fail"},
-                message=f"{dccon_data.err}"
-            )
-            return None
-                
-        self.logger.info(
-            action="fetch dccon data",
-            user=f"{sticker_data.user_name}({sticker_data.user_id})",
-            data={"dccon_id":sticker_data.id, "status":"complete"},
-            message="Fetch dccon data completed successfully"
-        )   
-        return dccon_data
-
-
-    async def _process_upscaler(self, dccon_data: DcconData, sticker_data: StickerData) -> bool:        
-        upscaler = Upscaler(
-            dccon_data=dccon_data,
-            sticker_path=str(Path(BotConfig.STICKER_IMG_PATH) / str(sticker_data.id)),
-            merge_nums=sticker_data.merge_nums
-        )
-        result = await upscaler.upscaler()
-
-        if not result:
-            return False
-
-        self.logger.info(
-            action="upscaler upscale",
-            user=f"{sticker_data.user_name}({sticker_data.user_id})",
-            data={"dccon_id": sticker_data.id, "status": "complete"},
-            message="Upscaler upscale completed successfully"
-        )
-        return True
-    
     # 스티커 처리
-    async def _sticker_processing(self, user: User, sticker_data: StickerData) -> bool:                     
+    async def _sticker_processing(self, sticker_data: StickerData, manifest: JobManifest) -> bool:                     
         try:            
-            sticker_set, sticker_set2 = await self._prepare_stickers(sticker_data)
-            
-            await self._generate_unique_sticker_url(sticker_data)            
+            stickers = await self._prepare_stickers(sticker_data, manifest)
             
-            await self._create_new_sticker_set(sticker_data, sticker_set)
+            if not manifest.set_created:
+                await self._generate_unique_sticker_url(sticker_data)            
+                # 스티커 세트는 최대 50개까지만 한 번에 생성 가능
+                await self._create_new_sticker_set(sticker_data, stickers[:50])
+                manifest.sticker.url = sticker_data.url
+                manifest.set_created = True
+                manifest.added_count = min(len(stickers), 50)
+                await manifest.save()
+            else:
+                sticker_data.url = manifest.sticker.url
             
-            if sticker_set2:
-                await self._add_stickers_to_set(sticker_data, sticker_set2)
+            if manifest.added_count < len(stickers):
+                await self._add_stickers_to_set(sticker_data, stickers, manifest)
                          
             return True        
         
         except Exception as e:             
             self.logger.error(
                 action="Exception _sticker_processing",
-                user=f"{user.name}({user.id})",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
                 data={"dccon_id":sticker_data.id, "status":"except"},
                 message=f"{e}"           
             )
             return False
 
 
-    async def _prepare_stickers(self, sticker_data: StickerData) -> tuple[List[InputSticker], Optional[List[InputSticker]]]:                      
+    async def _prepare_stickers(self, sticker_data: StickerData, manifest: JobManifest) -> List[InputSticker]:                      
         path = Path(BotConfig.STICKER_IMG_PATH) / str(sticker_data.id)    
-        sticker_set = []
-        sticker_set2 = []
         merge_nums = sticker_data.merge_nums if sticker_data.merge_nums is not None else []
+        files = []
 
         i = 1
         while i <= sticker_data.count:         
             ext = "webm" if sticker_data.ext[i] == "gif" else "png"
             fmt = "video" if ext == "webm" else "static"
-            file_path = path / f"{i}.{ext}"
-            
-            sticker = InputSticker(
-                    sticker=open(file_path, "rb"),
-                    emoji_list=["\U0001F338"],
-                    format=fmt
-            )            
-            # 스티커 세트는 최대 50개까지만 추가 가능하므로, 50개 초과 시 분리해서 저장
-            (sticker_set if len(sticker_set) < 50 else sticker_set2).append(sticker)
+            files.append((i, path / f"{i}.{ext}", fmt))
 
             i += (2 if i in merge_nums else 1)
-            
-        return sticker_set, sticker_set2
+
+        # 스티커 파일을 미리 업로드하고 file_id로 세트 생성/추가 (이미 업로드된 파일은 건너뜀)
+        sema = asyncio.Semaphore(BotConfig.STICKER_UPLOAD_CONCURRENCY)
+        file_ids = await asyncio.gather(
+            *[self._upload_sticker_file(sticker_data, num, file_path, fmt, sema, manifest) for num, file_path, fmt in files]
+        )
+
+        return [
+            InputSticker(sticker=file_id, emoji_list=["\U0001F338"], format=fmt)
+            for file_id, (_, _, fmt) in zip(file_ids, files)
+        ]
+
+
+    # 스티커 파일 업로드, flood control(RetryAfter)은 요청된 시간만큼 대기 후 재시도
+    # BadRequest(파일 형식/크기 오류 등)는 NetworkError의 하위 클래스지만 다시 보내도 같으므로 재시도하지 않음
+    async def _upload_sticker_file(self, sticker_data: StickerData, num: int, file_path: Path, fmt: str, sema: asyncio.Semaphore, manifest: JobManifest) -> str:
+        if num in manifest.uploaded:
+            return manifest.uploaded[num]
+
+        content = await asyncio.to_thread(file_path.read_bytes)
+
+        for attempt in range(BotConfig.STICKER_UPLOAD_MAX_ATTEMPTS):
+            try:
+                async with sema:
+                    with stage_timer("upload"):
+                        uploaded = await self.bot.upload_sticker_file(
+                            user_id=BotConfig.DEVELOPER_ID,
+                            sticker=InputFile(content, filename=file_path.name),
+                            sticker_format=fmt,
+                            read_timeout=60,
+                            write_timeout=60
+                        )
+                manifest.uploaded[num] = uploaded.file_id
+                await manifest.save()
+                return uploaded.file_id
+
+            except RetryAfter as e:
+                delay, err = e.retry_after, e
+            except BadRequest:
+                raise
+            except (TimedOut, NetworkError) as e:
+                delay, err = min(2 ** attempt, 30), e
+
+            self.logger.warning(
+                action="Retry _upload_sticker_file",
+                user=" ",
+                data={"dccon_id": sticker_data.id, "file": file_path.name, "delay": delay},
+                message=f"재시도 {attempt + 1}/{BotConfig.STICKER_UPLOAD_MAX_ATTEMPTS} - {err}"
+            )
+            if attempt + 1 < BotConfig.STICKER_UPLOAD_MAX_ATTEMPTS:
+                await asyncio.sleep(delay)
+
+        raise RuntimeError(f"upload_sticker_file fail: {file_path.name}") from err
     
     
     async def _generate_unique_sticker_url(self, sticker_data: StickerData) -> None:        
-        async with DbApiClient(BotConfig.BASE_URL, sticker_data) as db:
-            for _ in range(10):
-                # 텔레그램 스티커 세트 이름은 유니크해야 하므로 랜덤 + dccon_id + suffix 조합으로 생성
-                sticker_data.url = (                    
-                    f"{''.join(random.sample(string.ascii_lowercase + string.ascii_uppercase, 5))}{sticker_data.id}{BotConfig.STICKER_URL_TAG}"
-                )
-                
-                # URL의 유효성 검사
-                if not await db.check_url_exists():
-                    return
-            else:
-                raise RuntimeError("generate_unique_sticker_url fail")
+        # 텔레그램 스티커 세트 이름은 유니크해야 하므로 랜덤 + dccon_id + suffix 조합으로 생성
+        candidates = [
+            f"{''.join(random.sample(string.ascii_lowercase + string.ascii_uppercase, 5))}{sticker_data.id}{BotConfig.STICKER_URL_TAG}"
+            for _ in range(BotConfig.STICKER_URL_CANDIDATES)
+        ]
+
+        # 후보 URL 유효성 일괄 검사, 로컬 복제본에 없는 후보도 다음 동기화 전에 등록됐을 수 있으므로 DB에 확인
+        if self.catalog.ready:
+            candidates = [url for url in candidates if not self.catalog.url_exists(url)]
+        free_urls = await self.db.filter_free_urls(candidates) if candidates else []
+        if not free_urls:
+            raise RuntimeError("generate_unique_sticker_url fail")
+
+        sticker_data.url = free_urls[0]
 
 
     async def _create_new_sticker_set(self, sticker_data: StickerData, stickers: list) -> None:                  
@@ -630,9 +1256,9 @@ class EliteMikoBot:
             raise e
 
 
-    async def _add_stickers_to_set(self, sticker_data: StickerData, stickers: list):  
+    async def _add_stickers_to_set(self, sticker_data: StickerData, stickers: list, manifest: JobManifest):  
         try:      
-            for sticker in stickers:
+            for sticker in stickers[manifest.added_count:]:
                 await self.bot.add_sticker_to_set(
                     user_id=BotConfig.DEVELOPER_ID,
                     name=sticker_data.url,
@@ -640,6 +1266,8 @@ class EliteMikoBot:
                     read_timeout=60,
                     write_timeout=60
                 )        
+                manifest.added_count += 1
+                await manifest.save()
         except Exception as e:
             self.logger.error(
                 action="Exception _add_stickers_to_set",
@@ -650,18 +1278,19 @@ class EliteMikoBot:
             raise e
         
 
-    async def _send_sticker_url(self, update: Update, context: ContextTypes.DEFAULT_TYPE, sticker_data: StickerData) -> None:        
+    async def _send_sticker_url(self, chat_id: int, sticker_data: StickerData) -> None:        
         if sticker_data: 
-            # 요청한 사용자               
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id, 
-                text=sticker_data.url, 
-                read_timeout=30, 
-                write_timeout=30
-            )
+            # 요청한 사용자 + 같은 디시콘을 요청한 사용자
+            for subscriber in self._subscriber_chat_ids(chat_id, sticker_data.id):
+                await self.application.bot.send_message(
+                    chat_id=subscriber, 
+                    text=sticker_data.url, 
+                    read_timeout=30, 
+                    write_timeout=30
+                )
             # 그룹 채팅방
             if BotConfig.GROUP_CHAT_ID != 0:
-                await context.bot.send_message(
+                await self.application.bot.send_message(
                     chat_id=BotConfig.GROUP_CHAT_ID, 
                     text=(self._generate_group_message(sticker_data)), 
                     read_timeout=30, 
@@ -676,6 +1305,8 @@ class EliteMikoBot:
             message += " -m"
         elif OptionFlag.has_flag(sticker_data.option_flag, OptionFlag.OVERWRITE):
             message += " -o"
+        if OptionFlag.has_flag(sticker_data.option_flag, OptionFlag.FAST):
+            message += " -f"
 
         message += f"\n{sticker_data.url}"
 
@@ -723,9 +1354,16 @@ class EliteMikoBot:
     async def _cancel_sticker_request(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:                
         user = update.message.from_user
         user_request_id = BotConfig.user_semaphore[user.id]['request_id']        
+        subscribers = BotConfig.sticker_subscribers.get(user_request_id, set()) - {update.effective_chat.id}
         
         await self._cleanup_sticker_task(user_id=user.id, dccon_id=user_request_id)
 
+        for subscriber in subscribers:
+            await context.bot.send_message(
+                chat_id=subscriber,
+                text=f"{user_request_id}번 디씨콘 작업이 요청자에 의해 취소됐다 니에... 다시 요청해줘"
+            )
+
         await context.bot.send_message(
             chat_id=update.effective_chat.id, 
             text=f"{user_request_id}번 디씨콘 작업을 취소했다니에..."
@@ -737,8 +1375,8 @@ class EliteMikoBot:
             message="Cancel sticker request"
         )
 
-    # 작업 종료 및 정리
-    async def _cleanup_sticker_task(self, user_id: int, dccon_id: int) -> None:       
+    # 작업 종료 및 정리, keep_checkpoint면 다음 요청/재시작 때 이어서 진행할 수 있도록 파일 유지
+    async def _cleanup_sticker_task(self, user_id: int, dccon_id: int, keep_checkpoint: bool = False) -> None:       
         user_semaphore = BotConfig.user_semaphore.get(user_id)
 
         try:        
@@ -747,8 +1385,10 @@ class EliteMikoBot:
                 if user_semaphore['semaphore'].locked():
                     user_semaphore['semaphore'].release()                
 
+            BotConfig.sticker_task_data.pop(dccon_id, None)
+            BotConfig.sticker_subscribers.pop(dccon_id, None)
             task = BotConfig.sticker_tasks.pop(dccon_id, None)            
-            if task:
+            if task and task is not asyncio.current_task():
                 if not task.done():
                     task.cancel()                                        
                     try:
@@ -756,10 +1396,8 @@ class EliteMikoBot:
                     except asyncio.CancelledError:
                         pass
             
-            await Deleter.delete_all(
-                img_path=Path(BotConfig.IMG_PATH) / str(dccon_id),
-                sticker_path=Path(BotConfig.STICKER_IMG_PATH) / str(dccon_id)
-            )
+            if not keep_checkpoint:
+                await self._delete_job_files(dccon_id)
         
         except Exception as e:
             self.logger.error(
@@ -770,6 +1408,15 @@ class EliteMikoBot:
             )
 
 
+    async def _delete_job_files(self, dccon_id: int) -> None:
+        await Deleter.delete_all(
+            img_path=Path(BotConfig.IMG_PATH) / str(dccon_id),
+            sticker_path=Path(BotConfig.STICKER_IMG_PATH) / str(dccon_id)
+        )
+        await self.workspaces.release(dccon_id)
+        await asyncio.to_thread((BotConfig.JOB_PATH / f"{dccon_id}.json").unlink, True)
+
+
     # 봇 종료 (개발자 전용)
     async def _stop(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         user = update.message.from_user
@@ -778,7 +1425,8 @@ class EliteMikoBot:
                 request_id = user_task['request_id']
 
                 if request_id is not None:
-                    await self._cleanup_sticker_task(user_id=user_id, dccon_id=request_id)
+                    # 재시작 후 이어서 진행하도록 체크포인트 유지
+                    await self._cleanup_sticker_task(user_id=user_id, dccon_id=request_id, keep_checkpoint=True)
                     
                     await context.bot.send_message(
                         chat_id=update.effective_chat.id, 
@@ -792,7 +1440,115 @@ class EliteMikoBot:
                 data=None,
                 message="Stop EliteMikoBot"
             )                                 
-            asyncio.get_event_loop().stop()                                            
+            if self._stop_event is not None:
+                self._stop_event.set()
+            else:
+                asyncio.get_event_loop().stop()                                            
+
+
+    # 작업 프로파일링 (개발자 전용), /profile [dccon id]
+    # 대기열을 거쳐 다운로드 → 업스케일 → 인코딩 → 스티커 파일 업로드까지 실행, 스티커 세트는 만들지 않음
+    async def _profile(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        user = update.message.from_user
+        if user.id != BotConfig.DEVELOPER_ID or user.name != BotConfig.DEVELOPER_NAME:
+            return
+
+        command = self._parse_command(update.message.text)
+        if command is None:
+            await update.message.reply_text("/profile [dccon id] 형태로 입력해줘")
+            return
+
+        dccon_id, option_flag = command
+        if dccon_id in BotConfig.sticker_tasks:
+            await update.message.reply_text(f"{dccon_id}번 디씨콘은 작업중이니에~ 끝나면 다시 요청해줘")
+            return
+
+        sticker_data = StickerData(
+            id=dccon_id,
+            option_flag=option_flag,
+            user_id=user.id,
+            user_name=f"{user.first_name}({user.name})"
+        )
+        # 처음부터 측정하도록 남아 있는 체크포인트는 삭제
+        await self._delete_job_files(dccon_id)
+
+        BotConfig.profiling_ids.add(dccon_id)
+        await update.message.reply_text(f"{dccon_id}번 디씨콘 프로파일링을 시작한다 니에")
+        self._start_sticker_task(update.effective_chat.id, sticker_data, profile=True)
+        self.logger.info(
+            action="profile sticker request",
+            user=f"{user.name}({user.id})",
+            data={"dccon_id": dccon_id, "status": "start"},
+            message="Start profiling sticker request"
+        )
+
+
+    # 시간 초과/오류로 끝나도 그때까지 측정한 결과를 보냄 (취소된 경우 제외)
+    # 단계별 시간은 이 작업만 (대기열 등록 전 다운로드 포함, 대기 시간 제외), 샘플링은 슬롯을 받은 뒤부터 프로세스 전체이므로 동시에 실행 중인 다른 작업도 포함됨
+    async def _profile_sticker_request(self, chat_id: int, sticker_data: StickerData, manifest: JobManifest, prepare_stages: list, prepare_elapsed: float) -> None:
+        profiler = SamplingProfiler(interval_sec=BotConfig.PROFILE_INTERVAL)
+        other_jobs = max(len(BotConfig.sticker_tasks) - 1, 0)
+        result = "fail"
+        start = time.perf_counter() - prepare_elapsed
+
+        with collect_stages() as stages:
+            stages.extend(prepare_stages)
+            try:
+                with profiler:
+                    if await asyncio.wait_for(
+                        self._img_processing(sticker_data=sticker_data, manifest=manifest),
+                        timeout=BotConfig.IMG_PROCESSING_TIMEOUT
+                    ):
+                        await asyncio.wait_for(
+                            self._prepare_stickers(sticker_data, manifest),
+                            timeout=BotConfig.STICKER_PROCESSING_TIMEOUT
+                        )
+                        result = "complete"
+            except asyncio.CancelledError:
+                result = "cancelled"
+                raise
+            except asyncio.TimeoutError:
+                result = "timeout"
+                raise
+            except Exception as e:
+                result = f"error: {e}"
+                raise
+            finally:
+                if result != "cancelled":
+                    other_jobs = max(other_jobs, len(BotConfig.sticker_tasks) - 1)
+                    await self._send_profile_report(chat_id, sticker_data, profiler, stages, result, time.perf_counter() - start, other_jobs)
+
+
+    async def _send_profile_report(self, chat_id: int, sticker_data: StickerData, profiler: SamplingProfiler, stages: list, result: str, elapsed: float, other_jobs: int) -> None:
+        top = "\n".join(f"{count:>6} {name}" for name, count in profiler.top_functions())
+        scope = f"프로세스 전체 샘플 (동시에 실행 중인 다른 작업 {other_jobs}개 포함)" if other_jobs else "프로세스 전체 샘플"
+        report = (
+            f"{sticker_data.id}번 디씨콘 프로파일 ({result})\n\n"
+            f"{format_stage_breakdown(stages, elapsed)}\n\n"
+            f"{scope}\n"
+            f"samples {profiler.samples} (idle {profiler.idle_samples})\n{top}"
+        )
+
+        try:
+            await self.application.bot.send_message(chat_id=chat_id, text=report)
+            await self.application.bot.send_document(
+                chat_id=chat_id,
+                document=InputFile(profiler.collapsed().encode("utf-8"), filename=f"{sticker_data.id}_profile.folded"),
+                caption="collapsed stack (flamegraph.pl / speedscope)"
+            )
+        except Exception as e:
+            self.logger.warning(
+                action="Exception _send_profile_report",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                data={"dccon_id": sticker_data.id},
+                message=f"{e}"
+            )
+        self.logger.info(
+            action="profile sticker request",
+            user=f"{sticker_data.user_name}({sticker_data.user_id})",
+            data={"dccon_id": sticker_data.id, "status": result, "elapsed": round(elapsed, 2), "other_jobs": other_jobs},
+            message="Profile sticker request finished"
+        )
 
 
     # 스티커 세트 삭제 (개발자 전용)
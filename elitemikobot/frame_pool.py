@@ -0,0 +1,62 @@
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from elitemikobot.metrics import REGISTRY, Counter
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+FRAME_BUFFERS = REGISTRY.register(Counter(
+    "elitemikobot_frame_buffers_total",
+    "Frame buffers handed out by frame pools, newly allocated or reused",
+    labels=("result",)
+))
+
+
+# 작업 하나에서 프레임 처리용 ndarray를 (shape, dtype)별로 재사용
+# GIF 프레임은 모두 같은 크기라 업스케일/크기 변환 결과 버퍼를 프레임마다 새로 만들 필요가 없음
+# 동시에 쓰는 버퍼 수는 CPU 토큰으로 제한되므로, 반납된 버퍼만 max_per_key개까지 보관
+class FramePool:
+    def __init__(self, max_per_key: int = 16) -> None:
+        self.max_per_key = max_per_key
+        self.allocated = 0
+        self.reused = 0
+        self._free: Dict[Tuple[tuple, str], List["np.ndarray"]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+
+    def acquire(self, shape: tuple, dtype: str = "uint8") -> "np.ndarray":
+        import numpy as np
+
+        key = (tuple(shape), np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                self.reused += 1
+                FRAME_BUFFERS.inc(result="reused")
+                return free.pop()
+            self.allocated += 1
+        FRAME_BUFFERS.inc(result="allocated")
+        return np.empty(shape, dtype=dtype)
+
+
+    # 다 쓴 버퍼 반납, 다른 배열의 뷰(프레임 버퍼의 한 프레임 등)는 보관하지 않음
+    def release(self, *arrays: "np.ndarray") -> None:
+        with self._lock:
+            for array in arrays:
+                if array is None or array.base is not None or not array.flags.c_contiguous:
+                    continue
+                free = self._free[(array.shape, array.dtype.str)]
+                if len(free) < self.max_per_key and all(array is not other for other in free):
+                    free.append(array)
+
+
+    def clear(self) -> None:
+        with self._lock:
+            self._free.clear()
+
+
+# 버퍼를 보관하지 않는 풀 (풀 없이 호출할 때 기본값)
+NO_POOL = FramePool(max_per_key=0)
@@ -0,0 +1,269 @@
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+
+# GIF 블록 구조에서 읽은 프레임 하나의 정보 (픽셀은 아직 디코딩하지 않음)
+@dataclass
+class GifFrameInfo:
+    x: int
+    y: int
+    width: int
+    height: int
+    disposal: int = 0                  # 0/1: 유지, 2: 배경(투명)으로 지움, 3: 그리기 전 상태로 복원
+    transparency: Optional[int] = None
+    duration: int = 0                  # ms
+    interlace: bool = False
+    palette: Optional[bytes] = None    # 로컬 팔레트, 없으면 전역 팔레트
+    lzw: bytes = b""                   # LZW 최소 코드 크기 + 데이터 서브블록 (종료 블록 포함)
+
+
+    def covers(self, width: int, height: int) -> bool:
+        return self.x == 0 and self.y == 0 and self.width >= width and self.height >= height
+
+
+@dataclass
+class GifInfo:
+    width: int
+    height: int
+    palette: Optional[bytes]
+    background: int
+    frames: List[GifFrameInfo]
+
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+    while True:
+        size = data[pos]
+        pos += 1 + size
+        if size == 0:
+            return pos
+
+
+# 헤더/확장 블록/이미지 설명자만 읽음 (LZW 데이터는 위치만 기록)
+def parse_gif(data: bytes) -> GifInfo:
+    if data[:6] not in (b"GIF87a", b"GIF89a"):
+        raise ValueError("not a GIF file")
+
+    try:
+        width, height = int.from_bytes(data[6:8], "little"), int.from_bytes(data[8:10], "little")
+        flags, background, pos = data[10], data[11], 13
+        palette = None
+        if flags & 0x80:
+            size = 3 << ((flags & 7) + 1)
+            palette, pos = data[pos:pos + size], pos + size
+
+        if palette is None:
+            background = 0    # 전역 팔레트가 없으면 배경색 번호는 쓰지 않음 (Pillow도 0번 색)
+
+        frames: List[GifFrameInfo] = []
+        control = {}
+        while pos < len(data):
+            block = data[pos]
+            if block == 0x3B:
+                break
+            if block == 0x21:
+                label = data[pos + 1]
+                if label == 0xF9 and data[pos + 2] >= 4:
+                    packed = data[pos + 3]
+                    control = {
+                        "disposal": (packed >> 2) & 7,
+                        "transparency": data[pos + 6] if packed & 1 else None,
+                        "duration": int.from_bytes(data[pos + 4:pos + 6], "little") * 10
+                    }
+                pos = _skip_sub_blocks(data, pos + 2)
+            elif block == 0x2C:
+                x, y, w, h = (int.from_bytes(data[pos + i:pos + i + 2], "little") for i in (1, 3, 5, 7))
+                packed, pos = data[pos + 9], pos + 10
+                local = None
+                if packed & 0x80:
+                    size = 3 << ((packed & 7) + 1)
+                    local, pos = data[pos:pos + size], pos + size
+                start = pos
+                pos = _skip_sub_blocks(data, pos + 1)
+                frames.append(GifFrameInfo(x, y, w, h, interlace=bool(packed & 0x40), palette=local, lzw=data[start:pos], **control))
+                control = {}
+            else:
+                # 블록 사이의 알 수 없는 바이트 (중간에 다시 들어간 GIF89a 헤더 등)는 Pillow처럼 한 바이트씩 건너뜀
+                pos += 1
+    except IndexError:
+        # 잘린 파일, 마지막 프레임까지 읽지 못하면 읽은 프레임만 사용
+        if not frames:
+            raise ValueError("truncated GIF file")
+
+    if not frames:
+        raise ValueError("GIF has no frames")
+    return GifInfo(width, height, palette, background, frames)
+
+
+# 프레임 영역의 팔레트 인덱스 (h, w) uint8
+# 프레임 하나짜리 GIF(팔레트 없음 → L 모드)로 감싸서 Pillow의 LZW 디코더만 사용
+def _decode_indices(frame: GifFrameInfo) -> np.ndarray:
+    size = frame.width.to_bytes(2, "little") + frame.height.to_bytes(2, "little")
+    stream = b"".join((
+        b"GIF89a", size, b"\x00\x00\x00",
+        b",\x00\x00\x00\x00", size, b"\x40" if frame.interlace else b"\x00",
+        frame.lzw, b";"
+    ))
+    with Image.open(io.BytesIO(stream)) as img:
+        return np.asarray(img)
+
+
+# 팔레트 → RGBA 색상표 (256, 4), 투명 인덱스는 알파 0
+def _color_table(palette: Optional[bytes], transparency: Optional[int]) -> np.ndarray:
+    table = np.zeros((256, 4), dtype=np.uint8)
+    if palette:
+        colors = np.frombuffer(palette, dtype=np.uint8)[:768].reshape(-1, 3)
+        table[:len(colors), :3] = colors
+    else:
+        table[:, :3] = np.arange(256, dtype=np.uint8)[:, None]
+    table[:, 3] = 255
+    if transparency is not None:
+        table[transparency, 3] = 0
+    return table
+
+
+# disposal 2로 지운 영역의 색 (Pillow와 같은 방식)
+# 투명색이 있는 프레임은 그 투명색의 팔레트 색으로 지움 (첫 프레임에 투명색이 없어 화면에 알파가 없으면 불투명)
+# 투명색이 없으면 배경색, 팔레트 밖의 색 번호는 0번 색으로 바꿈
+def _dispose_color(info: GifInfo, frame: GifFrameInfo, table: np.ndarray, alpha: bool) -> np.ndarray:
+    palette = frame.palette or info.palette
+    index = info.background if frame.transparency is None else frame.transparency
+    if palette and index * 3 + 3 > len(palette):
+        index = 0
+    color = table[index].copy()
+    color[3] = 0 if alpha and frame.transparency is not None else 255
+    return color
+
+
+# GIF 프레임을 (프레임 수, 높이, 너비, 4) RGBA 버퍼 하나에 합성, keep이 있으면 그 프레임들만 버퍼에 남김
+# 화면 상태는 Pillow의 seek/convert와 같게 유지함
+# - 첫 프레임에 투명색이 있을 때만 화면에 알파가 있음, 없으면 이후 프레임의 투명색은 "덮어쓰지 않음"으로만 쓰임
+# - 첫 프레임 영역 밖은 첫 프레임의 투명색 (없으면 0번 색), 투명 픽셀 아래 RGB도 팔레트 색을 그대로 둠
+# - 투명색이 없는 첫 프레임의 disposal 3은 되돌릴 상태가 없어 disposal 1처럼 유지
+# 다른 점 하나: disposal 0은 명세와 브라우저처럼 유지로 처리함 (Pillow는 직전 프레임의 disposal을 이어 씀)
+# 프레임마다 이전 프레임의 disposal을 적용한 뒤 이번 프레임의 불투명 픽셀만 덮어씀
+# 화면 전체를 덮고 투명 픽셀이 없는 프레임은 이전 프레임 복사 없이 바로 그림
+def render_frames(info: GifInfo, keep: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, List[int]]:
+    width, height = info.width, info.height
+    keep = range(len(info.frames)) if keep is None else keep
+    slots = {index: slot for slot, index in enumerate(keep)}
+    spare = len(slots)    # 남기지 않는 프레임을 합성하는 자리
+    frames = np.empty((len(slots) + (len(slots) < len(info.frames)), height, width, 4), dtype=np.uint8)
+    scratch = np.empty(width * height * 4, dtype=np.uint8)    # 프레임 영역 색상 (영역 크기만큼 잘라 씀)
+    restore = np.empty((height, width, 4), dtype=np.uint8)    # disposal 3 복원용
+    alpha = info.frames[0].transparency is not None
+    tables = {}
+
+    def table_for(frame: GifFrameInfo) -> np.ndarray:
+        key = (frame.palette or info.palette, frame.transparency)
+        if key not in tables:
+            tables[key] = _color_table(*key)
+        return tables[key]
+
+    last = max(slots, default=-1)
+    previous: Optional[GifFrameInfo] = None
+    previous_disposal = 0
+    previous_slot = spare
+    for i, frame in enumerate(info.frames):
+        if i > last:
+            break
+        # 남기지 않는 프레임인데 다음 프레임이 화면 전체를 불투명하게 덮으면 디코딩도 생략
+        following = info.frames[i + 1] if i + 1 < len(info.frames) else None
+        if i not in slots and following and following.covers(width, height) and following.transparency is None and following.disposal != 3:
+            previous, previous_disposal = frame, frame.disposal
+            continue
+
+        slot = slots.get(i, spare)
+        canvas = frames[slot]
+        x0, y0 = min(frame.x, width), min(frame.y, height)
+        x1, y1 = min(frame.x + frame.width, width), min(frame.y + frame.height, height)
+        indices = _decode_indices(frame)[:y1 - y0, :x1 - x0]
+        table = table_for(frame)
+        # 첫 프레임은 투명 픽셀도 투명색 그대로 그림 (영역 밖을 채운 색과 같음)
+        opaque = None if frame.transparency is None or previous is None else indices != frame.transparency
+        disposal = 1 if previous is None and frame.disposal == 3 and not alpha else frame.disposal
+
+        if frame.covers(width, height) and disposal != 3 and (opaque is None or opaque.all()):
+            # 이전 프레임과 무관하게 이번 프레임만으로 결정됨
+            np.take(table, indices, axis=0, out=canvas)
+            previous, previous_disposal, previous_slot = frame, disposal, slot
+            continue
+
+        if previous is None:
+            canvas[...] = table[frame.transparency or 0]
+        elif previous_disposal == 2 and previous.covers(width, height):
+            canvas[...] = _dispose_color(info, previous, table_for(previous), alpha)
+        else:
+            if slot != previous_slot:
+                np.copyto(canvas, frames[previous_slot])
+            px0, py0 = min(previous.x, width), min(previous.y, height)
+            px1, py1 = min(previous.x + previous.width, width), min(previous.y + previous.height, height)
+            if previous_disposal == 2:
+                canvas[py0:py1, px0:px1] = _dispose_color(info, previous, table_for(previous), alpha)
+            elif previous_disposal == 3:
+                canvas[py0:py1, px0:px1] = restore[py0:py1, px0:px1]
+
+        region = canvas[y0:y1, x0:x1]
+        if disposal == 3:
+            restore[y0:y1, x0:x1] = region
+
+        colors = scratch[:indices.size * 4].reshape(*indices.shape, 4)
+        np.take(table, indices, axis=0, out=colors)
+        if opaque is None:
+            region[...] = colors
+        else:
+            np.copyto(region, colors, where=opaque[..., None])
+        previous, previous_disposal, previous_slot = frame, disposal, slot
+
+    return frames[:len(slots)], [info.frames[index].duration for index in keep]
+
+
+# GIF가 아닌 애니메이션 이미지 (확장자만 gif인 webp/png 등)나 읽을 수 없는 GIF는 Pillow로 프레임을 읽음
+def _render_frames_pillow(data: bytes, keep: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, List[int]]:
+    with Image.open(io.BytesIO(data)) as img:
+        keep = range(getattr(img, "n_frames", 1)) if keep is None else keep
+        frames = np.empty((len(keep), img.height, img.width, 4), dtype=np.uint8)
+        durations = []
+        for slot, index in enumerate(keep):
+            img.seek(index)
+            frames[slot] = img.convert("RGBA")
+            durations.append(img.info.get("duration", 0))
+    return frames, durations
+
+
+# 블록 구조를 읽을 수 없는 GIF는 Pillow로 처리
+def _parse_or_none(data: bytes) -> Optional[GifInfo]:
+    if data[:3] != b"GIF":
+        return None
+    try:
+        return parse_gif(data)
+    except ValueError:
+        return None
+
+
+# 프레임별 duration(ms), 픽셀은 디코딩하지 않음
+def read_durations(file_path: Path) -> List[int]:
+    data = Path(file_path).read_bytes()
+    info = _parse_or_none(data)
+    if info is not None:
+        return [frame.duration for frame in info.frames]
+
+    durations = []
+    with Image.open(io.BytesIO(data)) as img:
+        for index in range(getattr(img, "n_frames", 1)):
+            img.seek(index)
+            durations.append(img.info.get("duration", 0))
+    return durations
+
+
+# GIF 파일 → (프레임 버퍼, 프레임별 duration(ms)), keep: 남길 프레임 번호 (오름차순)
+def extract_frames(file_path: Path, keep: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, List[int]]:
+    data = Path(file_path).read_bytes()
+    info = _parse_or_none(data)
+    if info is None:
+        return _render_frames_pillow(data, keep)
+    return render_frames(info, keep)
@@ -0,0 +1,99 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from elitemikobot.converter import Converter
+from elitemikobot.cpu_pool import CPU_POOL
+from elitemikobot.dccon_data import DcconData
+from elitemikobot.memory import FAST_JOB_BASE_BYTES, JOB_BASE_BYTES, UPSCALE_FACTOR, unit_memory
+from elitemikobot.metrics import REGISTRY, Histogram
+from elitemikobot.upscale_backend import BACKENDS, InterpolationBackend, UpscaleConfig, choose_backend
+
+
+# 처리 시간 모델 (초), elitemikobot_stage_seconds / elitemikobot_job_cost_ratio로 보정
+# 업스케일 시간은 백엔드별 sec_per_megapixel (upscale_backend)
+STATIC_SEC = 0.3                  # 정지 이미지 저장/압축
+ENCODE_SEC = 2.0                  # webm 인코딩 시도 (크기 제한 확인 포함)
+ENCODE_SEC_PER_FRAME = 0.02
+UPLOAD_SEC = 0.3                  # 스티커 파일 하나 업로드
+
+JOB_COST_RATIO = REGISTRY.register(Histogram(
+    "elitemikobot_job_cost_ratio",
+    "Measured processing time divided by the predicted job cost",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.25, 1.5, 2, 3, 5)
+))
+
+
+@dataclass
+class JobEstimate:
+    memory: int = 0       # 최대 메모리 (bytes)
+    cost: float = 0.0     # 예상 처리 시간 (초)
+    images: int = 0
+    gif_images: int = 0
+    frames: int = 0
+
+
+    def to_dict(self) -> dict:
+        return {
+            "memory_mb": self.memory // (1024 * 1024),
+            "cost_sec": round(self.cost, 1),
+            "images": self.images,
+            "gif_images": self.gif_images,
+            "frames": self.frames
+        }
+
+
+# 이미지 한 장의 (가로, 세로, 프레임 수), 헤더와 프레임 목록만 읽음
+# 프레임 수는 webm에 들어갈 수 있는 최대 프레임 수까지만 (나머지는 업스케일하지 않음)
+def image_shape(path: Path) -> Optional[tuple]:
+    from PIL import Image
+
+    try:
+        with Image.open(path) as img:
+            return img.size[0], img.size[1], min(getattr(img, "n_frames", 1), Converter.max_frames())
+    except (OSError, ValueError):
+        return None
+
+
+# 이미지 하나(또는 병합되는 두 이미지)의 예상 처리 시간, backends: 이미지마다 선택된 업스케일 백엔드
+# GIF 프레임은 CPU 토큰 수만큼 동시에 업스케일 (다른 작업과 나눠 쓰므로 실제로는 더 걸릴 수 있음)
+def _unit_cost(shapes: List[tuple], backends: List[str]) -> float:
+    frames = max((shape[2] for shape in shapes), default=1)
+    upscale = sum(
+        width * height * UPSCALE_FACTOR ** 2 / 1e6 * BACKENDS[backend].sec_per_megapixel
+        for (width, height, _), backend in zip(shapes, backends)
+    )
+
+    if frames > 1:
+        return frames * upscale / CPU_POOL.tokens + ENCODE_SEC + frames * ENCODE_SEC_PER_FRAME + UPLOAD_SEC
+    return upscale + STATIC_SEC + UPLOAD_SEC
+
+
+# 다운로드한 디시콘의 메모리/처리 시간 추정
+# 메모리는 이미지를 순서대로 처리하므로 가장 큰 처리 단위 기준, 처리 시간은 전체 합
+def estimate_job(dccon_data: DcconData, merge_nums: Optional[List[int]] = None, fast: bool = False) -> JobEstimate:
+    merge_nums = merge_nums or []
+    path = Path(dccon_data.path)
+    policy = InterpolationBackend.name if fast else UpscaleConfig.BACKEND
+    estimate = JobEstimate(images=dccon_data.count)
+    peak_memory = 0
+    uses_model = False
+
+    num = 1
+    while num <= dccon_data.count:
+        nums = [num, num + 1] if num in merge_nums and num + 1 <= dccon_data.count else [num]
+        shapes = [shape for shape in (image_shape(path / f"{n}.{dccon_data.ext.get(n, '')}") for n in nums) if shape]
+
+        for _, _, frames in shapes:
+            estimate.frames += frames
+            estimate.gif_images += frames > 1
+        if shapes:
+            target = 256 if len(nums) == 2 else 512
+            backends = [choose_backend(policy, width, height, frames, target) for width, height, frames in shapes]
+            uses_model = uses_model or any(backend != InterpolationBackend.name for backend in backends)
+            peak_memory = max(peak_memory, unit_memory(shapes))
+            estimate.cost += _unit_cost(shapes, backends)
+        num += len(nums)
+
+    estimate.memory = (JOB_BASE_BYTES if uses_model else FAST_JOB_BASE_BYTES) + peak_memory
+    return estimate
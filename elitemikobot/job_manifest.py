@@ -0,0 +1,133 @@
+import asyncio
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from elitemikobot.dccon_data import DcconData
+from elitemikobot.sticker_data import StickerData
+
+
+# 작업 단계별 체크포인트 (다운로드 → 아이템별 업스케일/인코딩 → 업로드 → 세트 생성)
+# 시간 초과나 재시작 후 마지막으로 완료된 단계부터 이어서 진행
+@dataclass
+class JobManifest:
+    UPSCALED = "upscaled"   # GIF 프레임 업스케일 완료, 인코딩 전
+    ENCODED = "encoded"     # 최종 스티커 파일(.png/.webm) 생성 완료
+
+    path: Path
+    chat_id: int
+    sticker: StickerData
+    dccon: Optional[DcconData] = None
+    items: Dict[int, dict] = field(default_factory=dict)      # img_num → {"stage", "durations"}
+    uploaded: Dict[int, str] = field(default_factory=dict)    # img_num → file_id
+    set_created: bool = False
+    added_count: int = 0
+    attempts: int = 0   # 이 체크포인트로 처리를 시작한 횟수 (재시작 시 자동 재개 제한)
+    updated_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self._lock = asyncio.Lock()
+
+
+    @classmethod
+    def create(cls, job_dir: Path, chat_id: int, sticker: StickerData):
+        return cls(path=Path(job_dir) / f"{sticker.id}.json", chat_id=chat_id, sticker=sticker)
+
+
+    @classmethod
+    def load(cls, path: Path):
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        dccon = data.get("dccon")
+        if dccon is not None:
+            dccon["ext"] = {int(num): ext for num, ext in dccon["ext"].items()}
+
+        return cls(
+            path=Path(path),
+            chat_id=data["chat_id"],
+            sticker=StickerData.from_dict(data["sticker"]),
+            dccon=DcconData(**dccon) if dccon is not None else None,
+            items={int(num): item for num, item in data.get("items", {}).items()},
+            uploaded={int(num): file_id for num, file_id in data.get("uploaded", {}).items()},
+            set_created=data.get("set_created", False),
+            added_count=data.get("added_count", 0),
+            attempts=data.get("attempts", 0),
+            updated_at=data.get("updated_at", 0)
+        )
+
+
+    # 저장된 모든 체크포인트, 읽을 수 없는 파일은 제외
+    @classmethod
+    def load_all(cls, job_dir: Path) -> List["JobManifest"]:
+        manifests = []
+        for path in sorted(Path(job_dir).glob("*.json")):
+            try:
+                manifests.append(cls.load(path))
+            except Exception:
+                path.unlink(missing_ok=True)
+        return manifests
+
+
+    @property
+    def downloaded(self) -> bool:
+        return self.dccon is not None
+
+
+    # 옵션이 다른 요청의 체크포인트는 재사용하지 않음
+    def matches(self, sticker: StickerData) -> bool:
+        return (
+            self.sticker.id == sticker.id
+            and int(self.sticker.option_flag) == int(sticker.option_flag)
+            and list(self.sticker.merge_nums or []) == list(sticker.merge_nums or [])
+        )
+
+
+    def item_stage(self, num: int) -> Optional[str]:
+        return self.items.get(num, {}).get("stage")
+
+
+    def item_durations(self, num: int) -> List[int]:
+        return self.items.get(num, {}).get("durations", [])
+
+
+    async def mark_item(self, num: int, stage: str, durations: Optional[List[int]] = None) -> None:
+        item = self.items.setdefault(num, {})
+        item["stage"] = stage
+        if durations is not None:
+            item["durations"] = list(durations)
+        await self.save()
+
+
+    def _to_json(self) -> str:
+        return json.dumps({
+            "chat_id": self.chat_id,
+            "sticker": self.sticker.to_dict(),
+            "dccon": asdict(self.dccon) if self.dccon is not None else None,
+            "items": self.items,
+            "uploaded": self.uploaded,
+            "set_created": self.set_created,
+            "added_count": self.added_count,
+            "attempts": self.attempts,
+            "updated_at": self.updated_at
+        }, ensure_ascii=False)
+
+
+    # 임시 파일에 쓴 뒤 교체 (저장 중 종료되어도 이전 체크포인트 유지)
+    async def save(self) -> None:
+        async with self._lock:
+            self.updated_at = time.time()
+            content = self._to_json()
+            await asyncio.to_thread(self._write, content)
+
+
+    def _write(self, content: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+
+
+    async def delete(self) -> None:
+        await asyncio.to_thread(self.path.unlink, True)
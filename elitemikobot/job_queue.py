@@ -0,0 +1,219 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional
+
+
+# 대기열이 가득 차서 등록 불가
+class QueueFullError(Exception):
+    pass
+
+
+# 대기 시간 초과로 대기열에서 제외됨
+class QueueTimeoutError(asyncio.TimeoutError):
+    pass
+
+
+@dataclass
+class QueuedJob:
+    user_id: int
+    dccon_id: int
+    future: asyncio.Future
+    on_position: Optional[Callable[[int], Awaitable[None]]] = None
+    memory: int = 0
+    cost: float = 0.0
+    enqueued_at: float = field(default_factory=time.monotonic)
+    position: int = 0
+    priority: float = 0.0
+
+
+# 스티커 작업 대기열
+# 실행 중인 작업의 메모리 추정치 합이 memory_budget을 넘지 않는 만큼 실행하고 나머지는 대기
+# slots는 동시 작업 수 상한, memory_budget이 0이면 작업 수로만 제한
+# 대기 순서는 사용자별 라운드 로빈, 같은 사용자의 작업끼리는 예상 처리 시간이 짧은 작업 우선
+# 우선순위 = 등록 시각 + 예상 처리 시간 / aging_rate, 오래 기다린 작업은 나중에 온 작은 작업보다 앞서므로 큰 작업도 계속 밀리지 않음
+class StickerJobQueue:
+    def __init__(self, slots: int, max_depth: int, wait_timeout: float, memory_budget: int = 0, aging_rate: float = 1.0) -> None:
+        self.slots = slots
+        self.max_depth = max_depth
+        self.wait_timeout = wait_timeout
+        self.memory_budget = memory_budget
+        self.aging_rate = aging_rate
+        self.active = 0
+        self.memory_used = 0
+        self.reserved = 0   # 요청을 받았지만 아직 다운로드 중이라 대기열에 등록하지 않은 작업 수
+        self._users: "OrderedDict[int, Deque[QueuedJob]]" = OrderedDict()
+        self._notify_tasks: set[asyncio.Task] = set()
+
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(jobs) for jobs in self._users.values())
+
+
+    # 실행 중인 작업이 없으면 추정치가 예산보다 커도 단독으로 실행
+    def _fits(self, memory: int) -> bool:
+        if self.active >= self.slots:
+            return False
+        return not self.memory_budget or self.active == 0 or self.memory_used + memory <= self.memory_budget
+
+
+    def has_free_slot(self, memory: int = 0) -> bool:
+        return self.waiting == 0 and self._fits(memory)
+
+
+    # 예약한 작업은 빈 슬롯부터 채우고 나머지는 대기열 자리를 차지하는 것으로 계산
+    def is_full(self) -> bool:
+        free = max(self.slots - self.active, 0) if self.waiting == 0 else 0
+        return self.waiting + self.reserved >= self.max_depth + free
+
+
+    # 요청을 받을 때 자리를 예약, 다운로드가 끝난 뒤 acquire(reserved=True)는 대기열이 가득 차 있어도 등록됨
+    # acquire 전에 작업이 끝나면 cancel_reservation
+    def reserve(self) -> None:
+        self.reserved += 1
+
+
+    def cancel_reservation(self) -> None:
+        self.reserved = max(self.reserved - 1, 0)
+
+
+    # 슬롯 획득, 빈 슬롯(또는 메모리)이 없으면 차례가 올 때까지 대기
+    # on_position(n): 대기 순번이 바뀔 때마다 호출, 0이면 작업 시작
+    # memory: 작업 메모리 추정치 (bytes), cost: 예상 처리 시간 (초), reserved: reserve로 예약한 자리 사용
+    async def acquire(self, user_id: int, dccon_id: int, on_position: Optional[Callable[[int], Awaitable[None]]] = None, memory: int = 0, cost: float = 0.0, reserved: bool = False) -> None:
+        if reserved:
+            self.cancel_reservation()
+
+        if self.has_free_slot(memory):
+            self._start(memory)
+            return
+
+        if self.waiting >= self.max_depth and not reserved:
+            raise QueueFullError(f"job queue is full ({self.max_depth})")
+
+        job = QueuedJob(
+            user_id=user_id,
+            dccon_id=dccon_id,
+            future=asyncio.get_running_loop().create_future(),
+            on_position=on_position,
+            memory=memory,
+            cost=cost
+        )
+        job.priority = job.enqueued_at + cost / self.aging_rate
+        self._insert(job)
+        # 앞선 작업이 메모리를 기다리는 중이면 먼저 실행될 수 있음
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(job.future), timeout=self.wait_timeout)
+        except asyncio.TimeoutError:
+            self._withdraw(job)
+            raise QueueTimeoutError(f"queued job {dccon_id} timed out after {self.wait_timeout}s")
+        except asyncio.CancelledError:
+            self._withdraw(job)
+            raise
+
+
+    def _start(self, memory: int) -> None:
+        self.active += 1
+        self.memory_used += memory
+
+
+    def release(self, memory: int = 0) -> None:
+        self.active = max(self.active - 1, 0)
+        self.memory_used = max(self.memory_used - memory, 0)
+        self._dispatch()
+
+
+    @asynccontextmanager
+    async def slot(self, user_id: int, dccon_id: int, on_position: Optional[Callable[[int], Awaitable[None]]] = None, memory: int = 0, cost: float = 0.0, reserved: bool = False) -> AsyncIterator[None]:
+        await self.acquire(user_id, dccon_id, on_position, memory, cost, reserved)
+        try:
+            yield
+        finally:
+            self.release(memory)
+
+
+    # 사용자별 대기열은 우선순위 순으로 유지, 같으면 먼저 등록한 작업이 앞
+    def _insert(self, job: QueuedJob) -> None:
+        jobs = self._users.setdefault(job.user_id, deque())
+        index = len(jobs)
+        while index > 0 and jobs[index - 1].priority > job.priority:
+            index -= 1
+        jobs.insert(index, job)
+
+
+    # 대기 중 취소/타임아웃, 직전에 슬롯을 배정받았다면 반납
+    def _withdraw(self, job: QueuedJob) -> None:
+        if job.future.done() and not job.future.cancelled():
+            self.release(job.memory)
+            return
+
+        job.future.cancel()
+        jobs = self._users.get(job.user_id)
+        if jobs and job in jobs:
+            jobs.remove(job)
+            if not jobs:
+                del self._users[job.user_id]
+        self._notify_positions()
+
+
+    # 빈 슬롯을 대기 작업에 배정
+    # 다음 차례 작업이 남은 메모리에 들어가지 않으면 뒤의 작은 작업도 기다림 (큰 작업이 계속 밀리지 않도록)
+    def _dispatch(self) -> None:
+        while self._users and self._fits(self._peek_next().memory):
+            job = self._pop_next()
+            self._start(job.memory)
+            job.future.set_result(None)
+            self._notify(job, 0)
+
+        self._notify_positions()
+
+
+    def _peek_next(self) -> QueuedJob:
+        return next(iter(self._users.values()))[0]
+
+
+    # 라운드 로빈: 맨 앞 사용자의 작업을 꺼내고 해당 사용자는 맨 뒤로 이동
+    def _pop_next(self) -> QueuedJob:
+        user_id, jobs = next(iter(self._users.items()))
+        job = jobs.popleft()
+        del self._users[user_id]
+        if jobs:
+            self._users[user_id] = jobs
+        return job
+
+
+    # 현재 배정 순서대로 나열한 대기 작업 목록
+    def _ordered(self) -> List[QueuedJob]:
+        queues = [list(jobs) for jobs in self._users.values()]
+        ordered = []
+        for depth in range(max((len(q) for q in queues), default=0)):
+            ordered.extend(q[depth] for q in queues if depth < len(q))
+        return ordered
+
+
+    def position_of(self, dccon_id: int) -> Optional[int]:
+        for pos, job in enumerate(self._ordered(), start=1):
+            if job.dccon_id == dccon_id:
+                return pos
+        return None
+
+
+    def _notify_positions(self) -> None:
+        for pos, job in enumerate(self._ordered(), start=1):
+            if job.position != pos:
+                self._notify(job, pos)
+
+
+    def _notify(self, job: QueuedJob, position: int) -> None:
+        job.position = position
+        if job.on_position is None:
+            return
+
+        task = asyncio.ensure_future(job.on_position(position))
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
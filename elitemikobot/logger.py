@@ -1,66 +1,133 @@
-import inspect
+import atexit
+import json
 import logging
-from datetime import date
+import os
+import queue
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
 
 
-class Logger:
-    LOG_PATH = Path(__file__).parent.parent / "logs"
-
-
-    def __init__(self, name: str) -> None:
-        self.LOG_PATH.mkdir(parents=True, exist_ok=True)
-        
-        self.logger = logging.getLogger(name=name)
-        self.logger.setLevel(logging.DEBUG)
-
-        formatter = logging.Formatter(
+# 콘솔 출력용 (기존 로그 한 줄 포맷 유지)
+class _TextFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__(
             '| %(asctime)s | %(name)s | %(levelname)s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
 
-        file_handler = logging.FileHandler(filename=str(self.LOG_PATH / f"{date.today()}.log"))
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
-        
-        stream_handler = logging.StreamHandler()
-        stream_handler.setFormatter(formatter)
-        self.logger.addHandler(stream_handler)
-
-
-    # 로그 메세지 포맷
-    def _format_message(self, action: str, user: str, data: dict, message: str) -> str:
-        caller = inspect.stack()[2]
-        module = Path(caller.filename).name
-        func = caller.function
-        line_no = caller.lineno
 
+    def format(self, record: logging.LogRecord) -> str:
+        data = getattr(record, "data", None)
         if data:
             data_str = f"{{{', '.join(f'{key}={value}' for key, value in data.items())}}}"
         else:
             data_str = ""
-            
-        return (
-            f"[{module}:{func}:{line_no}] "
-            f"Action: {action}, User: {user}, Data: {data_str} | {message}"
+
+        record.message = (
+            f"[{record.filename}:{record.funcName}:{record.lineno}] "
+            f"Action: {getattr(record, 'action', '')}, User: {getattr(record, 'user', '')}, Data: {data_str} | {record.msg}"
+        )
+        record.asctime = self.formatTime(record, self.datefmt)
+        return self.formatMessage(record)
+
+
+# 파일 저장용, 한 줄에 JSON 하나
+class _JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.filename,
+            "func": record.funcName,
+            "line": record.lineno,
+            "action": getattr(record, "action", None),
+            "user": getattr(record, "user", None),
+            "data": getattr(record, "data", None) or {},
+            "message": record.msg
+        }, ensure_ascii=False, default=str)
+
+
+class Logger:
+    LOG_PATH = Path(os.getenv("LOG_PATH", Path(__file__).parent.parent / "logs"))
+    LOG_BACKUP_DAYS = int(os.getenv("LOG_BACKUP_DAYS", 30))
+
+    _queue_handler = None
+    _listener = None
+    _setup_lock = threading.Lock()
+
+
+    def __init__(self, name: str) -> None:
+        self.logger = logging.getLogger(name=name)
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+
+        # 같은 이름의 로거를 여러 번 만들어도 핸들러는 한 번만 붙임
+        handler = self._get_queue_handler()
+        if handler not in self.logger.handlers:
+            self.logger.addHandler(handler)
+
+
+    # 로그 기록은 큐에 넣기만 하고, 파일/콘솔 쓰기는 리스너 스레드에서 처리
+    @classmethod
+    def _get_queue_handler(cls) -> QueueHandler:
+        with cls._setup_lock:
+            if cls._queue_handler is not None:
+                return cls._queue_handler
+
+            cls.LOG_PATH.mkdir(parents=True, exist_ok=True)
+
+            # 자정마다 elitemikobot.log → elitemikobot.log.YYYY-MM-DD 로 교체
+            file_handler = TimedRotatingFileHandler(
+                filename=str(cls.LOG_PATH / "elitemikobot.log"),
+                when="midnight",
+                backupCount=cls.LOG_BACKUP_DAYS,
+                encoding="utf-8"
+            )
+            file_handler.setFormatter(_JsonFormatter())
+
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(_TextFormatter())
+
+            log_queue = queue.SimpleQueue()
+            cls._queue_handler = QueueHandler(log_queue)
+            cls._listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+            cls._listener.start()
+            atexit.register(cls._listener.stop)
+
+            return cls._queue_handler
+
+
+    def _log(self, level: int, action: str, user: str, data: dict, message: str) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+
+        # 호출한 위치는 stacklevel로 (Logger.info → _log 두 단계 위)
+        self.logger.log(
+            level,
+            message,
+            extra={"action": action, "user": user, "data": dict(data) if data else {}},
+            stacklevel=3
         )
 
 
     def debug(self, action: str, user: int, data: dict, message: str) -> None:
-        self.logger.debug(self._format_message(action, user, data, message))
+        self._log(logging.DEBUG, action, user, data, message)
 
 
     def info(self, action: str, user: int, data: dict, message: str) -> None:
-        self.logger.info(self._format_message(action, user, data, message))
+        self._log(logging.INFO, action, user, data, message)
 
 
     def warning(self, action: str, user: int, data: dict, message: str) -> None:
-        self.logger.warning(self._format_message(action, user, data, message))
+        self._log(logging.WARNING, action, user, data, message)
 
 
     def error(self, action: str, user: int, data: dict, message: str) -> None:
-        self.logger.error(self._format_message(action, user, data, message))
+        self._log(logging.ERROR, action, user, data, message)
 
 
     def critical(self, action: str, user: int, data: dict, message: str) -> None:
-        self.logger.critical(self._format_message(action, user, data, message))
\ No newline at end of file
+        self._log(logging.CRITICAL, action, user, data, message)
@@ -0,0 +1,107 @@
+import resource
+import threading
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional
+
+from elitemikobot.cpu_pool import CPU_POOL
+from elitemikobot.metrics import REGISTRY, Histogram
+
+
+STATM = Path("/proc/self/statm")
+
+UPSCALE_FACTOR = 2          # waifu2x scale
+BYTES_PER_PIXEL = 4         # RGBA
+# 작업마다 생성하는 waifu2x 모델 + 인코딩 버퍼, 실제 값은 elitemikobot_memory_estimate_ratio로 보정
+JOB_BASE_BYTES = 128 * 1024 * 1024
+FAST_JOB_BASE_BYTES = 32 * 1024 * 1024   # 업스케일 모델 없이 보간만 사용하는 작업 (빠른 생성 등), 인코딩 버퍼만
+
+_MB = 1024 * 1024
+STAGE_PEAK_RSS = REGISTRY.register(Histogram(
+    "elitemikobot_stage_peak_rss_bytes",
+    "Peak process RSS growth during a pipeline stage",
+    labels=("stage",),
+    buckets=tuple(size * _MB for size in (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096))
+))
+STAGE_TRACED_PEAK = REGISTRY.register(Histogram(
+    "elitemikobot_stage_traced_peak_bytes",
+    "Peak Python heap (tracemalloc) during a pipeline stage",
+    labels=("stage",),
+    buckets=tuple(size * _MB for size in (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096))
+))
+MEMORY_ESTIMATE_RATIO = REGISTRY.register(Histogram(
+    "elitemikobot_memory_estimate_ratio",
+    "Measured peak RSS growth divided by the admission estimate",
+    labels=("stage",),
+    buckets=(0.1, 0.25, 0.5, 0.75, 1, 1.25, 1.5, 2, 3, 5)
+))
+
+
+# 현재 RSS (Linux 외에는 ru_maxrss로 대체)
+def current_rss() -> int:
+    if STATM.exists():
+        return int(STATM.read_text().split()[1]) * resource.getpagesize()
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# 이미지 하나(또는 병합되는 두 이미지)를 처리하는 동안 필요한 메모리, shapes: [(가로, 세로, 프레임 수)]
+# GIF: 추출한 전체 프레임(RGBA) + 동시에 업스케일하는 프레임의 중간 버퍼
+# 정지 이미지: 원본 + 업스케일 결과 + 512x512 결과
+# 작업 하나가 동시에 업스케일할 수 있는 최대 프레임 수는 CPU 토큰 수
+def unit_memory(shapes: List[tuple]) -> int:
+    total = 0
+    for width, height, frames in shapes:
+        source = width * height * BYTES_PER_PIXEL
+        # rgb/alpha 복사, 업스케일 결과, BGRA 변환
+        working = source * 2 + source * UPSCALE_FACTOR ** 2 * 3
+        if frames > 1:
+            total += frames * source + CPU_POOL.tokens * working
+        else:
+            total += working + 512 * 512 * BYTES_PER_PIXEL * 2
+    return total
+
+
+# 단계 실행 중 RSS 증가량 최댓값(+ tracemalloc이 켜져 있으면 Python 힙 최댓값)을 기록해서 추정치 보정에 사용
+# RSS는 프로세스 전체 값이므로 동시에 실행 중인 작업의 영향도 포함됨
+class MemoryProbe:
+    def __init__(self, stage: str, estimate_bytes: int = 0, interval_sec: float = 0.05) -> None:
+        self.stage = stage
+        self.estimate_bytes = estimate_bytes
+        self.interval_sec = interval_sec
+        self.baseline = 0
+        self.peak = 0
+        self.traced_peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    @property
+    def growth(self) -> int:
+        return max(self.peak - self.baseline, 0)
+
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            self.peak = max(self.peak, current_rss())
+
+
+    def __enter__(self):
+        self.baseline = self.peak = current_rss()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._thread = threading.Thread(target=self._run, name="MemoryProbe", daemon=True)
+        self._thread.start()
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+        STAGE_PEAK_RSS.observe(self.growth, stage=self.stage)
+        if tracemalloc.is_tracing():
+            self.traced_peak = tracemalloc.get_traced_memory()[1]
+            STAGE_TRACED_PEAK.observe(self.traced_peak, stage=self.stage)
+        if self.estimate_bytes:
+            MEMORY_ESTIMATE_RATIO.observe(self.growth / self.estimate_bytes, stage=self.stage)
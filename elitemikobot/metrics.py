@@ -0,0 +1,239 @@
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+
+LabelValues = Tuple[str, ...]
+
+
+# Prometheus 텍스트 포맷 라벨 이스케이프
+def _format_labels(names: Sequence[str], values: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+
+    def escape(value: str) -> str:
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric(ABC):
+    TYPE = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.TYPE}"] + self._samples()
+
+
+    @abstractmethod
+    def _samples(self) -> List[str]: ...
+
+
+class Counter(_Metric):
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in self._values.items()]
+
+
+# 값을 직접 설정하거나, 수집 시점에 func를 호출해서 값을 읽음
+class Gauge(_Metric):
+    TYPE = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), func: Optional[Callable[[], float]] = None) -> None:
+        super().__init__(name, help_text, labels)
+        self.func = func
+        self._values: Dict[LabelValues, float] = {}
+
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+    def inc(self, value: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+
+    def dec(self, value: float = 1, **labels) -> None:
+        self.inc(-value, **labels)
+
+
+    def _samples(self) -> List[str]:
+        if self.func is not None:
+            return [f"{self.name} {self.func()}"]
+
+        with self._lock:
+            return [f"{self.name}{_format_labels(self.label_names, key)} {value}" for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    TYPE = "histogram"
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0) + value
+
+
+    # 라벨별 (관측 횟수, 합계)
+    def totals(self) -> Dict[LabelValues, Tuple[int, float]]:
+        with self._lock:
+            return {key: (sum(counts), self._sums[key]) for key, counts in self._counts.items()}
+
+
+    def _samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, ('le', str(bound)))} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, ('le', '+Inf'))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {self._sums[key]}")
+                lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+
+    def register(self, metric: _Metric) -> _Metric:
+        # 같은 이름이면 기존 지표를 교체 (봇 재생성 시 콜백 갱신)
+        self._metrics[metric.name] = metric
+        return metric
+
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "elitemikobot_stage_seconds",
+    "Duration of pipeline stages in seconds",
+    labels=("stage",)
+))
+STAGE_TOTAL = REGISTRY.register(Counter(
+    "elitemikobot_stage_total",
+    "Number of pipeline stage runs by result",
+    labels=("stage", "result")
+))
+
+
+# 작업 하나의 단계별 시간 수집 (/profile), 수집 중 생성된 하위 태스크에도 전달됨
+_stage_records: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("stage_records", default=None)
+
+
+@contextmanager
+def collect_stages() -> Iterator[List[Tuple[str, float]]]:
+    records: List[Tuple[str, float]] = []
+    token = _stage_records.set(records)
+    try:
+        yield records
+    finally:
+        _stage_records.reset(token)
+
+
+# 파이프라인 단계 시간 측정
+# metadata_fetch, download, validation, upscale_frame, encode_attempt, static_compression, upload, db_register
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    result = "ok"
+    try:
+        yield
+    except BaseException:
+        result = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        STAGE_TOTAL.inc(stage=stage, result=result)
+
+        records = _stage_records.get()
+        if records is not None:
+            records.append((stage, elapsed))
+
+
+# /metrics 엔드포인트 (Prometheus scrape 용)
+class MetricsServer:
+    def __init__(self, host: str, port: int, registry: MetricsRegistry = REGISTRY) -> None:
+        self.host = host
+        self.port = port
+        self.registry = registry
+        self._runner: Optional[web.AppRunner] = None
+
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.registry.render(), content_type="text/plain", charset="utf-8")
+
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        # port가 0이면 실제로 열린 포트
+        self.port = self._runner.addresses[0][1]
+
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -4,6 +4,7 @@ from enum import IntFlag
 class OptionFlag(IntFlag):    
     OVERWRITE = 1       # 0000 0000 0000 0000 0000 0000 0000 0001 덮어쓰기
     MERGE = 2           # 0000 0000 0000 0000 0000 0000 0000 0010 디시콘 합치기
+    FAST = 4            # 0000 0000 0000 0000 0000 0000 0000 0100 빠른 생성 (waifu2x 없이 리샘플링)
 
     @staticmethod
     def has_flag(option: int | OptionFlag, flag: OptionFlag) -> bool:
@@ -0,0 +1,93 @@
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# 샘플링 프로파일러, 별도 스레드에서 주기적으로 모든 스레드(이벤트 루프 + executor)의 스택을 수집
+# 결과는 collapsed stack 포맷 (flamegraph.pl, speedscope 등에서 flame graph로 확인)
+class SamplingProfiler:
+    # 대기 중인 스레드의 스택 (이벤트 루프 select, 작업을 기다리는 executor 스레드)
+    IDLE_FRAMES = {
+        ("selectors.py", "select"),
+        ("thread.py", "_worker"),
+        ("threading.py", "wait"),
+        ("queue.py", "get"),
+        ("handlers.py", "dequeue"),   # 로그 QueueListener
+    }
+
+    def __init__(self, interval_sec: float = 0.005) -> None:
+        self.interval_sec = interval_sec
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+
+    @staticmethod
+    def _frame_name(frame) -> str:
+        code = frame.f_code
+        return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+    def _sample(self) -> None:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == self._thread.ident:
+                continue
+
+            self.samples += 1
+            if (Path(frame.f_code.co_filename).name, frame.f_code.co_name) in self.IDLE_FRAMES:
+                self.idle_samples += 1
+                continue
+
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, str(thread_id)))
+            self.stacks[";".join(reversed(stack))] += 1
+
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            self._sample()
+
+
+    def __enter__(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="SamplingProfiler", daemon=True)
+        self._thread.start()
+        return self
+
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common()) + "\n"
+
+
+    # 가장 많이 잡힌 함수 (스택 맨 위 기준)
+    def top_functions(self, limit: int = 5) -> List[Tuple[str, int]]:
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(limit)
+
+
+# 단계별 시간 요약 (collect_stages 결과)
+def format_stage_breakdown(records: List[Tuple[str, float]], elapsed_sec: float) -> str:
+    totals: Dict[str, List[float]] = {}
+    for stage, seconds in records:
+        totals.setdefault(stage, []).append(seconds)
+
+    lines = [f"total {elapsed_sec:.2f}s"]
+    for stage, values in sorted(totals.items(), key=lambda item: -sum(item[1])):
+        lines.append(f"{stage}: {sum(values):.2f}s (n={len(values)}, max={max(values):.2f}s)")
+    return "\n".join(lines)
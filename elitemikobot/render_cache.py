@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+from elitemikobot.logger import Logger
+from elitemikobot.metrics import REGISTRY, Counter
+
+
+# 결과 파일 형식이 바뀌는 코드 수정 시 올려서 이전 캐시를 무효화
+CACHE_REVISION = 1
+
+RENDER_CACHE = REGISTRY.register(Counter(
+    "elitemikobot_render_cache_total",
+    "Render cache lookups and updates by result",
+    labels=("result",)
+))
+
+
+# 완성된 스티커 파일(.png/.webm) 캐시
+# 키: 원본 이미지 내용 해시 + 병합 구성 + 업스케일/인코딩 설정, /create -o 재생성 시 바뀌지 않은 항목은 파일 복사로 끝남
+# 파일은 root/{키 앞 2자리}/{키}.{ext}에 저장, 용량을 넘으면 오래 사용하지 않은 파일부터 삭제
+class RenderCache:
+    def __init__(self, root: Path, quota_mb: int) -> None:
+        self.root = Path(root)
+        self.quota_bytes = quota_mb * 1024 * 1024
+        self.logger = Logger(name="RenderCache_Log")
+        self.size = 0
+        self._entries: Optional["OrderedDict[str, int]"] = None   # 파일 이름 → 크기 (오래 사용하지 않은 순서)
+        self._lock = asyncio.Lock()
+
+
+    @staticmethod
+    def make_key(version: str, layout: str, sources: List[Path]) -> str:
+        digest = hashlib.sha256(f"{CACHE_REVISION}|{version}|{layout}".encode())
+        for source in sources:
+            data = Path(source).read_bytes()
+            digest.update(len(data).to_bytes(8, "little"))
+            digest.update(data)
+        return digest.hexdigest()
+
+
+    def _path(self, name: str) -> Path:
+        return self.root / name[:2] / name
+
+
+    # 이전 실행에서 저장된 파일 목록 (마지막 사용 시각 순서)
+    def _scan(self) -> "OrderedDict[str, int]":
+        files = []
+        if self.root.exists():
+            for file in self.root.glob("*/*"):
+                if file.name.startswith("."):
+                    continue
+                try:
+                    stat = file.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, file.name, stat.st_size))
+        return OrderedDict((name, size) for _, name, size in sorted(files))
+
+
+    async def _load(self) -> "OrderedDict[str, int]":
+        if self._entries is None:
+            self._entries = await asyncio.to_thread(self._scan)
+            self.size = sum(self._entries.values())
+        return self._entries
+
+
+    # 캐시에 있으면 out_path로 복사
+    async def fetch(self, key: str, ext: str, out_path: Path) -> bool:
+        name = f"{key}.{ext}"
+        async with self._lock:
+            entries = await self._load()
+            if name not in entries:
+                RENDER_CACHE.inc(result="miss")
+                return False
+            entries.move_to_end(name)
+
+        path = self._path(name)
+        try:
+            await asyncio.to_thread(shutil.copyfile, path, out_path)
+            await asyncio.to_thread(os.utime, path)
+        except OSError as e:
+            # 외부에서 삭제된 파일은 목록에서도 제거
+            async with self._lock:
+                size = self._entries.pop(name, None)
+                if size is not None:
+                    self.size -= size
+            RENDER_CACHE.inc(result="error")
+            self.logger.warning(
+                action="render cache fetch",
+                user=" ",
+                data={"key": name},
+                message=f"{e}"
+            )
+            return False
+
+        RENDER_CACHE.inc(result="hit")
+        return True
+
+
+    # 완성된 스티커 파일을 캐시에 저장 (임시 파일에 복사 후 이름 변경)
+    async def store(self, key: str, ext: str, file_path: Path) -> None:
+        name = f"{key}.{ext}"
+        path = self._path(name)
+        tmp_path = path.parent / f".{name}.{uuid.uuid4().hex[:8]}"
+
+        def copy() -> int:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(file_path, tmp_path)
+            os.replace(tmp_path, path)
+            return path.stat().st_size
+
+        try:
+            size = await asyncio.to_thread(copy)
+        except OSError as e:
+            await asyncio.to_thread(tmp_path.unlink, True)
+            RENDER_CACHE.inc(result="error")
+            self.logger.warning(
+                action="render cache store",
+                user=" ",
+                data={"key": name},
+                message=f"{e}"
+            )
+            return
+
+        async with self._lock:
+            entries = await self._load()
+            self.size += size - entries.pop(name, 0)
+            entries[name] = size
+            RENDER_CACHE.inc(result="store")
+            await self._evict()
+
+
+    async def _evict(self) -> None:
+        removed = 0
+        while self.size > self.quota_bytes and len(self._entries) > 1:
+            name, size = self._entries.popitem(last=False)
+            self.size -= size
+            await asyncio.to_thread(self._path(name).unlink, True)
+            removed += 1
+
+        if removed:
+            RENDER_CACHE.inc(removed, result="evict")
+            self.logger.info(
+                action="render cache evict",
+                user="EliteMikoBot",
+                data={"removed": removed, "used_mb": self.size // (1024 * 1024), "quota_mb": self.quota_bytes // (1024 * 1024)},
+                message="Evicted least recently used render cache files"
+            )
+
+
+# 0이면 캐시를 사용하지 않음
+def open_render_cache(root: Path, quota_mb: int) -> Optional[RenderCache]:
+    return RenderCache(root, quota_mb) if quota_mb > 0 else None
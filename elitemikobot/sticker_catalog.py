@@ -0,0 +1,235 @@
+import asyncio
+import sqlite3
+import time
+import datetime as dt
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from elitemikobot.db_apiclient import DbApiClient
+from elitemikobot.logger import Logger
+from elitemikobot.option_flag import OptionFlag
+from elitemikobot.sticker_data import StickerData
+
+
+# API 서버 스티커 테이블의 로컬 복제본 (id, option_flag, url)
+# SQLite에 영속화하고 조회는 메모리에서 처리, 원본은 항상 API 서버
+# 같은 스티커는 등록 시각(registered_at, UTC)이 더 늦은 값만 반영
+# 변경분 API에는 삭제가 없으므로 주기적으로 전체 목록을 받아 서버에서 지운 스티커를 제거 (reconcile)
+# 그 사이에는 지운 스티커가 남아 있을 수 있어서 복제본에 있는 값은 참고용, 없는 값은 API 서버에 다시 확인
+class StickerCatalog:
+    def __init__(self, db_path: Path, db: DbApiClient) -> None:
+        self.db_path = Path(db_path)
+        self.db = db
+        self.logger = Logger(name="StickerCatalog_Log")
+        self.cursor: Optional[dt.datetime] = None
+        self.ready = False
+        self._reconciled_at = time.monotonic()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = asyncio.Lock()
+        self._urls: Dict[Tuple[int, int], str] = {}
+        self._registered_at: Dict[Tuple[int, int], str] = {}
+        # 이전 URL의 세트도 텔레그램에는 남아 있으므로 URL이 바뀌어도 지우지 않음
+        self._set_names: set[str] = set()
+
+
+    # 덮어쓰기(-o)는 요청 옵션일 뿐이므로 키에서 제외
+    @staticmethod
+    def _key(sticker_id: int, option_flag: int) -> Tuple[int, int]:
+        return sticker_id, int(option_flag) & ~int(OptionFlag.OVERWRITE)
+
+
+    # 등록 시각을 UTC 문자열로 통일 (문자열 비교 = 시각 비교), 시간대가 없는 값은 봇 서버 로컬 시각
+    @staticmethod
+    def _timestamp(value: dt.datetime) -> str:
+        return value.astimezone(dt.timezone.utc).isoformat(timespec="microseconds")
+
+
+    # DB에는 https://t.me/addstickers/{name} 형태로 저장되므로 세트 이름만 추출
+    @staticmethod
+    def _set_name(sticker_url: str) -> str:
+        return sticker_url.rsplit("/", 1)[-1]
+
+
+    # SQLite 파일 로드
+    async def open(self) -> None:
+        await asyncio.to_thread(self._open_db)
+
+
+    def _open_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS stickers ("
+            " id INTEGER NOT NULL,"
+            " option_flag INTEGER NOT NULL,"
+            " url TEXT NOT NULL,"
+            " registered_at TEXT NOT NULL,"
+            " PRIMARY KEY (id, option_flag))"
+        )
+        # 동기화 커서는 API 서버에서 받은 변경분 기준으로만 저장 (write-through 시각과 분리)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT value FROM sync_state WHERE key = 'cursor'").fetchone()
+        if row:
+            self.cursor = dt.datetime.fromisoformat(row[0])
+
+        rows = self._conn.execute("SELECT id, option_flag, url, registered_at FROM stickers").fetchall()
+        # 시간대가 섞여 저장된 이전 버전 파일은 UTC로 변환
+        legacy = [
+            (self._timestamp(dt.datetime.fromisoformat(registered_at)), sticker_id, option_flag)
+            for sticker_id, option_flag, _, registered_at in rows
+            if self._timestamp(dt.datetime.fromisoformat(registered_at)) != registered_at
+        ]
+        if legacy:
+            self._conn.executemany("UPDATE stickers SET registered_at = ? WHERE id = ? AND option_flag = ?", legacy)
+            self._conn.commit()
+            rows = self._conn.execute("SELECT id, option_flag, url, registered_at FROM stickers").fetchall()
+
+        for row in rows:
+            self._apply(*row)
+
+
+    # SQL의 registered_at 조건과 같은 기준, 더 이전 시각의 값은 무시
+    def _apply(self, sticker_id: int, option_flag: int, url: str, registered_at: str) -> None:
+        key = (sticker_id, option_flag)
+        if registered_at < self._registered_at.get(key, ""):
+            return
+        self._urls[key] = url
+        self._registered_at[key] = registered_at
+        self._set_names.add(self._set_name(url))
+
+
+    async def close(self) -> None:
+        if self._conn is not None:
+            await asyncio.to_thread(self._conn.close)
+            self._conn = None
+
+
+    # 마지막 동기화 이후 변경분만 가져와서 반영
+    async def sync(self) -> int:
+        changes = await self.db.get_sticker_changes(since=self.cursor)
+        if changes:
+            cursor = max(sticker.date_time for sticker in changes)
+            await self._upsert(changes, cursor=cursor if self.cursor is None or cursor > self.cursor else None)
+        self.ready = True
+        return len(changes)
+
+
+    # 전체 목록으로 복제본을 교체, 제거한 스티커 수 리턴
+    # 목록을 받는 사이 write-through로 기록한 스티커는 유지, 빈 목록은 API 오류(404)와 구분할 수 없으므로 반영하지 않음
+    async def reconcile(self) -> int:
+        started = self._timestamp(dt.datetime.now(dt.timezone.utc))
+        stickers = await self.db.get_sticker_changes(since=None)
+        self._reconciled_at = time.monotonic()
+        if not stickers:
+            return 0
+
+        rows = {}
+        for sticker in stickers:
+            key = self._key(sticker.id, sticker.option_flag)
+            row = (*key, sticker.url, self._timestamp(sticker.date_time))
+            if row[3] >= rows.get(key, row)[3]:
+                rows[key] = row
+        cursor = max(sticker.date_time for sticker in stickers)
+
+        async with self._lock:
+            removed, kept = await asyncio.to_thread(self._replace_rows, list(rows.values()), started, cursor)
+
+        # 이전 URL의 세트 이름(_set_names)은 그대로 둠
+        self._urls.clear()
+        self._registered_at.clear()
+        for row in kept:
+            self._apply(*row)
+        self.cursor = cursor if self.cursor is None or cursor > self.cursor else self.cursor
+        return removed
+
+
+    def _replace_rows(self, rows: list, started: str, cursor: dt.datetime) -> Tuple[int, list]:
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS server_keys (id INTEGER NOT NULL, option_flag INTEGER NOT NULL)")
+        self._conn.execute("DELETE FROM server_keys")
+        self._conn.executemany("INSERT INTO server_keys (id, option_flag) VALUES (?, ?)", [row[:2] for row in rows])
+        removed = self._conn.execute(
+            "DELETE FROM stickers WHERE registered_at < ? AND (id, option_flag) NOT IN (SELECT id, option_flag FROM server_keys)",
+            (started,)
+        ).rowcount
+        self._write_rows(rows, cursor if self.cursor is None or cursor > self.cursor else None)
+        return removed, self._conn.execute("SELECT id, option_flag, url, registered_at FROM stickers").fetchall()
+
+
+    # 주기적 동기화 (애플리케이션 종료 시 취소), reconcile_interval_sec마다 전체 목록으로 삭제 반영
+    async def run_sync_loop(self, interval_sec: float, reconcile_interval_sec: float = 0) -> None:
+        while True:
+            try:
+                if reconcile_interval_sec and time.monotonic() - self._reconciled_at >= reconcile_interval_sec:
+                    removed = await self.reconcile()
+                    self.logger.info(
+                        action="catalog reconcile",
+                        user=" ",
+                        data={"removed": removed, "stickers": len(self._urls)},
+                        message="Sticker catalog reconciled with the full sticker list"
+                    )
+
+                count = await self.sync()
+                if count:
+                    self.logger.info(
+                        action="catalog sync",
+                        user=" ",
+                        data={"changes": count, "cursor": self.cursor},
+                        message="Sticker catalog synced"
+                    )
+            except Exception as e:
+                self.logger.warning(
+                    action="Exception catalog sync",
+                    user=" ",
+                    data={"cursor": self.cursor},
+                    message=f"{e}"
+                )
+            await asyncio.sleep(interval_sec)
+
+
+    # API 서버 등록 후 로컬에도 바로 반영 (write-through)
+    async def record(self, sticker: StickerData) -> None:
+        await self._upsert([sticker])
+
+
+    async def _upsert(self, stickers: List[StickerData], cursor: Optional[dt.datetime] = None) -> None:
+        if not stickers:
+            return
+
+        rows = []
+        for sticker in stickers:
+            sticker_id, option_flag = self._key(sticker.id, sticker.option_flag)
+            rows.append((sticker_id, option_flag, sticker.url, self._timestamp(sticker.date_time)))
+
+        async with self._lock:
+            await asyncio.to_thread(self._write_rows, rows, cursor)
+
+        for row in rows:
+            self._apply(*row)
+        if cursor is not None:
+            self.cursor = cursor
+
+
+    def _write_rows(self, rows: list, cursor: Optional[dt.datetime]) -> None:
+        self._conn.executemany(
+            "INSERT INTO stickers (id, option_flag, url, registered_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id, option_flag) DO UPDATE SET url=excluded.url, registered_at=excluded.registered_at "
+            "WHERE excluded.registered_at >= stickers.registered_at",
+            rows
+        )
+        if cursor is not None:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('cursor', ?)",
+                (cursor.isoformat(),)
+            )
+        self._conn.commit()
+
+
+    # 등록된 스티커 URL, 없으면 None
+    def get_url(self, sticker: StickerData) -> Optional[str]:
+        return self._urls.get(self._key(sticker.id, sticker.option_flag))
+
+
+    def url_exists(self, sticker_url: str) -> bool:
+        return self._set_name(sticker_url) in self._set_names
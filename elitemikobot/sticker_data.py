@@ -38,6 +38,39 @@ class StickerData:
         }            
 
 
+    # 작업 체크포인트 저장용 (JSON)
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["option_flag"] = int(self.option_flag)
+        data["date_time"] = self.date_time.isoformat()
+        return data
+
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        data = dict(data)
+        data["date_time"] = dt.datetime.fromisoformat(data["date_time"])
+        # JSON 키는 문자열이므로 img_num을 int로 복원
+        data["ext"] = {int(num): ext for num, ext in data.get("ext", {}).items()}
+        return cls(**data)
+
+
+    # 스티커로 만들어지는 이미지 번호 (병합 시 i, i + 1이 하나의 스티커)
+    def sticker_nums(self) -> List[int]:
+        merge_nums = self.merge_nums if self.merge_nums is not None else []
+        nums = []
+
+        i = 1
+        while i <= self.count:
+            nums.append(i)
+            i += (2 if i in merge_nums else 1)
+        return nums
+
+
+    def sticker_file_name(self, num: int) -> str:
+        return f"{num}.webm" if self.ext[num] == "gif" else f"{num}.png"
+
+
     def update_from_dccon_data(self, dccon_data: DcconData) -> None:
         self.title = dccon_data.title
         self.count = dccon_data.count
@@ -0,0 +1,244 @@
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+from elitemikobot.dccon import Dccon
+from elitemikobot.dccon_data import DcconData
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.logger import Logger
+from elitemikobot.job_estimate import JobEstimate, estimate_job
+from elitemikobot.memory import MemoryProbe
+from elitemikobot.option_flag import OptionFlag
+from elitemikobot.render_cache import RenderCache
+from elitemikobot.sticker_data import StickerData
+from elitemikobot.work_queue import WorkQueueBackend
+from elitemikobot.workspace import WorkspaceManager
+
+
+# 디시콘 다운로드 → 업스케일 → 스티커 파일(.png/.webm) 생성
+# 결과 파일은 sticker_path/{dccon_id}/{num}.{ext}에 저장, GIF 프레임은 작업 임시 폴더에 저장
+class StickerProcessor:
+    def __init__(self, img_path: Path, sticker_path: Path, workspaces: Optional[WorkspaceManager] = None, cache: Optional[RenderCache] = None) -> None:
+        self.img_path = Path(img_path)
+        self.sticker_path = Path(sticker_path)
+        self.workspaces = workspaces
+        self.cache = cache
+        self.logger = Logger(name="StickerProcessor_Log")
+
+
+    # 대기열 등록 전 다운로드, 받은 이미지로 작업 메모리/처리 시간 추정, 실패하면 None
+    async def prepare(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[JobEstimate]:
+        dccon_data = await self._download(sticker_data, manifest)
+        if not dccon_data:
+            return None
+        return await asyncio.to_thread(estimate_job, dccon_data, sticker_data.merge_nums, self._is_fast(sticker_data))
+
+
+    @staticmethod
+    def _is_fast(sticker_data: StickerData) -> bool:
+        return OptionFlag.has_flag(sticker_data.option_flag, OptionFlag.FAST)
+
+
+    async def process(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[DcconData]:
+        dccon_data = await self._download(sticker_data, manifest)
+        if not dccon_data:
+            return None
+
+        sticker_data.update_from_dccon_data(dccon_data)
+        estimate = await asyncio.to_thread(estimate_job, dccon_data, sticker_data.merge_nums, self._is_fast(sticker_data))
+
+        with MemoryProbe("upscale", estimate.memory) as probe:
+            result = await self._process_upscaler(dccon_data, sticker_data, manifest)
+
+        self.logger.info(
+            action="memory usage",
+            user=f"{sticker_data.user_name}({sticker_data.user_id})",
+            data={
+                "dccon_id": sticker_data.id,
+                "estimate_mb": estimate.memory // (1024 * 1024),
+                "rss_growth_mb": probe.growth // (1024 * 1024),
+                "traced_peak_mb": probe.traced_peak // (1024 * 1024) if probe.traced_peak is not None else None
+            },
+            message="Upscale memory usage against the admission estimate"
+        )
+
+        if not result:
+            return None
+
+        return dccon_data
+
+
+    # 체크포인트에 다운로드 기록이 있고 파일이 남아 있으면 다시 받지 않음
+    async def _download(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[DcconData]:
+        if manifest is not None and manifest.downloaded and (self.img_path / str(sticker_data.id)).exists():
+            return manifest.dccon
+
+        with MemoryProbe("download"):
+            dccon_data = await self._process_dccon(sticker_data)
+        if not dccon_data:
+            return None
+
+        if manifest is not None:
+            manifest.dccon = dccon_data
+            manifest.items.clear()
+            await manifest.save()
+
+        return dccon_data
+
+
+    async def _process_dccon(self, sticker_data: StickerData) -> Optional[DcconData]:
+        dccon = Dccon()
+        save_path = self.img_path / str(sticker_data.id)
+        dccon_data = await dccon.process_dccon(
+            dccon_id=sticker_data.id,
+            save_path=str(save_path)
+        )
+
+        if dccon_data is None or dccon_data.err:
+            self.logger.warning(
+                action="dccon_data fail",
+                user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                data={"dccon_id":sticker_data.id, "status":"fail"},
+                message=f"{dccon_data.err if dccon_data else 'fetch failed'}"
+            )
+            return None
+
+        self.logger.info(
+            action="fetch dccon data",
+            user=f"{sticker_data.user_name}({sticker_data.user_id})",
+            data={"dccon_id":sticker_data.id, "status":"complete"},
+            message="Fetch dccon data completed successfully"
+        )
+        return dccon_data
+
+
+    async def _process_upscaler(self, dccon_data: DcconData, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> bool:
+        if self.workspaces is None:
+            result = await self._run_upscaler(dccon_data, sticker_data, manifest)
+        else:
+            async with self.workspaces.use(sticker_data.id) as workspace:
+                result = await self._run_upscaler(dccon_data, sticker_data, manifest, workspace.path)
+
+        if not result:
+            return False
+
+        self.logger.info(
+            action="upscaler upscale",
+            user=f"{sticker_data.user_name}({sticker_data.user_id})",
+            data={"dccon_id": sticker_data.id, "status": "complete"},
+            message="Upscaler upscale completed successfully"
+        )
+        return True
+
+
+    async def _run_upscaler(self, dccon_data: DcconData, sticker_data: StickerData, manifest: Optional[JobManifest] = None, scratch_path: Optional[Path] = None) -> bool:
+        # cv2/numpy/waifu2x는 봇 시작 후 백그라운드에서 미리 불러옴 (EliteMikoBot._warmup)
+        from elitemikobot.upscaler import Upscaler
+
+        upscaler = Upscaler(
+            dccon_data=dccon_data,
+            sticker_path=str(self.sticker_path / str(sticker_data.id)),
+            merge_nums=sticker_data.merge_nums,
+            checkpoint=manifest,
+            scratch_path=str(scratch_path) if scratch_path is not None else None,
+            cache=self.cache,
+            fast=self._is_fast(sticker_data)
+        )
+        return await upscaler.upscaler()
+
+
+# 처리를 공유 작업 큐의 워커(python -m elitemikobot.worker)에 맡기고 결과 파일을 받아옴
+class RemoteStickerProcessor:
+    def __init__(self, queue: WorkQueueBackend, sticker_path: Path, poll_interval_sec: float = 1.0) -> None:
+        self.queue = queue
+        self.sticker_path = Path(sticker_path)
+        self.poll_interval_sec = poll_interval_sec
+        self.logger = Logger(name="StickerProcessor_Log")
+
+
+    # 디시콘은 워커가 내려받으므로 추정 없이 대기열에 등록
+    # 메모리 예산은 쓰지 않고 (BotConfig.init_queues) 예상 처리 시간이 모두 0이라 사용자별로 도착 순서대로 처리
+    async def prepare(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[JobEstimate]:
+        return JobEstimate()
+
+
+    async def process(self, sticker_data: StickerData, manifest: Optional[JobManifest] = None) -> Optional[DcconData]:
+        # 이전에 받아둔 결과 파일이 모두 남아 있으면 다시 맡기지 않음
+        if manifest is not None and self._is_rendered(sticker_data, manifest):
+            sticker_data.update_from_dccon_data(manifest.dccon)
+            return manifest.dccon
+
+        job_id = await self.queue.put_job({"sticker": sticker_data.to_dict()})
+        last_seq = 0
+
+        try:
+            while True:
+                for event in await self.queue.get_events(job_id, last_seq):
+                    last_seq = event.seq
+                    self.logger.info(
+                        action="worker event",
+                        user=f"{sticker_data.user_name}({sticker_data.user_id})",
+                        data={"dccon_id": sticker_data.id, "job_id": job_id, "stage": event.stage, **event.payload},
+                        message="Worker stage result"
+                    )
+
+                job = await self.queue.get_job(job_id)
+                if job is None or job.status in {WorkQueueBackend.FAILED, WorkQueueBackend.CANCELLED}:
+                    return None
+                if job.status == WorkQueueBackend.DONE:
+                    return await self._collect_result(sticker_data, job_id, job.result, manifest)
+
+                await asyncio.sleep(self.poll_interval_sec)
+
+        except asyncio.CancelledError:
+            # 아직 워커가 가져가지 않은 작업은 바로 삭제, 처리 중이면 워커가 확인 후 중단
+            job = await self.queue.get_job(job_id)
+            if job is not None and job.status == WorkQueueBackend.QUEUED:
+                await self.queue.delete_job(job_id)
+            else:
+                await self.queue.finish_job(job_id, WorkQueueBackend.CANCELLED)
+            raise
+
+        finally:
+            job = await self.queue.get_job(job_id)
+            if job is not None and job.status in {WorkQueueBackend.DONE, WorkQueueBackend.FAILED}:
+                await self.queue.delete_job(job_id)
+
+
+    def _is_rendered(self, sticker_data: StickerData, manifest: JobManifest) -> bool:
+        if not manifest.downloaded:
+            return False
+
+        rendered = StickerData(count=manifest.dccon.count, ext=manifest.dccon.ext, merge_nums=sticker_data.merge_nums)
+        out_dir = self.sticker_path / str(sticker_data.id)
+        return all(
+            manifest.item_stage(num) == JobManifest.ENCODED and (out_dir / rendered.sticker_file_name(num)).exists()
+            for num in rendered.sticker_nums()
+        )
+
+
+    # 워커가 올린 스티커 파일을 로컬 스티커 폴더에 저장
+    async def _collect_result(self, sticker_data: StickerData, job_id: str, result: dict, manifest: Optional[JobManifest]) -> DcconData:
+        dccon = dict(result["dccon"])
+        dccon["ext"] = {int(num): ext for num, ext in dccon["ext"].items()}
+        dccon_data = DcconData(**dccon)
+
+        out_dir = self.sticker_path / str(sticker_data.id)
+        files = await self.queue.get_files(job_id)
+
+        def write_files():
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for name, data in files.items():
+                (out_dir / Path(name).name).write_bytes(data)
+        await asyncio.to_thread(write_files)
+
+        sticker_data.update_from_dccon_data(dccon_data)
+
+        if manifest is not None:
+            manifest.dccon = dccon_data
+            for name in files:
+                manifest.items.setdefault(int(Path(name).stem), {})["stage"] = JobManifest.ENCODED
+            await manifest.save()
+
+        return dccon_data
+
@@ -0,0 +1,222 @@
+import importlib.util
+import os
+import sys
+import threading
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Type
+
+from elitemikobot.frame_pool import NO_POOL, FramePool
+from elitemikobot.logger import Logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# auto 선택 기준, 원본 프레임 수 x 픽셀 수가 이 값을 넘는 GIF는 가벼운 모델 사용
+LONG_GIF_PIXELS = 40 * 256 * 256
+
+
+# 프레임 하나를 받아 업스케일한 프레임을 돌려주는 공통 인터페이스 (BGR/BGRA numpy 배열)
+# process는 작업 스레드에서 실행됨 (asyncio.to_thread)
+class UpscaleBackend(ABC):
+    name = ""
+    scale = 2
+    stage = "upscale_frame"       # elitemikobot_stage_seconds 단계 이름
+    supports_alpha = False        # False면 알파 채널은 따로 선형 보간
+    frames_per_token = 1          # CPU 토큰 하나로 한 작업 스레드에서 이어서 처리할 프레임 수 (묶음 추론은 하지 않음)
+    sec_per_megapixel = 1.5       # 업스케일 결과 기준 예상 처리 시간 (job_estimate)
+
+    @classmethod
+    def available(cls) -> bool:
+        return True
+
+
+    # 결과 파일에 영향을 주는 설정 (렌더 캐시 키)
+    @classmethod
+    def version(cls) -> str:
+        return cls.name
+
+
+    @abstractmethod
+    def _upscale(self, image: "np.ndarray") -> "np.ndarray": ...
+
+
+    # size가 있으면 업스케일 후 최종 크기로 변환
+    # 중간/결과 버퍼는 pool에서 받음, 결과는 호출한 쪽에서 다 쓴 뒤 pool.release
+    def process(self, image: "np.ndarray", size: Optional[Tuple[int, int]] = None, pool: FramePool = NO_POOL) -> "np.ndarray":
+        import cv2
+
+        if image.ndim == 3 and image.shape[2] == 4 and not self.supports_alpha:
+            # 색상만 업스케일, 알파는 선형 보간 후 결과 버퍼에 바로 채움
+            height, width = image.shape[:2]
+            color = cv2.cvtColor(image, cv2.COLOR_BGRA2BGR, dst=pool.acquire((height, width, 3)))
+            upscaled = self._upscale(color)
+            pool.release(color)
+
+            out_size = (upscaled.shape[1], upscaled.shape[0])
+            alpha = cv2.extractChannel(image, 3, dst=pool.acquire((height, width)))
+            scaled_alpha = cv2.resize(alpha, out_size, dst=pool.acquire(out_size[::-1]), interpolation=cv2.INTER_LINEAR)
+            result = cv2.cvtColor(upscaled, cv2.COLOR_BGR2BGRA, dst=pool.acquire(out_size[::-1] + (4,)))
+            cv2.mixChannels([scaled_alpha], [result], [0, 3])
+            pool.release(alpha, scaled_alpha)
+        else:
+            result = self._upscale(image)
+
+        if not size:
+            return result
+        resized = cv2.resize(result, size, dst=pool.acquire(size[::-1] + result.shape[2:]), interpolation=cv2.INTER_LINEAR)
+        pool.release(result)
+        return resized
+
+
+class Waifu2xBackend(UpscaleBackend):
+    name = "waifu2x"
+    NOISE = 3
+
+    @classmethod
+    def available(cls) -> bool:
+        return "waifu2x_ncnn_py" in sys.modules or importlib.util.find_spec("waifu2x_ncnn_py") is not None
+
+
+    @classmethod
+    def version(cls) -> str:
+        return f"waifu2x-s{cls.scale}n{cls.NOISE}"
+
+
+    def __init__(self) -> None:
+        from waifu2x_ncnn_py import Waifu2x
+        self.waifu2x = Waifu2x(gpuid=0, scale=self.scale, noise=self.NOISE)
+
+
+    def _upscale(self, image: "np.ndarray") -> "np.ndarray":
+        return self.waifu2x.process_cv2(image)
+
+
+# OpenCV dnn_superres (FSRCNN/ESPCN), waifu2x보다 화질은 낮지만 훨씬 빠름
+# 모델 객체는 스레드 간에 공유하지 않고 스레드마다 따로 불러옴
+class SuperResBackend(UpscaleBackend):
+    name = "superres"
+    sec_per_megapixel = 0.2
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def available(cls) -> bool:
+        if not UpscaleConfig.SUPERRES_MODEL or not Path(UpscaleConfig.SUPERRES_MODEL).exists():
+            return False
+        import cv2
+        return hasattr(cv2, "dnn_superres")
+
+
+    @classmethod
+    def version(cls) -> str:
+        return f"superres-{Path(UpscaleConfig.SUPERRES_MODEL).name}"
+
+
+    # 파일 이름에서 알고리즘/배율 (FSRCNN_x2.pb → fsrcnn, 2)
+    @staticmethod
+    def parse_model_name(path: str) -> Tuple[str, int]:
+        algorithm, _, scale = Path(path).stem.lower().partition("_x")
+        return algorithm.replace("-small", ""), int(scale or 2)
+
+
+    def __init__(self) -> None:
+        self.algorithm, self.scale = self.parse_model_name(UpscaleConfig.SUPERRES_MODEL)
+        self._local = threading.local()
+
+
+    def _model(self):
+        model = getattr(self._local, "model", None)
+        if model is None:
+            import cv2
+            model = cv2.dnn_superres.DnnSuperResImpl_create()
+            model.readModel(UpscaleConfig.SUPERRES_MODEL)
+            model.setModel(self.algorithm, self.scale)
+            self._local.model = model
+        return model
+
+
+    def _upscale(self, image: "np.ndarray") -> "np.ndarray":
+        return self._model().upsample(image)
+
+
+# 보간만 사용 (확대 Lanczos, 축소 area), 빠른 생성(-f)과 이미 충분히 큰 이미지에 사용
+class InterpolationBackend(UpscaleBackend):
+    name = "interpolation"
+    stage = "resample_frame"
+    supports_alpha = True
+    frames_per_token = 8
+    sec_per_megapixel = 0.02
+
+    # size가 없으면 원본 그대로 (최종 크기 변환은 이후 단계의 ffmpeg scale에서 한 번만)
+    def process(self, image: "np.ndarray", size: Optional[Tuple[int, int]] = None, pool: FramePool = NO_POOL) -> "np.ndarray":
+        import cv2
+
+        if not size:
+            return image
+        shrink = size[0] < image.shape[1] and size[1] < image.shape[0]
+        out = pool.acquire(size[::-1] + image.shape[2:])
+        return cv2.resize(image, size, dst=out, interpolation=cv2.INTER_AREA if shrink else cv2.INTER_LANCZOS4)
+
+
+    def _upscale(self, image: "np.ndarray") -> "np.ndarray":
+        import cv2
+        return cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_LANCZOS4)
+
+
+BACKENDS: Dict[str, Type[UpscaleBackend]] = {
+    backend.name: backend for backend in (Waifu2xBackend, SuperResBackend, InterpolationBackend)
+}
+
+
+class UpscaleConfig:
+    # 업스케일 백엔드 선택 (auto | waifu2x | superres | interpolation), auto면 이미지 크기/프레임 수로 결정
+    BACKEND = "auto"
+    # OpenCV dnn_superres 모델 파일 (예: models/FSRCNN_x2.pb, models/ESPCN_x2.pb), opencv-contrib-python 필요
+    SUPERRES_MODEL = ""
+
+    # 봇/워커의 load_config에서 설정 파일을 읽은 뒤 호출
+    # 모르는 백엔드 이름은 시작할 때 실패, 사용할 수 없는 백엔드는 경고 후 auto처럼 선택
+    @classmethod
+    def load_config(cls):
+        cls.BACKEND = os.getenv("UPSCALE_BACKEND", cls.BACKEND)
+        cls.SUPERRES_MODEL = os.getenv("SUPERRES_MODEL", cls.SUPERRES_MODEL)
+        SuperResBackend.available.cache_clear()
+
+        if cls.BACKEND != "auto" and cls.BACKEND not in BACKENDS:
+            raise ValueError(f"unknown upscale backend: {cls.BACKEND}")
+        if cls.BACKEND != "auto" and not BACKENDS[cls.BACKEND].available():
+            Logger(name="Upscaler_Log").warning(
+                action="upscale backend",
+                user=" ",
+                data={"backend": cls.BACKEND, "superres_model": cls.SUPERRES_MODEL},
+                message=f"{cls.BACKEND} is not available, choosing backends as auto"
+            )
+
+
+# 이미지 하나에 사용할 백엔드 이름
+# policy: auto | 백엔드 이름, target: 최종 스티커에서 이 이미지가 차지하는 크기 (병합이면 256)
+# 지정한 백엔드를 사용할 수 없으면 (모델 파일/라이브러리 없음) auto와 같은 방식으로 선택
+def choose_backend(policy: str, width: int, height: int, frames: int = 1, target: int = 512) -> str:
+    if policy != "auto" and (policy not in BACKENDS or BACKENDS[policy].available()):
+        return policy
+
+    # 결과를 다시 줄이므로 신경망 업스케일 효과가 없음
+    if min(width, height) >= target:
+        return InterpolationBackend.name
+
+    preferred = [Waifu2xBackend, SuperResBackend]
+    if frames > 1 and frames * width * height > LONG_GIF_PIXELS:
+        preferred.reverse()
+
+    for backend in preferred:
+        if backend.available():
+            return backend.name
+    return InterpolationBackend.name
+
+
+def create_backend(name: str) -> UpscaleBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"unknown upscale backend: {name}")
+    return BACKENDS[name]()
@@ -1,14 +1,22 @@
-from typing import List
-from PIL import Image, ImageSequence, ImageChops, ImageStat
+from typing import Dict, List, Optional
+from PIL import Image
 import os
-from waifu2x_ncnn_py import Waifu2x
 import cv2
 import numpy as np
 import asyncio
+import shutil
 from pathlib import Path
 from elitemikobot.dccon_data import DcconData
 from elitemikobot.logger import Logger
 from elitemikobot.converter import Converter
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.metrics import stage_timer
+from elitemikobot.cpu_pool import CPU_POOL
+from elitemikobot.render_cache import RenderCache
+from elitemikobot.job_estimate import image_shape
+from elitemikobot.gif_frames import extract_frames, read_durations
+from elitemikobot.frame_pool import FramePool
+from elitemikobot.upscale_backend import InterpolationBackend, UpscaleBackend, UpscaleConfig, choose_backend, create_backend
 
 
 class Upscaler():
@@ -16,7 +24,7 @@ class Upscaler():
     IMG_SIZE_X = 512
     IMG_SIZE_Y = 512
 
-    def __init__(self, dccon_data: DcconData, sticker_path: str, merge_nums: List[int]):
+    def __init__(self, dccon_data: DcconData, sticker_path: str, merge_nums: List[int], checkpoint: Optional[JobManifest] = None, scratch_path: Optional[str] = None, cache: Optional[RenderCache] = None, fast: bool = False, backend: Optional[str] = None):
         self.logger = Logger(name="Upscaler_Log")
         self.dccon_data = dccon_data
         self.dccon_id = dccon_data.id    
@@ -25,7 +33,17 @@ class Upscaler():
         self.dccon_path = dccon_data.path   
         self.sticker_path = sticker_path   
         self.merge_nums = merge_nums
-        self.waifu2x = Waifu2x(gpuid=0, scale=2, noise=3)           
+        self.checkpoint = checkpoint
+        # GIF 프레임 임시 폴더 위치 (작업 임시 폴더), 없으면 스티커 폴더 아래
+        self.scratch_path = scratch_path if scratch_path is not None else sticker_path
+        self.cache = cache
+        # 빠른 생성은 보간만 사용 + 속도 우선 인코딩
+        self.fast = fast
+        # 업스케일 백엔드 선택 방식 (auto | 백엔드 이름), 백엔드는 처음 사용할 때 생성
+        self.policy = InterpolationBackend.name if fast else (backend or UpscaleConfig.BACKEND)
+        self._backends: Dict[str, UpscaleBackend] = {}
+        # 프레임 업스케일/크기 변환/병합 버퍼 재사용
+        self.buffers = FramePool()
 
     
     async def upscaler(self) -> bool:        
@@ -38,6 +56,11 @@ class Upscaler():
             i = 1
             while i <= self.dccon_count:                                               
                 is_merge = i in merge_nums and i + 1 <= self.dccon_count                                     
+
+                # 이전 작업에서 이미 만들어진 스티커는 건너뜀
+                if self._is_item_done(i):
+                    i += 2 if is_merge else 1
+                    continue
                 
                 nums = [i, i + 1] if is_merge else [i]
                 file_paths = []
@@ -48,16 +71,31 @@ class Upscaler():
                     file_paths.append(file_path)
 
                 ext = self.dccon_ext[i]
+                out_ext = "webm" if ext == "gif" else "png"
+                out_path = Path(self.sticker_path) / f"{i}.{out_ext}"
+                backends = await self._choose_backends(file_paths, is_merge)
+
+                # 원본/병합 구성/설정이 같은 결과 파일이 캐시에 있으면 복사만 함
+                cache_key = await self._cache_key(file_paths, is_merge, backends)
+                if cache_key and await self.cache.fetch(cache_key, out_ext, out_path):
+                    await self._mark_item(i, JobManifest.ENCODED)
+                    i += len(nums)
+                    continue
                 
                 if is_merge:
                     # i + (i + 1) 이미지 병합 
                     process_method = self._process_gif_with_merge if ext == "gif" else self._process_img_with_merge                    
-                    await process_method(file_paths[0], file_paths[1], i)
+                    await process_method(file_paths[0], file_paths[1], i, backends)
                     i += 2
                 else:
                     process_method = self._process_gif if ext == "gif" else self._process_img
-                    await process_method(file_paths[0], i)
+                    await process_method(file_paths[0], i, backends[0])
                     i += 1                            
+                # 버퍼는 같은 이미지의 프레임끼리만 재사용 (이미지마다 크기가 다름)
+                self.buffers.clear()
+
+                if cache_key and out_path.exists():
+                    await self.cache.store(cache_key, out_ext, out_path)
                                                                                                      
             return True
         
@@ -71,6 +109,63 @@ class Upscaler():
             return False         
 
     
+    # 결과 파일에 영향을 주는 설정, 바뀌면 이전 캐시 파일을 사용하지 않음
+    @classmethod
+    def render_version(cls, backends: List[UpscaleBackend], fast: bool = False) -> str:
+        upscale = "+".join(backend.version() for backend in backends)
+        return (
+            f"{upscale}|png-{cls.IMG_SIZE_X}x{cls.IMG_SIZE_Y}-{cls.MAX_IMG_SIZE_KB}kb"
+            f"|{Converter.render_version(fast)}"
+        )
+
+
+    async def _cache_key(self, file_paths: List[Path], is_merge: bool, backends: List[UpscaleBackend]) -> Optional[str]:
+        if self.cache is None:
+            return None
+        layout = "merge" if is_merge else "single"
+        return await asyncio.to_thread(RenderCache.make_key, self.render_version(backends, self.fast), layout, file_paths)
+
+
+    # 이미지마다 크기/프레임 수로 백엔드 선택 (병합이면 스티커의 절반 크기 기준)
+    async def _choose_backends(self, file_paths: List[Path], is_merge: bool) -> List[UpscaleBackend]:
+        target = self.IMG_SIZE_X // 2 if is_merge else self.IMG_SIZE_X
+        backends = []
+        for file_path in file_paths:
+            shape = await asyncio.to_thread(image_shape, file_path) or (0, 0, 1)
+            backends.append(self._backend(choose_backend(self.policy, *shape, target=target)))
+        return backends
+
+
+    def _backend(self, name: str) -> UpscaleBackend:
+        if name not in self._backends:
+            self._backends[name] = create_backend(name)
+        return self._backends[name]
+
+
+    def _is_item_done(self, num: int) -> bool:
+        if self.checkpoint is None or self.checkpoint.item_stage(num) != JobManifest.ENCODED:
+            return False
+
+        ext = "webm" if self.dccon_ext[num] == "gif" else "png"
+        return (Path(self.sticker_path) / f"{num}.{ext}").exists()
+
+
+    async def _mark_item(self, num: int, stage: str, durations: Optional[list] = None) -> None:
+        if self.checkpoint is not None:
+            await self.checkpoint.mark_item(num, stage, durations)
+
+
+    # 프레임 업스케일이 끝난 GIF는 인코딩만 다시 수행
+    def _upscaled_durations(self, num: int, frame_path: Path) -> Optional[list]:
+        if self.checkpoint is None or self.checkpoint.item_stage(num) != JobManifest.UPSCALED:
+            return None
+
+        durations = self.checkpoint.item_durations(num)
+        if not durations or len(list(frame_path.glob("*.png"))) < len(durations):
+            return None
+        return durations
+
+
     # 이미지의 실제 확장자와 파일 확장자가 다른 경우 파일명 변경
     async def _check_and_rename_image(self, file_path: Path, num: int) -> None:        
         loop = asyncio.get_running_loop()                                           
@@ -90,78 +185,89 @@ class Upscaler():
         return fmt
 
 
-    # Waifu2x 모델을 사용해서 업스케일링
-    async def _waifu2x_process(self, image: np.ndarray) -> np.ndarray:        
-        loop = asyncio.get_running_loop()
-        
-        has_alpha = image.shape[2] == 4
-        if has_alpha:
-            rgb = image[:, :, :3].copy()
-            alpha = image[:, :, 3].copy()
-            
-            rgb_upscaled = await loop.run_in_executor(None, self.waifu2x.process_cv2, rgb)            
-            alpha_resized = await loop.run_in_executor(
-                None,
-                cv2.resize,
-                alpha,
-                (rgb_upscaled.shape[1], rgb_upscaled.shape[0]),
-                cv2.INTER_LINEAR
-            )
-            
-            bgra_upscaled = cv2.cvtColor(rgb_upscaled, cv2.COLOR_BGR2BGRA)
-            bgra_upscaled[:, :, 3] = alpha_resized
-            image = bgra_upscaled  
-        else:            
-            image = await loop.run_in_executor(None, self.waifu2x.process_cv2, image)
-        
-        return image
+    # 백엔드로 업스케일 후 size로 변환 (size가 None이면 업스케일 결과 그대로, 크기 변환은 ffmpeg에서)
+    # 결과 버퍼는 저장 후 self.buffers.release로 반납
+    async def _upscale_to(self, backend: UpscaleBackend, image: np.ndarray, size: Optional[tuple]) -> np.ndarray:
+        with stage_timer(backend.stage):
+            return await asyncio.to_thread(backend.process, image, size, self.buffers)
 
 
-    # 이미지 파일 처리
-    async def _process_img(self, file_path: Path, num: int) -> None:        
-        image = cv2.imdecode(np.fromfile(str(file_path), dtype=np.uint8), cv2.IMREAD_UNCHANGED)        
-        image = await self._waifu2x_process(image)            
-        image = cv2.resize(image, (self.IMG_SIZE_X, self.IMG_SIZE_Y))
+    # 프레임 여러 개를 작업 스레드 한 번에 이어서 처리 (스레드 전환 횟수만 줄임)
+    async def _upscale_frames(self, backend: UpscaleBackend, images: List[np.ndarray], size: Optional[tuple]) -> List[np.ndarray]:
+        with stage_timer(backend.stage):
+            return await asyncio.to_thread(lambda: [backend.process(image, size, self.buffers) for image in images])
 
+
+    # 이미지 파일 처리
+    async def _process_img(self, file_path: Path, num: int, backend: UpscaleBackend) -> None:        
         out_path = Path(self.sticker_path) / f"{num}.png"
-        cv2.imencode(".png", image)[1].tofile(str(out_path))               
+
+        async with CPU_POOL.token(self.dccon_id):
+            image = await asyncio.to_thread(self._read_image, file_path)
+            image = await self._upscale_to(backend, image, (self.IMG_SIZE_X, self.IMG_SIZE_Y))
+            await asyncio.to_thread(self._write_image, out_path, image)
+            self.buffers.release(image)
         
         await self._compress_img(out_path, num)      
+        await self._mark_item(num, JobManifest.ENCODED)
         
 
     # 이미지 파일 병합 처리
-    async def _process_img_with_merge(self, file_path1: Path, file_path2: Path, num: int) -> None:        
-        image1 = cv2.imdecode(np.fromfile(str(file_path1), dtype=np.uint8), cv2.IMREAD_UNCHANGED)        
-        image2 = cv2.imdecode(np.fromfile(str(file_path2), dtype=np.uint8), cv2.IMREAD_UNCHANGED)        
-
-        image1 = await self._waifu2x_process(image1)            
-        image2 = await self._waifu2x_process(image2)      
+    async def _process_img_with_merge(self, file_path1: Path, file_path2: Path, num: int, backends: List[UpscaleBackend]) -> None:        
+        out_path = Path(self.sticker_path) / f"{num}.png"
 
-        image1 = cv2.resize(image1, (self.IMG_SIZE_X // 2, self.IMG_SIZE_Y // 2))
-        image2 = cv2.resize(image2, (self.IMG_SIZE_X // 2, self.IMG_SIZE_Y // 2))
+        async with CPU_POOL.token(self.dccon_id):
+            image1 = await asyncio.to_thread(self._read_image, file_path1)
+            image2 = await asyncio.to_thread(self._read_image, file_path2)
 
-        merge_image = await self._merge_images(image1, image2)
+            image1 = await self._upscale_to(backends[0], image1, (self.IMG_SIZE_X // 2, self.IMG_SIZE_Y // 2))
+            image2 = await self._upscale_to(backends[1], image2, (self.IMG_SIZE_X // 2, self.IMG_SIZE_Y // 2))
 
-        out_path = Path(self.sticker_path) / f"{num}.png"
-        cv2.imencode(".png", merge_image)[1].tofile(str(out_path))
+            merge_image = await self._merge_images(image1, image2)
+            await asyncio.to_thread(self._write_image, out_path, merge_image)
+            self.buffers.release(image1, image2, merge_image)
         
         await self._compress_img(out_path, num)         
+        await self._mark_item(num, JobManifest.ENCODED)
+
+
+    @staticmethod
+    def _read_image(file_path: Path) -> np.ndarray:
+        return cv2.imdecode(np.fromfile(str(file_path), dtype=np.uint8), cv2.IMREAD_UNCHANGED)
 
 
-    # 이미지 병합
+    @staticmethod
+    def _write_image(out_path: Path, image: np.ndarray) -> None:
+        cv2.imencode(".png", image)[1].tofile(str(out_path))
+
+
+    # 이미지 병합, 512x256 버퍼의 왼쪽/오른쪽 절반에 바로 복사
     async def _merge_images(self, image1: np.ndarray, image2: np.ndarray) -> np.ndarray:               
-        pil_image1 = Image.fromarray(image1).convert("RGBA")
-        pil_image2 = Image.fromarray(image2).convert("RGBA")
-        
-        combined = Image.new("RGBA", (512, 256), (0, 0, 0, 0))
-        combined.paste(pil_image1, (0, 0))
-        combined.paste(pil_image2, (256, 0))
-        
-        return np.array(combined)     
+        half = self.IMG_SIZE_X // 2
+        combined = self.buffers.acquire((self.IMG_SIZE_Y // 2, self.IMG_SIZE_X, 4))
+        self._fill_rgba(combined[:, :half], image1)
+        self._fill_rgba(combined[:, half:], image2)
+        return combined
+
+
+    # 1/3/4채널 이미지를 4채널 영역에 복사, 알파가 없으면 불투명
+    @staticmethod
+    def _fill_rgba(region: np.ndarray, image: np.ndarray) -> None:
+        if image.ndim == 3 and image.shape[2] == 4:
+            region[...] = image
+            return
+        region[..., :3] = image[..., None] if image.ndim == 2 else image
+        region[..., 3] = 255
 
 
     # 이미지 크기 압축
     async def _compress_img(self, img_path: Path, num: int) -> None:    
+        async with CPU_POOL.token(self.dccon_id):
+            with stage_timer("static_compression"):
+                await asyncio.to_thread(self._compress_img_quality, img_path)
+
+
+    def _compress_img_quality(self, img_path: Path) -> None:
         quality = 98
 
         while img_path.stat().st_size / 1024 > self.MAX_IMG_SIZE_KB:                        
@@ -171,86 +277,86 @@ class Upscaler():
 
     
     # GIF 파일 처리, 프레임별로 분리 → 업스케일링 → webm 생성
-    async def _process_gif(self, file_path: Path, num: int) -> None:              
-        frame_path = Path(self.sticker_path) / f"{self.dccon_id}_{num}"
+    async def _process_gif(self, file_path: Path, num: int, backend: UpscaleBackend) -> None:              
+        frame_path = Path(self.scratch_path) / f"{self.dccon_id}_{num}"
         frame_path.mkdir(parents=True, exist_ok=True)
-                
-        frames, durations = await self._extract_frames_preserve(file_path)
-                
-        sema = asyncio.Semaphore(4)                        
-        tasks = [self._process_gif_frame_preserve(f, i, frame_path, sema) for i, f in enumerate(frames)]
-        
-        await asyncio.gather(*tasks)
-        await self._generate_webm(frame_path, num, durations)
 
-    async def _extract_frames_preserve(self, file_path: Path) -> tuple[list[Image.Image], list[int]]:
-        gif = Image.open(str(file_path))
-        
-        frames, durations = [], []
-        for i in range(gif.n_frames):
-            gif.seek(i)
-            
-            duration = gif.info.get("duration", 0)
-            durations.append(duration)
-            
-            frames.append(gif.copy().convert("RGBA"))
-        return frames, durations
-    
-    async def _process_gif_frame_preserve(self, frame: Image.Image, frame_num: int, frame_path: Path, sema: asyncio.Semaphore) -> None:
-        async with sema:
-            loop = asyncio.get_running_loop()
+        durations = self._upscaled_durations(num, frame_path)
+        if durations is None:
+            keep, durations = await self._plan_timeline([file_path])
+            frames, _ = await self._extract_frames(file_path, keep)
+                    
+            # 동시에 처리하는 프레임 수는 CPU 토큰 풀이 다른 작업과 나눠서 결정
+            size = backend.frames_per_token
+            tasks = [
+                self._process_gif_frames(backend, frames[start:start + size], start, frame_path)
+                for start in range(0, len(frames), size)
+            ]
             
-            np_img = np.array(frame.copy())
-            upscaled = await self._waifu2x_process(np_img)
-            
-            out_file = frame_path / f"{frame_num:03d}.png"
-            await loop.run_in_executor(None, lambda: Image.fromarray(upscaled).save(str(out_file)))
+            await asyncio.gather(*tasks)
+            await self._mark_item(num, JobManifest.UPSCALED, durations)
+            # 인코딩 중에는 프레임 버퍼가 필요 없음
+            del frames
+            self.buffers.clear()
 
-    # GIF 프레임 업스케일링
-    async def _process_gif_frame(self, frame: Image, frame_num: int, frame_path: Path, sema: asyncio.Semaphore) -> None:        
-        async with sema:            
-            loop = asyncio.get_running_loop()
+        await self._generate_webm(frame_path, num, durations)
 
-            np_array = await self._waifu2x_process(np.array(frame.convert("RGBA")))
-            frame_file = frame_path / f"{frame_num:03d}.png"                        
-            
-            await loop.run_in_executor(None, lambda: Image.fromarray(np_array).save(str(frame_file)))
+    # webm에 실제로 들어갈 원본 프레임 번호와 듀레이션 (병합이면 두 GIF의 평균 듀레이션 기준)
+    # 3초 맞춤 + 출력 fps에서 사라질 프레임은 추출/업스케일하지 않음
+    async def _plan_timeline(self, file_paths: List[Path]) -> tuple[list[int], list[float]]:
+        sources = [await asyncio.to_thread(read_durations, file_path) for file_path in file_paths]
+        count = min(len(durations) for durations in sources)
+        durations = [sum(durations[i] for durations in sources) / len(sources) for i in range(count)]
+        return Converter.plan_timeline(durations)
+
+    # GIF 프레임 추출, disposal/투명색을 적용해 (프레임 수, 높이, 너비, 4) RGBA 버퍼 하나에 합성
+    async def _extract_frames(self, file_path: Path, keep: Optional[List[int]] = None) -> tuple[np.ndarray, list[int]]:
+        with stage_timer("frame_extract"):
+            return await asyncio.to_thread(extract_frames, file_path, keep)
+
+    # 백엔드의 frames_per_token만큼 프레임을 묶어서 CPU 토큰 하나로 처리
+    async def _process_gif_frames(self, backend: UpscaleBackend, frames: np.ndarray, first_num: int, frame_path: Path) -> None:
+        async with CPU_POOL.token(self.dccon_id):
+            upscaled = await self._upscale_frames(backend, list(frames), None)
+
+            def save():
+                for offset, image in enumerate(upscaled):
+                    Image.fromarray(image).save(str(frame_path / f"{first_num + offset:03d}.png"))
+            await asyncio.to_thread(save)
+            self.buffers.release(*upscaled)
 
     # GIF 파일 병합 처리, 프레임별로 분리 → 업스케일링 → webm 생성
-    async def _process_gif_with_merge(self, file_path1: Path, file_path2: Path, num: int) -> None:                 
-        frame_path = Path(self.sticker_path) / f"{self.dccon_id}_{num}"
+    async def _process_gif_with_merge(self, file_path1: Path, file_path2: Path, num: int, backends: List[UpscaleBackend]) -> None:                 
+        frame_path = Path(self.scratch_path) / f"{self.dccon_id}_{num}"
         frame_path.mkdir(parents=True, exist_ok=True)                            
+
+        avg_durations = self._upscaled_durations(num, frame_path)
+        if avg_durations is None:
+            keep, avg_durations = await self._plan_timeline([file_path1, file_path2])
+            frames1, _ = await self._extract_frames(file_path1, keep)
+            frames2, _ = await self._extract_frames(file_path2, keep)
                 
-        frames1, durations1 = await self._extract_frames_preserve(file_path1)
-        frames2, durations2 = await self._extract_frames_preserve(file_path2)
+            tasks = [self._merge_and_save_frame(frames1[i], frames2[i], i, frame_path, backends) for i in range(len(keep))]        
+
+            await asyncio.gather(*tasks)        
             
-        max_len = min(len(frames1), len(frames2))                
-        sema = asyncio.Semaphore(1)
-        tasks = [self._merge_and_save_frame(frames1[i], frames2[i], i, frame_path, sema) for i in range(max_len)]        
+            await self._mark_item(num, JobManifest.UPSCALED, avg_durations)
+            del frames1, frames2
+            self.buffers.clear()
 
-        await asyncio.gather(*tasks)        
-        
-        avg_durations = [(durations1[i] + durations2[i]) / 2 for i in range(max_len)]
         await self._generate_webm(frame_path, num, avg_durations, is_merge=True)
 
 
     # GIF 프레임 업스케일링 → 병합
-    async def _merge_and_save_frame(self, frame1: Image.Image, frame2: Image.Image, frame_num: int, frame_path: Path, sema: asyncio.Semaphore) -> None:
-        async with sema:
-            loop = asyncio.get_running_loop()
-
-            np1 = await self._waifu2x_process(np.array(frame1).copy())
-            np1 = cv2.resize(np1, (256, 256), interpolation=cv2.INTER_LINEAR)
-
-            np2 = await self._waifu2x_process(np.array(frame2).copy())
-            np2 = cv2.resize(np2, (256, 256), interpolation=cv2.INTER_LINEAR)
-
-            combined = Image.new("RGBA", (512, 256), (0, 0, 0, 0))
-            combined.paste(Image.fromarray(np1), (0, 0))
-            combined.paste(Image.fromarray(np2), (256, 0))
+    async def _merge_and_save_frame(self, frame1: np.ndarray, frame2: np.ndarray, frame_num: int, frame_path: Path, backends: List[UpscaleBackend]) -> None:
+        async with CPU_POOL.token(self.dccon_id):
+            np1 = await self._upscale_to(backends[0], frame1, (256, 256))
+            np2 = await self._upscale_to(backends[1], frame2, (256, 256))
+            combined = await self._merge_images(np1, np2)
      
             out_path = frame_path / f"{frame_num:03d}.png"
-            await loop.run_in_executor(None, lambda: combined.save(str(out_path)))        
+            await asyncio.to_thread(lambda: Image.fromarray(combined).save(str(out_path)))
+            self.buffers.release(np1, np2, combined)
     
     # webm 생성
     async def _generate_webm(self, frame_path: Path, num: int, frame_duration: list, is_merge: bool = False) -> None:                                              
@@ -263,78 +369,13 @@ class Upscaler():
             out_path=str(Path(self.sticker_path) / f"{num}.webm"),
             frame_durations=frame_duration,           
             x_size=x_size,
-            y_size=y_size     
+            y_size=y_size,
+            fast=self.fast,
+            planned=True
         )
         await converter.convert_video()
 
-    # composition 방식이 깨지는 GIF인지 판단하여 independent 방식으로 처리할지 여부를 리턴
-    # async def _needs_independent_rendering(self, file_path: Path, pixel_diff_threshold: float = 0.01, sample_limit: int = 5) -> bool:        
-    #     gif = Image.open(str(file_path))
-    #     original_frames = []
-    #     composited_frames = []
-
-    #     # 원본 독립 프레임 추출
-    #     for frame in ImageSequence.Iterator(gif):
-    #         original_frames.append(frame.convert("RGBA"))
-    #     check_count = min(sample_limit, len(original_frames))
-
-    #     # composition 방식 프레임 생성
-    #     gif.seek(0)
-    #     last_frame = gif.convert("RGBA")
-    #     for frame in ImageSequence.Iterator(gif):
-    #         new_frame = Image.new("RGBA", gif.size)
-    #         new_frame.paste(last_frame)
-    #         current = frame.convert("RGBA")
-    #         new_frame.paste(current, (0, 0), current)
-    #         composited_frames.append(new_frame.copy())
-    #         last_frame = new_frame
-
-    #     # 픽셀 단위 비교
-    #     for i in range(check_count):
-    #         orig = np.array(original_frames[i])
-    #         comp = np.array(composited_frames[i])
-    #         diff = np.abs(orig - comp)
-    #         changed_pixels = np.sum(np.any(diff > 3, axis=-1))            
-    #         total_pixels = diff.shape[0] * diff.shape[1]
-    #         ratio = changed_pixels / total_pixels
-            
-    #         if ratio > pixel_diff_threshold:
-    #             return True
-
-    #     return False    
-
-    # async def _extract_frames_independent(self, gif_path: Path) -> tuple[list[Image.Image], list[int]]:
-    #     gif = Image.open(str(gif_path))
-    #     frames = []
-    #     durations = []
-
-    #     for frame_index in range(gif.n_frames):
-    #         gif.seek(frame_index)
-    #         duration = gif.info.get("duration", 0)
-    #         durations.append(duration)
-    #         frame = gif.copy().convert("RGBA")
-    #         frames.append(frame)
-
-    #     return frames, durations
-    
-    # async def _extract_frames_composited(self, gif_path: Path) -> tuple[list[Image.Image], list[int]]:
-    #     gif = Image.open(str(gif_path))        
-    #     last_frame = gif.convert("RGBA")
-
-    #     frames = []
-    #     durations = []
-
-    #     for frame in ImageSequence.Iterator(gif):
-    #         new_frame = Image.new("RGBA", gif.size)
-            
-    #         new_frame.paste(last_frame)
-            
-    #         current = frame.convert("RGBA")
-    #         new_frame.paste(current, (0, 0), current)
-
-    #         frames.append(new_frame.copy())
-    #         durations.append(frame.info.get("duration", 0))
-
-    #         last_frame = new_frame
-
-    #     return frames, durations            
\ No newline at end of file
+        if (Path(self.sticker_path) / f"{num}.webm").exists():
+            await self._mark_item(num, JobManifest.ENCODED)
+            # 인코딩이 끝난 프레임은 바로 정리
+            await asyncio.to_thread(shutil.rmtree, frame_path, True)
@@ -0,0 +1,81 @@
+import hmac
+from typing import Optional
+
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+
+from elitemikobot.logger import Logger
+from elitemikobot.metrics import REGISTRY, Counter
+
+
+WEBHOOK_UPDATES = REGISTRY.register(Counter(
+    "elitemikobot_webhook_updates_total",
+    "Number of webhook requests by result",
+    labels=("result",)
+))
+
+
+# 텔레그램 webhook 수신 서버, 리버스 프록시 뒤에서 로컬 주소로 실행
+# X-Telegram-Bot-Api-Secret-Token 헤더가 secret_token과 같은 요청만 받아서 application.update_queue에 넣음
+class WebhookServer:
+    SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+    MAX_BODY_BYTES = 1024 * 1024
+
+    def __init__(self, application: Application, host: str, port: int, path: str, secret_token: str) -> None:
+        self.application = application
+        self.host = host
+        self.port = port
+        self.path = path
+        self.secret_token = secret_token
+        self.logger = Logger(name="Webhook_Log")
+        self._runner: Optional[web.AppRunner] = None
+
+
+    async def _handle_update(self, request: web.Request) -> web.Response:
+        secret = request.headers.get(self.SECRET_HEADER, "")
+        if not hmac.compare_digest(secret.encode(), self.secret_token.encode()):
+            WEBHOOK_UPDATES.inc(result="forbidden")
+            self.logger.warning(
+                action="webhook update",
+                user=" ",
+                data={"remote": request.remote, "status": "forbidden"},
+                message="Rejected webhook request with a wrong secret token"
+            )
+            return web.Response(status=403)
+
+        try:
+            update = Update.de_json(await request.json(), self.application.bot)
+            if update is None:
+                raise ValueError("empty update")
+        except (ValueError, TypeError, KeyError) as e:
+            WEBHOOK_UPDATES.inc(result="invalid")
+            self.logger.warning(
+                action="webhook update",
+                user=" ",
+                data={"remote": request.remote, "status": "invalid"},
+                message=f"{e}"
+            )
+            return web.Response(status=400)
+
+        await self.application.update_queue.put(update)
+        WEBHOOK_UPDATES.inc(result="ok")
+        return web.Response(status=200)
+
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=self.MAX_BODY_BYTES)
+        app.router.add_post(self.path, self._handle_update)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # port가 0이면 실제로 열린 포트
+        self.port = self._runner.addresses[0][1]
+
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
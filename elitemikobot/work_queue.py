@@ -0,0 +1,363 @@
+import asyncio
+import json
+import shutil
+import sqlite3
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+
+@dataclass
+class WorkJob:
+    id: str
+    payload: dict
+    status: str
+    worker_id: Optional[str] = None
+    result: Optional[dict] = None
+
+
+@dataclass
+class WorkEvent:
+    seq: int
+    job_id: str
+    stage: str
+    payload: dict
+
+
+# 봇 프로세스와 처리 워커 사이의 공유 작업 큐
+# 봇은 작업을 넣고 이벤트/결과 파일을 받아가며, 워커는 작업을 가져가 단계별 결과를 올림
+class WorkQueueBackend(ABC):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    @abstractmethod
+    async def put_job(self, payload: dict) -> str: ...
+
+    # 대기 중인 작업 하나를 가져감, 없으면 None
+    @abstractmethod
+    async def claim_job(self, worker_id: str) -> Optional[WorkJob]: ...
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[WorkJob]: ...
+
+    @abstractmethod
+    async def heartbeat(self, job_id: str, worker_id: str) -> None: ...
+
+    @abstractmethod
+    async def finish_job(self, job_id: str, status: str, result: Optional[dict] = None) -> None: ...
+
+    @abstractmethod
+    async def post_event(self, job_id: str, stage: str, payload: Optional[dict] = None) -> None: ...
+
+    @abstractmethod
+    async def get_events(self, job_id: str, after_seq: int = 0) -> List[WorkEvent]: ...
+
+    @abstractmethod
+    async def put_file(self, job_id: str, name: str, data: bytes) -> None: ...
+
+    @abstractmethod
+    async def get_files(self, job_id: str) -> Dict[str, bytes]: ...
+
+    @abstractmethod
+    async def delete_job(self, job_id: str) -> None: ...
+
+    # 하트비트가 끊긴(워커가 죽은) 작업을 다시 대기 상태로
+    @abstractmethod
+    async def requeue_stale(self, timeout_sec: float) -> int: ...
+
+
+    async def close(self) -> None:
+        pass
+
+
+# SQLite 파일 기반 백엔드, 같은 호스트의 여러 프로세스가 함께 사용 (네트워크 파일시스템에서는 쓰지 않음)
+# 다른 서버의 봇/워커는 이 백엔드를 감싼 작업 큐 서버(work_queue_server)에 HttpWorkQueue로 접속
+# 결과 파일은 DB 밖의 files_path/{job_id}/{name}에 저장
+class SqliteWorkQueue(WorkQueueBackend):
+    def __init__(self, db_path: Path, files_path: Optional[Path] = None) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.files_path = Path(files_path) if files_path is not None else self.db_path.with_name(f"{self.db_path.stem}_files")
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, payload TEXT NOT NULL, status TEXT NOT NULL,"
+                " worker_id TEXT, result TEXT, created_at REAL NOT NULL, heartbeat_at REAL);"
+                "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);"
+                "CREATE TABLE IF NOT EXISTS events ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT NOT NULL, stage TEXT NOT NULL,"
+                " payload TEXT NOT NULL, created_at REAL NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS events_job ON events (job_id, seq);"
+            )
+
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+
+
+    # 호출마다 연결을 새로 열어 스레드/프로세스 간 공유 문제를 피함
+    async def _run(self, func, *args):
+        def run():
+            conn = self._connect()
+            try:
+                return func(conn, *args)
+            finally:
+                conn.close()
+        return await asyncio.to_thread(run)
+
+
+    @staticmethod
+    def _to_job(row) -> WorkJob:
+        return WorkJob(
+            id=row[0],
+            payload=json.loads(row[1]),
+            status=row[2],
+            worker_id=row[3],
+            result=json.loads(row[4]) if row[4] else None
+        )
+
+
+    async def put_job(self, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+
+        def put(conn):
+            conn.execute(
+                "INSERT INTO jobs (id, payload, status, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, json.dumps(payload, ensure_ascii=False), self.QUEUED, time.time())
+            )
+        await self._run(put)
+        return job_id
+
+
+    async def claim_job(self, worker_id: str) -> Optional[WorkJob]:
+        def claim(conn):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id, payload, status, worker_id, result FROM jobs "
+                    "WHERE status = ? ORDER BY created_at LIMIT 1",
+                    (self.QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_id = ?, heartbeat_at = ? WHERE id = ?",
+                    (self.RUNNING, worker_id, time.time(), row[0])
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            job = self._to_job(row)
+            job.status, job.worker_id = self.RUNNING, worker_id
+            return job
+        return await self._run(claim)
+
+
+    async def get_job(self, job_id: str) -> Optional[WorkJob]:
+        def get(conn):
+            row = conn.execute(
+                "SELECT id, payload, status, worker_id, result FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            return self._to_job(row) if row else None
+        return await self._run(get)
+
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> None:
+        def beat(conn):
+            conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND worker_id = ?",
+                (time.time(), job_id, worker_id)
+            )
+        await self._run(beat)
+
+
+    async def finish_job(self, job_id: str, status: str, result: Optional[dict] = None) -> None:
+        def finish(conn):
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ? WHERE id = ?",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None, job_id)
+            )
+        await self._run(finish)
+
+
+    async def post_event(self, job_id: str, stage: str, payload: Optional[dict] = None) -> None:
+        def post(conn):
+            conn.execute(
+                "INSERT INTO events (job_id, stage, payload, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, stage, json.dumps(payload or {}, ensure_ascii=False), time.time())
+            )
+        await self._run(post)
+
+
+    async def get_events(self, job_id: str, after_seq: int = 0) -> List[WorkEvent]:
+        def get(conn):
+            rows = conn.execute(
+                "SELECT seq, job_id, stage, payload FROM events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after_seq)
+            ).fetchall()
+            return [WorkEvent(seq=r[0], job_id=r[1], stage=r[2], payload=json.loads(r[3])) for r in rows]
+        return await self._run(get)
+
+
+    # 작업 아이디/파일 이름은 폴더 밖을 가리키지 못하도록 마지막 경로 요소만 사용
+    def _file_dir(self, job_id: str) -> Path:
+        name = Path(job_id).name
+        if name in ("", ".", ".."):
+            raise ValueError(f"Invalid job id: {job_id}")
+        return self.files_path / name
+
+
+    async def put_file(self, job_id: str, name: str, data: bytes) -> None:
+        job_dir = self._file_dir(job_id)
+        file_name = Path(name).name
+        if file_name in ("", ".", ".."):
+            raise ValueError(f"Invalid file name: {name}")
+
+        # 임시 파일에 쓴 뒤 이름을 바꿔서 읽는 쪽이 쓰다 만 파일을 보지 않도록 함
+        def put():
+            job_dir.mkdir(parents=True, exist_ok=True)
+            temp_path = job_dir / f".{file_name}.{uuid.uuid4().hex}"
+            temp_path.write_bytes(data)
+            temp_path.replace(job_dir / file_name)
+        await asyncio.to_thread(put)
+
+
+    async def get_files(self, job_id: str) -> Dict[str, bytes]:
+        job_dir = self._file_dir(job_id)
+
+        def get():
+            if not job_dir.is_dir():
+                return {}
+            return {path.name: path.read_bytes() for path in sorted(job_dir.iterdir()) if not path.name.startswith(".")}
+        return await asyncio.to_thread(get)
+
+
+    async def delete_job(self, job_id: str) -> None:
+        def delete(conn):
+            conn.execute("DELETE FROM events WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+        await self._run(delete)
+        await asyncio.to_thread(shutil.rmtree, self._file_dir(job_id), True)
+
+
+    async def requeue_stale(self, timeout_sec: float) -> int:
+        def requeue(conn):
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL WHERE status = ? AND heartbeat_at < ?",
+                (self.QUEUED, self.RUNNING, time.time() - timeout_sec)
+            )
+            return cursor.rowcount
+        return await self._run(requeue)
+
+
+# 작업 큐 서버(python -m elitemikobot.work_queue_server)에 HTTP로 접속하는 백엔드
+# 요청마다 X-Work-Queue-Secret 헤더로 서버와 같은 secret을 보냄, 없는 작업은 서버가 404로 응답
+class HttpWorkQueue(WorkQueueBackend):
+    SECRET_HEADER = "X-Work-Queue-Secret"
+
+    def __init__(self, base_url: str, secret: str = "", timeout_sec: float = 30.0) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.secret = secret
+        self.timeout = aiohttp.ClientTimeout(total=timeout_sec)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+
+    # 세션은 첫 요청에서 생성 (open_work_queue는 이벤트 루프 밖에서도 호출됨), read: 응답 본문 읽는 방법 (기본 JSON)
+    async def _request(self, method: str, path: str, read: Optional[Callable[[aiohttp.ClientResponse], Awaitable[Any]]] = None, **kwargs) -> Any:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout, headers={self.SECRET_HEADER: self.secret})
+
+        async with self._session.request(method, f"{self.base_url}{path}", **kwargs) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            return await (read or aiohttp.ClientResponse.json)(response)
+
+
+    @staticmethod
+    async def _read_files(response: aiohttp.ClientResponse) -> Dict[str, bytes]:
+        files = {}
+        reader = aiohttp.MultipartReader.from_response(response)
+        while (part := await reader.next()) is not None:
+            files[part.filename] = bytes(await part.read())
+        return files
+
+
+    @staticmethod
+    def _to_job(data: Optional[dict]) -> Optional[WorkJob]:
+        return WorkJob(**data) if data else None
+
+
+    async def put_job(self, payload: dict) -> str:
+        return (await self._request("POST", "/jobs", json={"payload": payload}))["id"]
+
+
+    async def claim_job(self, worker_id: str) -> Optional[WorkJob]:
+        return self._to_job(await self._request("POST", "/jobs/claim", json={"worker_id": worker_id}))
+
+
+    async def get_job(self, job_id: str) -> Optional[WorkJob]:
+        return self._to_job(await self._request("GET", f"/jobs/{job_id}"))
+
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> None:
+        await self._request("POST", f"/jobs/{job_id}/heartbeat", json={"worker_id": worker_id})
+
+
+    async def finish_job(self, job_id: str, status: str, result: Optional[dict] = None) -> None:
+        await self._request("POST", f"/jobs/{job_id}/finish", json={"status": status, "result": result})
+
+
+    async def post_event(self, job_id: str, stage: str, payload: Optional[dict] = None) -> None:
+        await self._request("POST", f"/jobs/{job_id}/events", json={"stage": stage, "payload": payload})
+
+
+    async def get_events(self, job_id: str, after_seq: int = 0) -> List[WorkEvent]:
+        events = await self._request("GET", f"/jobs/{job_id}/events", params={"after": after_seq})
+        return [WorkEvent(**event) for event in events or []]
+
+
+    async def put_file(self, job_id: str, name: str, data: bytes) -> None:
+        await self._request("PUT", f"/jobs/{job_id}/files/{name}", data=data)
+
+
+    async def get_files(self, job_id: str) -> Dict[str, bytes]:
+        return await self._request("GET", f"/jobs/{job_id}/files", read=self._read_files) or {}
+
+
+    async def delete_job(self, job_id: str) -> None:
+        await self._request("DELETE", f"/jobs/{job_id}")
+
+
+    async def requeue_stale(self, timeout_sec: float) -> int:
+        return (await self._request("POST", "/jobs/requeue_stale", json={"timeout_sec": timeout_sec}))["count"]
+
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+
+# 큐 주소로 백엔드 생성
+# ex) sqlite:///data/work_queue.sqlite3 (같은 호스트), http://queue-host:8790 (작업 큐 서버)
+def open_work_queue(url: str, secret: str = "") -> WorkQueueBackend:
+    if url.startswith("sqlite:///"):
+        return SqliteWorkQueue(Path(url[len("sqlite:///"):]))
+    if url.startswith(("http://", "https://")):
+        return HttpWorkQueue(url, secret)
+
+    raise ValueError(f"Unsupported work queue backend: {url}")
@@ -0,0 +1,178 @@
+import asyncio
+import hmac
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import MultipartWriter, web
+from dotenv import load_dotenv
+
+sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from elitemikobot.logger import Logger
+from elitemikobot.work_queue import HttpWorkQueue, SqliteWorkQueue, WorkQueueBackend
+
+
+class WorkQueueServerConfig:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+
+    ENV_FILE = Path(os.getenv("ENV_FILE", BASE_DIR / "config.env"))
+
+    @classmethod
+    def load_config(cls):
+        load_dotenv(cls.ENV_FILE)
+        cls.DB_PATH = Path(os.getenv("WORK_QUEUE_DB", cls.BASE_DIR / "work_queue.sqlite3"))
+        cls.FILES_PATH = Path(os.getenv("WORK_QUEUE_FILES_PATH", cls.DB_PATH.with_name(f"{cls.DB_PATH.stem}_files")))
+        cls.HOST = os.getenv("WORK_QUEUE_HOST", "127.0.0.1")
+        cls.PORT = int(os.getenv("WORK_QUEUE_PORT", 8790))
+        cls.SECRET = os.getenv("WORK_QUEUE_SECRET", "")
+
+
+# 공유 작업 큐 서버, 봇/워커가 다른 서버에 있을 때 HttpWorkQueue로 접속
+# 큐 DB와 결과 파일은 이 서버의 로컬 디스크에만 두고, X-Work-Queue-Secret 헤더가 secret과 같은 요청만 처리
+# python -m elitemikobot.work_queue_server
+class WorkQueueServer:
+    MAX_BODY_BYTES = 16 * 1024 * 1024
+    JOB_ID = "{job_id:[0-9a-f]{32}}"
+
+    def __init__(self, queue: WorkQueueBackend, host: str, port: int, secret: str = "") -> None:
+        self.queue = queue
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.logger = Logger(name="WorkQueueServer_Log")
+        self._runner: Optional[web.AppRunner] = None
+
+
+    @web.middleware
+    async def _check_secret(self, request: web.Request, handler) -> web.StreamResponse:
+        secret = request.headers.get(HttpWorkQueue.SECRET_HEADER, "")
+        if not hmac.compare_digest(secret.encode(), self.secret.encode()):
+            self.logger.warning(
+                action="work queue request",
+                user=" ",
+                data={"remote": request.remote, "path": request.path, "status": "forbidden"},
+                message="Rejected work queue request with a wrong secret"
+            )
+            return web.Response(status=403)
+
+        try:
+            return await handler(request)
+        except (ValueError, TypeError, KeyError) as e:
+            return web.Response(status=400, text=f"{e}")
+
+
+    async def _put_job(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({"id": await self.queue.put_job(body["payload"])})
+
+
+    async def _claim_job(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        job = await self.queue.claim_job(body["worker_id"])
+        return web.json_response(asdict(job) if job else None)
+
+
+    async def _get_job(self, request: web.Request) -> web.Response:
+        job = await self.queue.get_job(request.match_info["job_id"])
+        if job is None:
+            return web.Response(status=404)
+        return web.json_response(asdict(job))
+
+
+    async def _heartbeat(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.queue.heartbeat(request.match_info["job_id"], body["worker_id"])
+        return web.json_response({})
+
+
+    async def _finish_job(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.queue.finish_job(request.match_info["job_id"], body["status"], body.get("result"))
+        return web.json_response({})
+
+
+    async def _post_event(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.queue.post_event(request.match_info["job_id"], body["stage"], body.get("payload"))
+        return web.json_response({})
+
+
+    async def _get_events(self, request: web.Request) -> web.Response:
+        events = await self.queue.get_events(request.match_info["job_id"], int(request.query.get("after", 0)))
+        return web.json_response([asdict(event) for event in events])
+
+
+    async def _put_file(self, request: web.Request) -> web.Response:
+        await self.queue.put_file(request.match_info["job_id"], request.match_info["name"], await request.read())
+        return web.json_response({})
+
+
+    # 작업의 결과 파일 전체를 multipart 응답 하나로 보냄
+    async def _get_files(self, request: web.Request) -> web.Response:
+        files = await self.queue.get_files(request.match_info["job_id"])
+        with MultipartWriter("mixed") as writer:
+            for name, data in files.items():
+                part = writer.append(data, {"Content-Type": "application/octet-stream"})
+                part.set_content_disposition("attachment", filename=name)
+        return web.Response(body=writer)
+
+
+    async def _delete_job(self, request: web.Request) -> web.Response:
+        await self.queue.delete_job(request.match_info["job_id"])
+        return web.json_response({})
+
+
+    async def _requeue_stale(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return web.json_response({"count": await self.queue.requeue_stale(float(body["timeout_sec"]))})
+
+
+    async def start(self) -> None:
+        app = web.Application(client_max_size=self.MAX_BODY_BYTES, middlewares=[self._check_secret])
+        app.router.add_post("/jobs", self._put_job)
+        app.router.add_post("/jobs/claim", self._claim_job)
+        app.router.add_post("/jobs/requeue_stale", self._requeue_stale)
+        app.router.add_get(f"/jobs/{self.JOB_ID}", self._get_job)
+        app.router.add_delete(f"/jobs/{self.JOB_ID}", self._delete_job)
+        app.router.add_post(f"/jobs/{self.JOB_ID}/heartbeat", self._heartbeat)
+        app.router.add_post(f"/jobs/{self.JOB_ID}/finish", self._finish_job)
+        app.router.add_post(f"/jobs/{self.JOB_ID}/events", self._post_event)
+        app.router.add_get(f"/jobs/{self.JOB_ID}/events", self._get_events)
+        app.router.add_get(f"/jobs/{self.JOB_ID}/files", self._get_files)
+        app.router.add_put(f"/jobs/{self.JOB_ID}/files/{{name}}", self._put_file)
+
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        # port가 0이면 실제로 열린 포트
+        self.port = self._runner.addresses[0][1]
+
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+    async def run(self) -> None:
+        await self.start()
+        self.logger.info(
+            action="start work queue server",
+            user=" ",
+            data={"host": self.host, "port": self.port},
+            message="Start EliteMikoBot work queue server"
+        )
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+
+# python -m elitemikobot.work_queue_server
+if __name__ == "__main__":
+    WorkQueueServerConfig.load_config()
+    queue = SqliteWorkQueue(WorkQueueServerConfig.DB_PATH, WorkQueueServerConfig.FILES_PATH)
+    server = WorkQueueServer(queue, WorkQueueServerConfig.HOST, WorkQueueServerConfig.PORT, WorkQueueServerConfig.SECRET)
+    asyncio.run(server.run())
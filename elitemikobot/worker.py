@@ -0,0 +1,229 @@
+import asyncio
+import os
+import shutil
+import socket
+import sys
+import uuid
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+from dotenv import load_dotenv
+
+sys.path.append(Path(__file__).resolve().parent.parent.as_posix())
+from elitemikobot.cpu_pool import CPU_POOL
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.logger import Logger
+from elitemikobot.metrics import MetricsServer
+from elitemikobot.render_cache import open_render_cache
+from elitemikobot.sticker_data import StickerData
+from elitemikobot.sticker_processor import StickerProcessor
+from elitemikobot.upscale_backend import UpscaleConfig
+from elitemikobot.work_queue import WorkJob, WorkQueueBackend, open_work_queue
+from elitemikobot.workspace import WorkspaceManager
+
+
+class WorkerConfig:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+
+    ENV_FILE = Path(os.getenv("ENV_FILE", BASE_DIR / "config.env"))
+
+    POLL_INTERVAL = 1.0      # 초
+    HEARTBEAT_INTERVAL = 10   # 초
+    STALE_TIMEOUT = 60   # 하트비트가 끊긴 지 60초가 지나면 다른 워커가 가져감
+    SCRATCH_GC_INTERVAL = 60   # 초
+    SCRATCH_TTL = 3600   # 초
+
+    @classmethod
+    def load_config(cls):
+        load_dotenv(cls.ENV_FILE)
+        cls.WORK_PATH = Path(os.getenv("WORKER_PATH", cls.BASE_DIR / "worker"))
+        cls.IMG_PATH = cls.WORK_PATH / "img"
+        cls.STICKER_IMG_PATH = cls.WORK_PATH / "sticker"
+        cls.JOB_PATH = cls.WORK_PATH / "jobs"
+        cls.SCRATCH_PATH = Path(os.getenv("SCRATCH_PATH", cls.WORK_PATH / "scratch"))
+        cls.SCRATCH_QUOTA_MB = int(os.getenv("SCRATCH_QUOTA_MB", 2048))
+        cls.RENDER_CACHE_PATH = Path(os.getenv("RENDER_CACHE_PATH", cls.WORK_PATH / "render_cache"))
+        cls.RENDER_CACHE_QUOTA_MB = int(os.getenv("RENDER_CACHE_QUOTA_MB", 1024))
+        cls.WORK_QUEUE_URL = os.getenv("WORK_QUEUE_URL", f"sqlite:///{cls.BASE_DIR / 'work_queue.sqlite3'}")
+        cls.WORK_QUEUE_SECRET = os.getenv("WORK_QUEUE_SECRET", "")
+        cls.WORKER_ID = os.getenv("WORKER_ID", f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}")
+        cls.WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", 1))
+        cls.METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+        cls.METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+        CPU_POOL.configure(int(os.getenv("CPU_TOKENS", 0)))
+        UpscaleConfig.load_config()
+
+
+# 처리 중 단계 결과를 체크포인트 저장과 함께 큐에도 올림
+class ReportingManifest(JobManifest):
+    queue: Optional[WorkQueueBackend] = None
+    job_id: str = ""
+
+    async def mark_item(self, num: int, stage: str, durations: Optional[list] = None) -> None:
+        await super().mark_item(num, stage, durations)
+        await self.queue.post_event(self.job_id, stage, {"num": num})
+
+
+# 공유 작업 큐에서 작업을 가져와 다운로드/업스케일/인코딩 후 결과 파일을 큐에 올림
+# python -m elitemikobot.worker
+class Worker:
+    def __init__(self, queue: WorkQueueBackend, worker_id: str) -> None:
+        self.queue = queue
+        self.worker_id = worker_id
+        self.logger = Logger(name="Worker_Log")
+        self.workspaces = WorkspaceManager(
+            root=WorkerConfig.SCRATCH_PATH,
+            quota_mb=WorkerConfig.SCRATCH_QUOTA_MB,
+            ttl_sec=WorkerConfig.SCRATCH_TTL
+        )
+        self.processor = StickerProcessor(
+            img_path=WorkerConfig.IMG_PATH,
+            sticker_path=WorkerConfig.STICKER_IMG_PATH,
+            workspaces=self.workspaces,
+            cache=open_render_cache(WorkerConfig.RENDER_CACHE_PATH, WorkerConfig.RENDER_CACHE_QUOTA_MB)
+        )
+
+
+    async def run(self) -> None:
+        self.logger.info(
+            action="start worker",
+            user=self.worker_id,
+            data={"queue": WorkerConfig.WORK_QUEUE_URL, "concurrency": WorkerConfig.WORKER_CONCURRENCY},
+            message="Start EliteMikoBot worker"
+        )
+        if WorkerConfig.METRICS_PORT:
+            await MetricsServer(WorkerConfig.METRICS_HOST, WorkerConfig.METRICS_PORT).start()
+
+        await asyncio.gather(
+            self.workspaces.run_gc_loop(WorkerConfig.SCRATCH_GC_INTERVAL),
+            *[self._run_loop() for _ in range(WorkerConfig.WORKER_CONCURRENCY)]
+        )
+
+
+    # 작업 큐 서버에 연결할 수 없으면 잠시 뒤 다시 시도
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self.queue.requeue_stale(WorkerConfig.STALE_TIMEOUT)
+                job = await self.queue.claim_job(self.worker_id)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.warning(
+                    action="claim job",
+                    user=self.worker_id,
+                    data={"queue": WorkerConfig.WORK_QUEUE_URL, "status": "unreachable"},
+                    message=f"{e}"
+                )
+                job = None
+
+            if job is None:
+                await asyncio.sleep(WorkerConfig.POLL_INTERVAL)
+                continue
+
+            await self._run_job(job)
+
+
+    async def _run_job(self, job: WorkJob) -> None:
+        sticker_data = StickerData.from_dict(job.payload["sticker"])
+        user = f"{sticker_data.user_name}({sticker_data.user_id})"
+
+        process_task = asyncio.create_task(self._process(job, sticker_data))
+        heartbeat_task = asyncio.create_task(self._heartbeat(job.id, process_task))
+
+        try:
+            dccon_data = await process_task
+
+            if dccon_data is None:
+                await self.queue.finish_job(job.id, WorkQueueBackend.FAILED)
+                return
+
+            await self._upload_files(job.id, sticker_data)
+            await self.queue.finish_job(job.id, WorkQueueBackend.DONE, {"dccon": asdict(dccon_data)})
+            self.logger.info(
+                action="worker job",
+                user=user,
+                data={"dccon_id": sticker_data.id, "job_id": job.id, "status": "complete"},
+                message="Worker job completed"
+            )
+
+        except asyncio.CancelledError:
+            self.logger.info(
+                action="worker job",
+                user=user,
+                data={"dccon_id": sticker_data.id, "job_id": job.id, "status": "cancel"},
+                message="Job cancelled by bot"
+            )
+            await self.queue.delete_job(job.id)
+
+        except Exception as e:
+            self.logger.error(
+                action="Exception worker job",
+                user=user,
+                data={"dccon_id": sticker_data.id, "job_id": job.id, "status": "except"},
+                message=f"{e}"
+            )
+            await self.queue.finish_job(job.id, WorkQueueBackend.FAILED)
+
+        finally:
+            heartbeat_task.cancel()
+            await self._delete_files(sticker_data.id)
+
+
+    async def _process(self, job: WorkJob, sticker_data: StickerData):
+        manifest = ReportingManifest.create(WorkerConfig.JOB_PATH, 0, sticker_data)
+        manifest.queue = self.queue
+        manifest.job_id = job.id
+
+        dccon_data = await self.processor.process(sticker_data, manifest)
+        if dccon_data is not None:
+            await self.queue.post_event(job.id, "processed", {"count": dccon_data.count})
+        return dccon_data
+
+
+    # 하트비트 갱신, 봇이 작업을 취소했으면 처리 중단
+    # 작업 큐 서버에 잠깐 연결할 수 없어도 처리는 계속함 (STALE_TIMEOUT 안에 다시 연결되면 작업 유지)
+    async def _heartbeat(self, job_id: str, process_task: asyncio.Task) -> None:
+        while not process_task.done():
+            try:
+                await self.queue.heartbeat(job_id, self.worker_id)
+                job = await self.queue.get_job(job_id)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.warning(
+                    action="heartbeat",
+                    user=self.worker_id,
+                    data={"job_id": job_id, "status": "unreachable"},
+                    message=f"{e}"
+                )
+            else:
+                if job is None or job.status == WorkQueueBackend.CANCELLED:
+                    process_task.cancel()
+                    return
+
+            await asyncio.sleep(WorkerConfig.HEARTBEAT_INTERVAL)
+
+
+    async def _upload_files(self, job_id: str, sticker_data: StickerData) -> None:
+        out_dir = WorkerConfig.STICKER_IMG_PATH / str(sticker_data.id)
+
+        for num in sticker_data.sticker_nums():
+            file_path = out_dir / sticker_data.sticker_file_name(num)
+            if file_path.exists():
+                await self.queue.put_file(job_id, file_path.name, await asyncio.to_thread(file_path.read_bytes))
+
+
+    async def _delete_files(self, dccon_id: int) -> None:
+        for path in [
+            WorkerConfig.IMG_PATH / str(dccon_id),
+            WorkerConfig.STICKER_IMG_PATH / str(dccon_id),
+        ]:
+            await asyncio.to_thread(shutil.rmtree, path, True)
+        await self.workspaces.release(dccon_id)
+        await asyncio.to_thread((WorkerConfig.JOB_PATH / f"{dccon_id}.json").unlink, True)
+
+
+# python -m elitemikobot.worker
+if __name__ == "__main__":
+    WorkerConfig.load_config()
+    worker = Worker(open_work_queue(WorkerConfig.WORK_QUEUE_URL, WorkerConfig.WORK_QUEUE_SECRET), WorkerConfig.WORKER_ID)
+    asyncio.run(worker.run())
@@ -0,0 +1,168 @@
+import asyncio
+import shutil
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Tuple
+
+from elitemikobot.logger import Logger
+
+
+# 작업 하나의 임시 폴더 (GIF 프레임 등 중간 결과)
+class Workspace:
+    def __init__(self, key: str, path: Path) -> None:
+        self.key = key
+        self.path = Path(path)
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self.last_used = time.time()
+
+
+# 작업별 임시 폴더 관리
+# root를 /dev/shm 같은 tmpfs 경로로 지정하면 프레임 입출력이 메모리에서 처리됨
+# 폴더마다 잠금을 따로 두어 한 작업의 정리가 다른 작업을 막지 않음
+class WorkspaceManager:
+    def __init__(self, root: Path, quota_mb: int = 0, ttl_sec: float = 86400) -> None:
+        self.root = Path(root)
+        self.quota_bytes = quota_mb * 1024 * 1024   # 0이면 용량 제한 없음
+        self.ttl_sec = ttl_sec
+        self.logger = Logger(name="Workspace_Log")
+        self._workspaces: Dict[str, Workspace] = {}
+
+
+    def _get(self, key: str) -> Workspace:
+        workspace = self._workspaces.get(key)
+        if workspace is None:
+            workspace = Workspace(key, self.root / key)
+            self._workspaces[key] = workspace
+        return workspace
+
+
+    # 사용 중인 임시 폴더는 GC 대상에서 제외
+    @asynccontextmanager
+    async def use(self, key) -> AsyncIterator[Workspace]:
+        key = str(key)
+        while True:
+            workspace = self._get(key)
+            async with workspace.lock:
+                # 잠금을 기다리는 동안 GC/정리로 제거되었으면 새로 생성
+                if self._workspaces.get(key) is not workspace:
+                    continue
+                workspace.users += 1
+                await asyncio.to_thread(workspace.path.mkdir, parents=True, exist_ok=True)
+            break
+
+        try:
+            yield workspace
+        finally:
+            workspace.users -= 1
+            workspace.last_used = time.time()
+
+
+    # 작업 종료/취소 후 임시 폴더 삭제
+    async def release(self, key) -> None:
+        key = str(key)
+        workspace = self._get(key)
+        async with workspace.lock:
+            if self._workspaces.get(key) is workspace:
+                del self._workspaces[key]
+            await asyncio.to_thread(shutil.rmtree, workspace.path, True)
+
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        total = 0
+        for file in path.rglob("*"):
+            try:
+                if file.is_file():
+                    total += file.stat().st_size
+            except OSError:
+                pass
+        return total
+
+
+    # (키, 크기, 마지막 사용 시각) 목록, 이전 실행에서 남은 폴더 포함
+    def _scan(self) -> List[Tuple[str, int, float]]:
+        if not self.root.exists():
+            return []
+
+        entries = []
+        for child in self.root.iterdir():
+            # 숨김 폴더(.trash 등)는 작업 임시 폴더가 아님
+            if not child.is_dir() or child.name.startswith("."):
+                continue
+            try:
+                mtime = child.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((child.name, self._dir_size(child), mtime))
+        return entries
+
+
+    async def _remove_idle(self, key: str) -> bool:
+        workspace = self._get(key)
+        async with workspace.lock:
+            if workspace.users > 0:
+                return False
+            if self._workspaces.get(key) is workspace:
+                del self._workspaces[key]
+            await asyncio.to_thread(shutil.rmtree, workspace.path, True)
+            return True
+
+
+    # 오래된 폴더 삭제 후, 용량 제한을 넘으면 오래 사용하지 않은 폴더부터 삭제
+    async def collect(self) -> int:
+        entries = await asyncio.to_thread(self._scan)
+        now = time.time()
+        removed = 0
+
+        def last_used(key: str, mtime: float) -> float:
+            workspace = self._workspaces.get(key)
+            return max(mtime, workspace.last_used) if workspace else mtime
+
+        remaining = []
+        for key, size, mtime in entries:
+            if now - last_used(key, mtime) > self.ttl_sec and await self._remove_idle(key):
+                removed += 1
+            else:
+                remaining.append((key, size, mtime))
+
+        total = sum(size for _, size, _ in remaining)
+        if self.quota_bytes and total > self.quota_bytes:
+            for key, size, mtime in sorted(remaining, key=lambda entry: last_used(entry[0], entry[2])):
+                if total <= self.quota_bytes:
+                    break
+                if await self._remove_idle(key):
+                    total -= size
+                    removed += 1
+
+            if total > self.quota_bytes:
+                self.logger.warning(
+                    action="workspace gc",
+                    user="EliteMikoBot",
+                    data={"root": str(self.root), "used_mb": total // (1024 * 1024), "quota_mb": self.quota_bytes // (1024 * 1024)},
+                    message="Workspace quota exceeded by active jobs"
+                )
+
+        return removed
+
+
+    async def run_gc_loop(self, interval_sec: float) -> None:
+        while True:
+            await asyncio.sleep(interval_sec)
+            try:
+                removed = await self.collect()
+                if removed:
+                    self.logger.info(
+                        action="workspace gc",
+                        user="EliteMikoBot",
+                        data={"root": str(self.root), "removed": removed},
+                        message="Removed idle workspaces"
+                    )
+            except Exception as e:
+                self.logger.error(
+                    action="Exception workspace gc",
+                    user="EliteMikoBot",
+                    data={"root": str(self.root)},
+                    message=f"{e}"
+                )
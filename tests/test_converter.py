@@ -0,0 +1,81 @@
+import asyncio
+
+from elitemikobot.converter import Converter
+
+FRAME_MS = 1000 / Converter.FPS
+
+
+# 같은 출력 프레임에 겹치는 원본 프레임은 마지막 것만 사용
+def test_plan_timeline_keeps_last_source_frame_per_tick():
+    keep, durations = Converter.plan_timeline([20] * 10)
+    # 원본 프레임 시작 시각 0, 20, 40 ... 180ms → 출력 프레임 0, 1, 1, 2, 2, 3, 4, 4, 5, 5
+    assert keep == [0, 2, 4, 5, 7, 9]
+    assert durations == [FRAME_MS] * 6
+
+
+def test_plan_timeline_respects_max_frames():
+    keep, durations = Converter.plan_timeline([1000, 1000, 999])
+    assert keep == [0, 1, 2]
+    assert sum(durations) == Converter.max_frames() * FRAME_MS
+
+    keep, durations = Converter.plan_timeline([10] * 1000)
+    assert len(keep) <= Converter.max_frames()
+    assert keep == sorted(set(keep))
+
+
+# 듀레이션 합은 항상 출력 프레임 수 x 프레임 간격
+def test_plan_timeline_durations_sum_to_output_length():
+    for frame_durations in ([20] * 10, [100, 40, 70, 0, 60], [0, 0, 0], [500] * 12, [33, 34, 33] * 40):
+        keep, durations = Converter.plan_timeline(frame_durations)
+        end = round(sum(durations) / FRAME_MS)
+        assert len(keep) == len(durations)
+        assert 1 <= end <= Converter.max_frames()
+        assert abs(sum(durations) - end * 1000 / Converter.FPS) < 1e-6
+
+
+# plan_timeline 듀레이션은 인코딩 전에 다시 조절하지 않음
+def test_convert_video_keeps_planned_durations(tmp_path, monkeypatch):
+    _, durations = Converter.plan_timeline([1000, 1000, 999])
+
+    async def skip_encode(self, bitrate_kbps):
+        pass
+
+    monkeypatch.setattr(Converter, "_optimize_bitrate", skip_encode)
+    # 다시 조절하면 줄어들 만큼 상한을 낮춤
+    monkeypatch.setattr(Converter, "MAX_DURATION_MS", 1000)
+    converter = Converter(1, 1, str(tmp_path), str(tmp_path / "1.webm"), durations, planned=True)
+    asyncio.run(converter.convert_video())
+
+    lines = (tmp_path / "frame_info.txt").read_text().splitlines()
+    written = [float(line.split()[1]) * 1000 for line in lines if line.startswith("duration")]
+    assert converter.frame_durations == durations
+    assert [round(value, 3) for value in written] == [round(value, 3) for value in durations]
+
+
+# 빠른 생성(-f) 결과는 일반 결과와 다른 캐시 키를 사용
+def test_fast_render_version_differs():
+    assert Converter.render_version(fast=True) != Converter.render_version()
+    assert Converter.render_version(fast=False) == Converter.render_version()
+
+
+def test_fast_args_only_when_fast(tmp_path, monkeypatch):
+    commands = []
+
+    class Process:
+        returncode = 0
+
+        async def communicate(self):
+            return b"", b""
+
+    async def create_subprocess_shell(command, **kwargs):
+        commands.append(command)
+        return Process()
+
+    monkeypatch.setattr("elitemikobot.converter.asyncio.create_subprocess_shell", create_subprocess_shell)
+    for fast in (False, True):
+        converter = Converter(1, 1, str(tmp_path), str(tmp_path / "1.webm"), [100], fast=fast)
+        asyncio.run(converter._run_ffmpeg(200))
+
+    assert Converter.FAST_ARGS not in commands[0]
+    assert Converter.FAST_ARGS in commands[1]
+    assert commands[1].replace(f"{Converter.FAST_ARGS} ", "") == commands[0]
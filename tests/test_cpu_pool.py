@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+from elitemikobot.cpu_pool import CpuTokenPool
+
+
+# 토큰을 기다리는 작업들이 한꺼번에 취소되어도 토큰이 새지 않아야 함
+def test_cancel_while_contended_does_not_leak_tokens():
+    pool = CpuTokenPool(2)
+
+    async def work():
+        async with pool.token("job1"):
+            await asyncio.sleep(0.05)
+
+    async def main():
+        tasks = asyncio.gather(*(work() for _ in range(6)))
+        await asyncio.sleep(0.01)
+        tasks.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await tasks
+
+    asyncio.run(main())
+    assert pool.in_use == 0
+    assert pool._held == {}
+    assert pool.waiting == 0
+
+
+def test_waiters_are_served_after_release():
+    pool = CpuTokenPool(2)
+    order = []
+
+    async def work(name):
+        async with pool.token(name):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def main():
+        await asyncio.gather(*(work(f"job{i % 2}") for i in range(6)))
+
+    asyncio.run(main())
+    assert len(order) == 6
+    assert pool.in_use == 0
+    assert pool._held == {}
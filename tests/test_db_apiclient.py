@@ -0,0 +1,140 @@
+import asyncio
+from types import SimpleNamespace
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from elitemikobot.db_apiclient import CircuitBreaker, DbApiClient, HttpMethod
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+from elitemikobot.sticker_data import StickerData
+
+TAKEN = {"aaaaa1_by_bot", "ccccc1_by_bot"}
+CANDIDATES = ["aaaaa1_by_bot", "bbbbb1_by_bot", "ccccc1_by_bot", "ddddd1_by_bot"]
+
+
+# 일괄 조회(checkurls)를 지원하는 서버, batch가 False면 404를 돌려주는 이전 서버
+def url_server(requests: list, batch: bool = True):
+    async def handler(request):
+        requests.append((request.method, request.path))
+        if request.path.endswith("/stickers/checkurls") and batch:
+            urls = (await request.json())["urls"]
+            return web.json_response({"exists": [url for url in urls if url in TAKEN]})
+        if request.path.endswith("/stickers/checkurl"):
+            return web.json_response({"exists": request.query["url"] in TAKEN})
+        return web.Response(status=404)
+
+    return handler
+
+
+# handler: aiohttp 요청 핸들러, test(client, server): 테스트 본문
+def run_with_server(handler, test, **client_kwargs):
+    async def main():
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            async with DbApiClient(str(server.make_url("")).rstrip("/"), **client_kwargs) as client:
+                return await test(client, server)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+# HALF_OPEN 시험 요청이 취소되어도 다음 요청이 다시 시험할 수 있어야 함
+def test_cancelled_probe_releases_half_open():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return web.json_response({})
+
+    async def test(client, server):
+        client.breaker.state = CircuitBreaker.OPEN
+        client.breaker._opened_at = 0
+
+        probe = asyncio.create_task(client._request(HttpMethod.GET, f"{client.base_url}/stickers/x"))
+        await asyncio.sleep(0.05)
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        await asyncio.gather(probe, return_exceptions=True)
+
+        return client.breaker.allow_request()
+
+    assert run_with_server(handler, test, reset_timeout_sec=0)
+
+
+
+def test_filter_free_urls_uses_one_batch_request():
+    requests = []
+
+    async def test(client, server):
+        return await client.filter_free_urls(CANDIDATES)
+
+    assert run_with_server(url_server(requests), test) == ["bbbbb1_by_bot", "ddddd1_by_bot"]
+    assert requests == [("POST", "/stickers/checkurls")]
+
+
+def test_filter_free_urls_falls_back_to_single_checks_on_404():
+    requests = []
+
+    async def test(client, server):
+        return await client.filter_free_urls(CANDIDATES)
+
+    assert run_with_server(url_server(requests, batch=False), test) == ["bbbbb1_by_bot", "ddddd1_by_bot"]
+    assert requests[0] == ("POST", "/stickers/checkurls")
+    assert requests[1:] == [("GET", "/stickers/checkurl")] * len(CANDIDATES)
+
+
+# 로컬 복제본이 준비되지 않았으면 DB API 일괄 조회 결과에서 사용 가능한 첫 후보를 사용
+def test_generate_unique_sticker_url_skips_taken_candidates(monkeypatch):
+    requests = []
+    candidates = iter(CANDIDATES)
+    monkeypatch.setattr(BotConfig, "STICKER_URL_TAG", "_by_bot", raising=False)
+    monkeypatch.setattr(BotConfig, "STICKER_URL_CANDIDATES", len(CANDIDATES))
+    monkeypatch.setattr("elitemikobot.elitemikobot.random.sample", lambda population, k: next(candidates)[:k])
+
+    async def test(client, server):
+        bot = SimpleNamespace(catalog=SimpleNamespace(ready=False), db=client)
+        sticker_data = StickerData(id=1)
+        await EliteMikoBot._generate_unique_sticker_url(bot, sticker_data)
+        return sticker_data.url
+
+    assert run_with_server(url_server(requests), test) == "bbbbb1_by_bot"
+    assert requests == [("POST", "/stickers/checkurls")]
+
+
+# 로컬 복제본에 없는 후보도 DB에 확인 (다음 동기화 전에 다른 곳에서 등록됐을 수 있음)
+def test_unique_sticker_url_checks_db_for_catalog_misses(monkeypatch):
+    requests = []
+    candidates = iter(url[:5] for url in CANDIDATES)
+    monkeypatch.setattr(BotConfig, "STICKER_URL_TAG", "_by_bot", raising=False)
+    monkeypatch.setattr(BotConfig, "STICKER_URL_CANDIDATES", len(CANDIDATES))
+    monkeypatch.setattr("elitemikobot.elitemikobot.random.sample", lambda population, k: next(candidates)[:k])
+
+    async def test(client, server):
+        catalog = SimpleNamespace(ready=True, url_exists=lambda url: url == "bbbbb1_by_bot")
+        bot = SimpleNamespace(catalog=catalog, db=client)
+        sticker_data = StickerData(id=1)
+        await EliteMikoBot._generate_unique_sticker_url(bot, sticker_data)
+        return sticker_data.url
+
+    assert run_with_server(url_server(requests), test) == "ddddd1_by_bot"
+    assert requests == [("POST", "/stickers/checkurls")]
+
+
+# 로컬 복제본에 없는 스티커는 DB에서 다시 조회
+def test_sticker_url_falls_back_to_db_on_catalog_miss():
+    url = "https://t.me/addstickers/aaaaa1_by_bot"
+
+    async def handler(request):
+        if request.path.endswith("/exists"):
+            return web.json_response({"exists": True})
+        if request.path.endswith("/url"):
+            return web.json_response({"url": url})
+        return web.Response(status=404)
+
+    async def test(client, server):
+        bot = SimpleNamespace(catalog=SimpleNamespace(ready=True, get_url=lambda sticker: None), db=client)
+        return await EliteMikoBot._get_sticker_url(bot, StickerData(id=1))
+
+    assert run_with_server(handler, test) == url
@@ -0,0 +1,49 @@
+import numpy as np
+
+from elitemikobot.frame_pool import NO_POOL, FramePool
+
+
+def test_released_buffer_is_reused():
+    pool = FramePool()
+    first = pool.acquire((4, 4, 3))
+    pool.release(first)
+    # 같은 버퍼를 두 번 반납해도 한 번만 보관
+    pool.release(first)
+
+    assert pool.acquire((4, 4, 3)) is first
+    assert pool.acquire((4, 4, 3)) is not first
+    assert (pool.allocated, pool.reused) == (2, 1)
+
+
+# 다른 배열의 뷰나 연속되지 않은 배열은 보관하지 않음 (원본 버퍼를 다른 곳에서 계속 씀)
+def test_views_are_not_kept():
+    pool = FramePool()
+    frames = np.zeros((2, 4, 4, 3), dtype=np.uint8)
+    pool.release(frames[0], np.asfortranarray(np.zeros((4, 4, 3), dtype=np.uint8)), None)
+
+    assert pool.acquire((4, 4, 3)) is not frames[0]
+    assert pool.reused == 0
+
+
+# shape/dtype이 다르면 다른 버퍼를 사용
+def test_mismatched_shapes_are_not_reused():
+    pool = FramePool()
+    buffer = pool.acquire((4, 4, 3))
+    pool.release(buffer)
+
+    assert pool.acquire((4, 4, 4)).shape == (4, 4, 4)
+    assert pool.acquire((4, 4, 3), dtype="float32").dtype == np.float32
+    assert pool.acquire((4, 4, 3)) is buffer
+    assert pool.reused == 1
+
+
+def test_max_per_key_limits_kept_buffers():
+    pool = FramePool(max_per_key=1)
+    buffers = [pool.acquire((2, 2)) for _ in range(2)]
+    pool.release(*buffers)
+    assert pool.acquire((2, 2)) is buffers[0]
+    assert pool.acquire((2, 2)) is not buffers[1]
+
+    buffer = NO_POOL.acquire((2, 2))
+    NO_POOL.release(buffer)
+    assert NO_POOL.acquire((2, 2)) is not buffer
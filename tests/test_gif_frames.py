@@ -0,0 +1,199 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from elitemikobot.gif_frames import _render_frames_pillow, extract_frames, parse_gif, read_durations, render_frames
+
+
+def make_gif() -> bytes:
+    rng = np.random.RandomState(0)
+    frames = [Image.fromarray(rng.randint(0, 255, (16, 16, 3), dtype=np.uint8)).convert("P") for _ in range(3)]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, "GIF", save_all=True, append_images=frames[1:], duration=[100, 200, 300], loop=0)
+    return buffer.getvalue()
+
+
+# 프레임 영역/팔레트/투명색/disposal을 그대로 적는 GIF (Pillow 저장은 프레임을 최적화해서 바꿔버림)
+# LZW는 9비트 코드만 쓰도록 254개마다 clear 코드를 넣음
+def lzw_blocks(indices: np.ndarray) -> bytes:
+    codes = [256]
+    for n, value in enumerate(indices.ravel().tolist()):
+        if n and n % 254 == 0:
+            codes.append(256)
+        codes.append(value)
+    codes.append(257)
+
+    stream, acc, bits = bytearray(), 0, 0
+    for code in codes:
+        acc, bits = acc | code << bits, bits + 9
+        while bits >= 8:
+            stream.append(acc & 0xFF)
+            acc, bits = acc >> 8, bits - 8
+    if bits:
+        stream.append(acc)
+
+    blocks = bytearray([8])
+    for i in range(0, len(stream), 255):
+        chunk = stream[i:i + 255]
+        blocks += bytes([len(chunk)]) + chunk
+    return bytes(blocks + b"\x00")
+
+
+def palette(*colors) -> bytes:
+    return bytes(np.resize(np.array(colors, dtype=np.uint8), (256, 3)))
+
+
+def write_gif(width, height, frames, global_palette=None, background=0) -> bytes:
+    data = bytearray(b"GIF89a" + width.to_bytes(2, "little") + height.to_bytes(2, "little"))
+    data += bytes([0xF7 if global_palette else 0, background, 0]) + (global_palette or b"")
+    for frame in frames:
+        transparency = frame.get("transparency")
+        packed = frame.get("disposal", 1) << 2 | (transparency is not None)
+        data += b"!\xf9\x04" + bytes([packed, 10, 0, transparency or 0, 0])
+        indices = np.asarray(frame["indices"], dtype=np.uint8)
+        rect = (frame.get("x", 0), frame.get("y", 0), indices.shape[1], indices.shape[0])
+        data += b"," + b"".join(value.to_bytes(2, "little") for value in rect)
+        data += bytes([0x87]) + frame["palette"] if frame.get("palette") else b"\x00"
+        data += lzw_blocks(indices)
+    return bytes(data + b";")
+
+
+def random_gif(rng: np.random.RandomState) -> bytes:
+    width, height = rng.randint(1, 12, 2)
+    no_global = rng.rand() < 0.3
+    frames = []
+    for _ in range(rng.randint(1, 6)):
+        x, y = rng.randint(0, width), rng.randint(0, height)
+        if rng.rand() < 0.3:
+            x, y = 0, 0
+        frame = {"x": x, "y": y, "indices": rng.randint(0, 4, (rng.randint(1, height - y + 1), rng.randint(1, width - x + 1))), "disposal": rng.randint(1, 4)}
+        if rng.rand() < 0.5:
+            frame["transparency"] = rng.randint(0, 4)
+        if no_global or rng.rand() < 0.3:
+            frame["palette"] = bytes(rng.randint(0, 256, 768, dtype=np.uint8))
+        frames.append(frame)
+    return write_gif(int(width), int(height), frames, None if no_global else bytes(rng.randint(0, 256, 768, dtype=np.uint8)), rng.randint(0, 8))
+
+
+def assert_matches_pillow(data: bytes, keep=None):
+    frames, _ = render_frames(parse_gif(data), keep)
+    expected, _ = _render_frames_pillow(data, keep)
+    assert np.array_equal(frames, expected)
+
+
+def test_frames_match_pillow(tmp_path):
+    data = make_gif()
+    path = tmp_path / "1.gif"
+    path.write_bytes(data)
+
+    frames, durations = extract_frames(path)
+    expected, expected_durations = _render_frames_pillow(data)
+    assert np.array_equal(frames, expected)
+    assert durations == expected_durations == read_durations(path)
+
+
+# 블록 사이에 다시 들어간 GIF89a 헤더 같은 알 수 없는 바이트는 Pillow처럼 건너뜀
+def test_stray_bytes_between_blocks_are_skipped(tmp_path):
+    data = make_gif()
+    second = data.index(b"!\xf9", data.index(b"!\xf9") + 1)
+    data = data[:second] + b"GIF89a\x10\x00\x10\x00\x00\x00\x00" + data[second:]
+    path = tmp_path / "1.gif"
+    path.write_bytes(data)
+
+    frames, durations = extract_frames(path)
+    expected, expected_durations = _render_frames_pillow(data)
+    assert len(frames) == 3
+    assert np.array_equal(frames, expected)
+    assert durations == expected_durations == read_durations(path)
+
+
+RED, GREEN, BLUE, WHITE = (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255)
+
+
+# 2x2 화면 위에 1x1 프레임 두 개, 첫 프레임에 투명색이 있어 화면에 알파가 있음
+@pytest.mark.parametrize("disposal", [1, 2, 3])
+@pytest.mark.parametrize("transparency", [None, 3])
+def test_partial_frame_disposal(disposal, transparency):
+    colors = palette(RED, GREEN, BLUE, WHITE)
+    data = write_gif(2, 2, [
+        {"indices": [[0, 3], [3, 0]], "transparency": 3, "disposal": 1},
+        {"x": 1, "y": 0, "indices": [[1]], "transparency": transparency, "disposal": disposal},
+        {"x": 0, "y": 1, "indices": [[2]], "disposal": 1},
+    ], colors)
+    assert_matches_pillow(data)
+
+    frames, _ = render_frames(parse_gif(data))
+    assert tuple(frames[1, 0, 1]) == GREEN + (255,)
+    # 투명 픽셀 아래 RGB는 투명색의 팔레트 색
+    assert tuple(frames[0, 0, 1]) == WHITE + (0,)
+    after = {1: GREEN + (255,), 2: (transparency and WHITE or RED) + (0 if transparency else 255,), 3: WHITE + (0,)}
+    assert tuple(frames[2, 0, 1]) == after[disposal]
+
+
+# 첫 프레임에 투명색이 없으면 화면에 알파가 없어 disposal 2도 투명색의 팔레트 색으로 불투명하게 지움
+def test_disposal_2_without_alpha_channel():
+    data = write_gif(2, 1, [
+        {"indices": [[0, 0]]},
+        {"x": 1, "indices": [[1]], "transparency": 2, "disposal": 2},
+        {"indices": [[2]], "transparency": 2},
+    ], palette(RED, GREEN, BLUE))
+    assert_matches_pillow(data)
+
+    frames, _ = render_frames(parse_gif(data))
+    assert tuple(frames[2, 0, 1]) == BLUE + (255,)
+
+
+# disposal 3은 그리기 전 상태로 되돌림, 되돌린 뒤의 프레임이 다시 disposal 3이어도 그 상태 기준
+def test_disposal_3_restores_previous_state():
+    data = write_gif(3, 1, [
+        {"indices": [[0, 0, 0]], "transparency": 3, "disposal": 1},
+        {"x": 1, "indices": [[1, 3]], "transparency": 3, "disposal": 3},
+        {"x": 2, "indices": [[2]], "transparency": 3, "disposal": 3},
+        {"indices": [[3]], "transparency": 3},
+    ], palette(RED, GREEN, BLUE, WHITE))
+    assert_matches_pillow(data)
+
+    frames, _ = render_frames(parse_gif(data))
+    assert [tuple(pixel[:3]) for pixel in frames[1, 0]] == [RED, GREEN, RED]
+    assert [tuple(pixel[:3]) for pixel in frames[2, 0]] == [RED, RED, BLUE]
+    assert [tuple(pixel[:3]) for pixel in frames[3, 0]] == [RED, RED, RED]
+
+
+# 로컬 팔레트는 그 프레임과 그 프레임의 disposal 2 색에만 쓰임
+def test_local_palettes():
+    data = write_gif(2, 1, [
+        {"indices": [[0, 1]], "transparency": 2},
+        {"x": 1, "indices": [[0]], "palette": palette(BLUE, GREEN, WHITE), "transparency": 2, "disposal": 2},
+        {"indices": [[1]], "transparency": 2},
+    ], palette(RED, GREEN, BLUE), background=1)
+    assert_matches_pillow(data)
+
+    frames, _ = render_frames(parse_gif(data))
+    assert tuple(frames[1, 0, 1]) == BLUE + (255,)
+    assert tuple(frames[2, 0, 0]) == GREEN + (255,)
+    assert tuple(frames[2, 0, 1]) == WHITE + (0,)
+
+
+# Pillow는 disposal 0(미지정)에 직전 프레임의 disposal을 이어 쓰지만 여기서는 명세처럼 유지
+def test_unspecified_disposal_keeps_pixels():
+    data = write_gif(2, 1, [
+        {"indices": [[0, 0]], "transparency": 2},
+        {"x": 1, "indices": [[1]], "transparency": 2, "disposal": 2},
+        {"indices": [[1]], "transparency": 2, "disposal": 0},
+        {"x": 1, "indices": [[2]], "transparency": 2},
+    ], palette(RED, GREEN, BLUE))
+
+    frames, _ = render_frames(parse_gif(data))
+    assert tuple(frames[3, 0, 0]) == GREEN + (255,)
+
+
+# 무작위 프레임 영역/팔레트/투명색/disposal 조합, 프레임 일부만 남겨도 같은 결과
+@pytest.mark.parametrize("seed", range(200))
+def test_random_gifs_match_pillow(seed):
+    rng = np.random.RandomState(seed)
+    data = random_gif(rng)
+    count = len(parse_gif(data).frames)
+    assert_matches_pillow(data)
+    assert_matches_pillow(data, [i for i in range(count) if rng.rand() < 0.5])
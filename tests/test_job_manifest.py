@@ -0,0 +1,14 @@
+import asyncio
+
+from elitemikobot.job_manifest import JobManifest
+from elitemikobot.sticker_data import StickerData
+
+
+def test_attempts_survive_reload(tmp_path):
+    manifest = JobManifest.create(tmp_path, chat_id=1, sticker=StickerData(id=7))
+    manifest.attempts = 2
+    asyncio.run(manifest.save())
+
+    loaded = JobManifest.load(manifest.path)
+    assert loaded.attempts == 2
+    assert loaded.sticker.id == 7
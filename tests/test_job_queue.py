@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+
+from elitemikobot.job_queue import QueueFullError, QueueTimeoutError, StickerJobQueue
+
+
+# 다운로드 중인(예약한) 작업도 대기열 자리를 차지하고, 예약한 작업은 대기열이 가득 차도 등록됨
+def test_reserved_jobs_count_towards_capacity():
+    queue = StickerJobQueue(slots=1, max_depth=2, wait_timeout=10)
+
+    async def main():
+        for _ in range(3):
+            assert not queue.is_full()
+            queue.reserve()
+        assert queue.is_full()
+
+        started = []
+
+        async def job(dccon_id):
+            async with queue.slot(1, dccon_id, reserved=True):
+                started.append(dccon_id)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(job(i) for i in range(3)))
+        assert started == [0, 1, 2]
+
+    asyncio.run(main())
+    assert queue.reserved == 0
+    assert queue.active == 0
+    assert not queue.is_full()
+
+
+def test_cancel_reservation_frees_capacity():
+    queue = StickerJobQueue(slots=1, max_depth=0, wait_timeout=10)
+    queue.reserve()
+    assert queue.is_full()
+    queue.cancel_reservation()
+    assert not queue.is_full()
+
+
+# 슬롯 하나를 차지한 채로 jobs(user_id, dccon_id, cost)를 순서대로 등록한 뒤 실행 순서를 반환
+async def run_order(queue, jobs, gap=0.0):
+    order = []
+
+    async def job(user_id, dccon_id, cost):
+        async with queue.slot(user_id, dccon_id, cost=cost):
+            order.append(dccon_id)
+
+    await queue.acquire(0, 0)
+    tasks = []
+    for user_id, dccon_id, cost in jobs:
+        tasks.append(asyncio.create_task(job(user_id, dccon_id, cost)))
+        await asyncio.sleep(gap)
+    await asyncio.sleep(0)
+    queue.release()
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_cheap_job_runs_before_expensive_job_of_same_user():
+    queue = StickerJobQueue(slots=1, max_depth=10, wait_timeout=10)
+    order = asyncio.run(run_order(queue, [(1, 1, 100.0), (1, 2, 1.0)]))
+    assert order == [2, 1]
+
+
+# 비싼 작업이 예상 처리 시간 차이 / aging_rate보다 오래 기다렸으면 나중에 온 작은 작업보다 먼저 실행
+def test_aged_expensive_job_overtakes_cheap_job():
+    queue = StickerJobQueue(slots=1, max_depth=10, wait_timeout=10, aging_rate=100)
+    order = asyncio.run(run_order(queue, [(1, 1, 5.0), (1, 2, 1.0)], gap=0.1))
+    assert order == [1, 2]
+
+
+# 사용자 사이에는 예상 처리 시간과 관계없이 번갈아 실행
+def test_users_alternate_regardless_of_cost():
+    queue = StickerJobQueue(slots=1, max_depth=10, wait_timeout=10)
+    jobs = [(1, 11, 1.0), (1, 12, 1.0), (1, 13, 1.0), (2, 21, 100.0), (2, 22, 200.0)]
+    order = asyncio.run(run_order(queue, jobs))
+    assert order == [11, 21, 12, 22, 13]
+
+
+def test_round_robin_between_users():
+    queue = StickerJobQueue(slots=1, max_depth=10, wait_timeout=10)
+    jobs = [(1, 11, 0.0), (1, 12, 0.0), (2, 21, 0.0), (3, 31, 0.0), (2, 22, 0.0)]
+    order = asyncio.run(run_order(queue, jobs))
+    assert order == [11, 21, 31, 12, 22]
+
+
+def test_rejects_jobs_past_max_depth():
+    queue = StickerJobQueue(slots=1, max_depth=1, wait_timeout=10)
+
+    async def main():
+        await queue.acquire(1, 1)
+        waiting = asyncio.create_task(queue.acquire(2, 2))
+        await asyncio.sleep(0)
+        assert queue.waiting == 1
+
+        with pytest.raises(QueueFullError):
+            await queue.acquire(3, 3)
+
+        queue.release()
+        await waiting
+        queue.release()
+
+    asyncio.run(main())
+    assert queue.active == 0
+
+
+def test_wait_timeout_removes_job_from_queue():
+    queue = StickerJobQueue(slots=1, max_depth=10, wait_timeout=0.05)
+
+    async def main():
+        await queue.acquire(1, 1)
+        with pytest.raises(QueueTimeoutError):
+            await queue.acquire(2, 2)
+        assert queue.waiting == 0
+        queue.release()
+
+    asyncio.run(main())
+    assert queue.active == 0
+
+
+# 대기 순번은 앞 작업이 시작되거나 빠질 때마다 다시 알리고, 시작하면 0
+def test_position_notifications():
+    queue = StickerJobQueue(slots=1, max_depth=10, wait_timeout=10)
+    positions = {2: [], 3: []}
+
+    async def main():
+        async def on_position(dccon_id, pos):
+            positions[dccon_id].append(pos)
+
+        async def job(dccon_id):
+            async with queue.slot(dccon_id, dccon_id, lambda pos: on_position(dccon_id, pos)):
+                await asyncio.sleep(0.01)
+
+        await queue.acquire(1, 1)
+        tasks = [asyncio.create_task(job(2)), asyncio.create_task(job(3))]
+        await asyncio.sleep(0.01)
+        assert queue.position_of(3) == 2
+        queue.release()
+        await asyncio.gather(*tasks)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert positions == {2: [1, 0], 3: [2, 1, 0]}
@@ -0,0 +1,40 @@
+import json
+import logging
+
+from elitemikobot.logger import Logger, _JsonFormatter
+
+
+class CaptureHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def log_from_here(logger: Logger) -> int:
+    logger.info(action="test action", user="tester", data={"dccon_id": 1}, message="hello")
+    return log_from_here.__code__.co_firstlineno + 1
+
+
+# 파일에 저장되는 JSON 레코드의 위치 정보는 Logger를 호출한 곳 (stacklevel)
+def test_json_record_points_at_caller():
+    logger = Logger(name="Test_Log")
+    capture = CaptureHandler()
+    logger.logger.addHandler(capture)
+    try:
+        line = log_from_here(logger)
+    finally:
+        logger.logger.removeHandler(capture)
+
+    record = json.loads(_JsonFormatter().format(capture.records[0]))
+    assert record["module"] == "test_logger.py"
+    assert record["func"] == "log_from_here"
+    assert record["line"] == line
+    assert record["logger"] == "Test_Log"
+    assert record["level"] == "INFO"
+    assert record["action"] == "test action"
+    assert record["user"] == "tester"
+    assert record["data"] == {"dccon_id": 1}
+    assert record["message"] == "hello"
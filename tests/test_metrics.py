@@ -0,0 +1,83 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiohttp
+import pytest
+
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+from elitemikobot.metrics import (
+    REGISTRY, STAGE_SECONDS, Counter, Gauge, Histogram, MetricsRegistry, MetricsServer,
+    collect_stages, stage_timer
+)
+
+
+def scrape(registry: MetricsRegistry) -> str:
+    async def main():
+        server = MetricsServer("127.0.0.1", 0, registry)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                    assert response.status == 200
+                    assert response.content_type == "text/plain"
+                    return await response.text()
+        finally:
+            await server.stop()
+
+    return asyncio.run(main())
+
+
+def test_metrics_endpoint_renders_text_format():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("test_requests_total", "Requests", labels=("result",)))
+    registry.register(Gauge("test_depth", "Depth", func=lambda: 3))
+    histogram = registry.register(Histogram("test_seconds", "Seconds", buckets=(0.1, 1)))
+    counter.inc(result="ok")
+    counter.inc(2, result='say "hi"')
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    lines = scrape(registry).splitlines()
+    assert "# TYPE test_requests_total counter" in lines
+    assert 'test_requests_total{result="ok"} 1' in lines
+    assert 'test_requests_total{result="say \\"hi\\""} 2' in lines
+    assert "# TYPE test_depth gauge" in lines
+    assert "test_depth 3" in lines
+    assert 'test_seconds_bucket{le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{le="1"} 2' in lines
+    assert 'test_seconds_bucket{le="+Inf"} 2' in lines
+    assert "test_seconds_sum 0.55" in lines
+    assert "test_seconds_count 2" in lines
+
+
+# stage_timer 측정값은 단계 히스토그램/카운터와 /profile 수집기에 함께 기록
+def test_stage_timer_observes_histogram():
+    stage = "test_stage"
+    before = STAGE_SECONDS.totals().get((stage,), (0, 0.0))[0]
+
+    with collect_stages() as records:
+        with stage_timer(stage):
+            pass
+        with pytest.raises(ValueError):
+            with stage_timer(stage):
+                raise ValueError
+
+    assert STAGE_SECONDS.totals()[(stage,)][0] == before + 2
+    assert [name for name, _ in records] == [stage, stage]
+    lines = REGISTRY.render().splitlines()
+    assert f'elitemikobot_stage_seconds_count{{stage="{stage}"}} {before + 2}' in lines
+    assert f'elitemikobot_stage_total{{stage="{stage}",result="error"}} 1' in lines
+
+
+# 게이지는 수집 시점에 BotConfig 대기열 값을 읽음
+def test_fast_queue_saturation_gauge(monkeypatch):
+    monkeypatch.setattr(BotConfig, "MAX_CONCURRENT_TASKS", 4)
+    monkeypatch.setattr(BotConfig, "FAST_CONCURRENT_TASKS", 2)
+    BotConfig.init_queues()
+    EliteMikoBot._register_job_metrics(SimpleNamespace())
+
+    BotConfig.fast_job_queue.active = 1
+    lines = REGISTRY.render().splitlines()
+    BotConfig.fast_job_queue.active = 0
+    assert "elitemikobot_slot_saturation 0.0" in lines
+    assert "elitemikobot_fast_slot_saturation 0.5" in lines
@@ -0,0 +1,65 @@
+import asyncio
+
+from elitemikobot.converter import Converter
+from elitemikobot.render_cache import RenderCache, open_render_cache
+
+
+def write(path, data: bytes):
+    path.write_bytes(data)
+    return path
+
+
+# 같은 원본/구성/설정이면 같은 키, 하나라도 다르면 다른 키
+def test_key_is_stable_and_includes_render_version(tmp_path, monkeypatch):
+    sources = [write(tmp_path / "1.gif", b"first"), write(tmp_path / "2.gif", b"second")]
+    copies = [write(tmp_path / "a.gif", b"first"), write(tmp_path / "b.gif", b"second")]
+    version = Converter.render_version()
+    key = RenderCache.make_key(version, "merge", sources)
+
+    assert RenderCache.make_key(version, "merge", copies) == key
+    assert RenderCache.make_key(version, "single", sources) != key
+    assert RenderCache.make_key(version, "merge", sources[::-1]) != key
+    # 원본 경계가 바뀌어도 내용을 이어 붙인 값이 같아지지 않음
+    split = [write(tmp_path / "c.gif", b"firsts"), write(tmp_path / "d.gif", b"econd")]
+    assert RenderCache.make_key(version, "merge", split) != key
+
+    monkeypatch.setattr(Converter, "FPS", Converter.FPS + 1)
+    assert Converter.render_version() != version
+    assert RenderCache.make_key(Converter.render_version(), "merge", sources) != key
+
+
+# 용량을 넘으면 가장 오래 사용하지 않은 파일부터 삭제, 꺼내 쓴 파일은 최근 사용으로 이동
+def test_evicts_least_recently_used_over_quota(tmp_path):
+    cache = RenderCache(tmp_path / "cache", quota_mb=1)
+    cache.quota_bytes = 250
+    out = tmp_path / "out.webm"
+
+    async def main():
+        for key in ("aa1", "bb2"):
+            await cache.store(key, "webm", write(tmp_path / f"{key}.webm", key.encode() * 40))
+        assert await cache.fetch("aa1", "webm", out)
+        await cache.store("cc3", "webm", write(tmp_path / "cc3.webm", b"cc3" * 40))
+        return [await cache.fetch(key, "webm", out) for key in ("aa1", "bb2", "cc3")]
+
+    assert asyncio.run(main()) == [True, False, True]
+    assert cache.size == 240
+    assert not (tmp_path / "cache" / "bb" / "bb2.webm").exists()
+    assert out.read_bytes() == b"cc3" * 40
+
+
+# 다시 열면 이전 실행에서 저장한 파일을 마지막 사용 시각 순서로 불러옴
+def test_reopened_cache_keeps_files(tmp_path):
+    out = tmp_path / "out.png"
+
+    async def main():
+        await RenderCache(tmp_path / "cache", quota_mb=1).store("aa1", "png", write(tmp_path / "src.png", b"png"))
+        reopened = RenderCache(tmp_path / "cache", quota_mb=1)
+        return await reopened.fetch("aa1", "png", out), reopened.size
+
+    assert asyncio.run(main()) == (True, 3)
+    assert out.read_bytes() == b"png"
+
+
+def test_zero_quota_disables_cache(tmp_path):
+    assert open_render_cache(tmp_path / "cache", 0) is None
+    assert isinstance(open_render_cache(tmp_path / "cache", 1), RenderCache)
@@ -0,0 +1,112 @@
+import asyncio
+import datetime as dt
+
+from elitemikobot.sticker_catalog import StickerCatalog
+from elitemikobot.sticker_data import StickerData
+
+
+UTC = dt.timezone.utc
+
+
+def sticker(url: str, date_time: dt.datetime) -> StickerData:
+    return StickerData(id=1, option_flag=0, url=f"https://t.me/addstickers/{url}", date_time=date_time)
+
+
+# 늦게 도착한 이전 변경분은 메모리/SQLite 모두 반영하지 않음, 시간대가 다른 값도 같은 기준으로 비교
+def test_older_change_does_not_override_newer_record(tmp_path):
+    async def main():
+        catalog = StickerCatalog(tmp_path / "catalog.sqlite3", db=None)
+        await catalog.open()
+        newer = dt.datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+        await catalog.record(sticker("new_by_bot", newer))
+        # 같은 시각보다 1시간 이전 (다른 시간대로 표시)
+        older = (newer - dt.timedelta(hours=1)).astimezone(dt.timezone(dt.timedelta(hours=9)))
+        await catalog._upsert([sticker("old_by_bot", older)])
+        url = catalog.get_url(StickerData(id=1))
+        await catalog.close()
+
+        reopened = StickerCatalog(tmp_path / "catalog.sqlite3", db=None)
+        await reopened.open()
+        reopened_url = reopened.get_url(StickerData(id=1))
+        await reopened.close()
+        return url, reopened_url
+
+    url, reopened_url = asyncio.run(main())
+    assert url == "https://t.me/addstickers/new_by_bot"
+    assert reopened_url == url
+
+
+# write-through로 기록하는 로컬 시각(시간대 없음)도 UTC로 저장
+def test_naive_timestamps_are_stored_as_utc(tmp_path):
+    now = dt.datetime.now()
+
+    async def main():
+        catalog = StickerCatalog(tmp_path / "catalog.sqlite3", db=None)
+        await catalog.open()
+        await catalog.record(sticker("local_by_bot", now))
+        stored = catalog._conn.execute("SELECT registered_at FROM stickers").fetchone()[0]
+        await catalog.close()
+        return stored
+
+    stored = dt.datetime.fromisoformat(asyncio.run(main()))
+    assert stored.utcoffset() == dt.timedelta(0)
+    assert stored == now.astimezone(UTC)
+
+
+class FullListDb:
+    def __init__(self, stickers, on_fetch=None):
+        self.stickers = stickers
+        self.on_fetch = on_fetch
+
+    async def get_sticker_changes(self, since=None):
+        if self.on_fetch is not None:
+            await self.on_fetch()
+        return self.stickers
+
+
+# 서버에서 지운 스티커는 전체 목록 반영 때 제거, 목록을 받는 사이 write-through로 기록한 스티커는 유지
+def test_reconcile_removes_deleted_stickers(tmp_path):
+    registered = dt.datetime(2024, 1, 1, tzinfo=UTC)
+    kept = StickerData(id=1, option_flag=0, url="https://t.me/addstickers/kept_by_bot", date_time=registered)
+    deleted = StickerData(id=2, option_flag=0, url="https://t.me/addstickers/deleted_by_bot", date_time=registered)
+    recorded = StickerData(id=3, option_flag=0, url="https://t.me/addstickers/new_by_bot", date_time=dt.datetime.now(UTC))
+
+    async def main():
+        catalog = StickerCatalog(tmp_path / "catalog.sqlite3", db=None)
+        await catalog.open()
+        await catalog._upsert([kept, deleted])
+
+        async def record_during_fetch():
+            await asyncio.sleep(0.01)
+            recorded.date_time = dt.datetime.now(UTC)
+            await catalog.record(recorded)
+
+        catalog.db = FullListDb([kept], on_fetch=record_during_fetch)
+        removed = await catalog.reconcile()
+        urls = [catalog.get_url(StickerData(id=i)) for i in (1, 2, 3)]
+        await catalog.close()
+
+        reopened = StickerCatalog(tmp_path / "catalog.sqlite3", db=None)
+        await reopened.open()
+        reopened_urls = [reopened.get_url(StickerData(id=i)) for i in (1, 2, 3)]
+        await reopened.close()
+        return removed, urls, reopened_urls
+
+    removed, urls, reopened_urls = asyncio.run(main())
+    assert removed == 1
+    assert urls == [kept.url, None, recorded.url]
+    assert reopened_urls == urls
+
+
+# 빈 목록은 API 오류와 구분할 수 없으므로 아무것도 지우지 않음
+def test_reconcile_ignores_empty_list(tmp_path):
+    async def main():
+        catalog = StickerCatalog(tmp_path / "catalog.sqlite3", db=FullListDb([]))
+        await catalog.open()
+        await catalog.record(sticker("kept_by_bot", dt.datetime(2024, 1, 1, tzinfo=UTC)))
+        removed = await catalog.reconcile()
+        url = catalog.get_url(StickerData(id=1))
+        await catalog.close()
+        return removed, url
+
+    assert asyncio.run(main()) == (0, "https://t.me/addstickers/kept_by_bot")
@@ -0,0 +1,90 @@
+import asyncio
+import itertools
+import warnings
+from datetime import datetime, timezone
+
+import pytest
+from telegram import Update
+from telegram.ext import Application
+from telegram.warnings import PTBUserWarning
+
+from benchmarks.stand_ins import FakeBot, SimulatedProcessor, StandInServer, configure
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+
+DCCON_ID = 9100001
+_ids = itertools.count(1)
+
+
+def create_update(bot: FakeBot, user_id: int, dccon_id: int) -> Update:
+    return Update.de_json({
+        "update_id": next(_ids),
+        "message": {
+            "message_id": next(_ids),
+            "date": int(datetime.now(timezone.utc).timestamp()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"user{user_id}", "username": f"user{user_id}"},
+            "text": f"/create {dccon_id}",
+            "entities": [{"type": "bot_command", "offset": 0, "length": len("/create")}]
+        }
+    }, bot)
+
+
+# prepare: 다운로드 실패, process: 이미지 처리 실패, timeout: 처리 시간 초과
+class FailingProcessor(SimulatedProcessor):
+    def __init__(self, sticker_path, failure: str) -> None:
+        super().__init__(sticker_path, work_sec=0)
+        self.failure = failure
+
+    async def prepare(self, sticker_data, manifest=None):
+        await asyncio.sleep(0.05)
+        if self.failure == "prepare":
+            return None
+        return await super().prepare(sticker_data, manifest)
+
+    async def process(self, sticker_data, manifest=None):
+        if self.failure == "timeout":
+            await asyncio.sleep(10)
+        return None
+
+
+# 같은 디시콘을 요청한 두 채팅 모두 실패 안내를 받음
+@pytest.mark.parametrize("failure, reply", [
+    ("prepare", "작업을 실패했다니에"),
+    ("process", "작업을 실패했다니에"),
+    ("timeout", "시간 초과로 중단됐다"),
+])
+def test_coalesced_subscribers_are_notified_on_failure(tmp_path, monkeypatch, failure, reply):
+    monkeypatch.setattr(BotConfig, "IMG_PROCESSING_TIMEOUT", 0.2)
+    warnings.filterwarnings("ignore", category=PTBUserWarning)
+
+    async def main():
+        server = StandInServer()
+        await server.start()
+        configure(tmp_path, server)
+
+        fake_bot = FakeBot()
+        bot = EliteMikoBot(BotConfig.BOT_TOKEN)
+        bot.bot = fake_bot
+        bot.application = Application.builder().bot(fake_bot).build()
+        bot._setup_handlers()
+        bot.processor = FailingProcessor(BotConfig.STICKER_IMG_PATH, failure)
+
+        await bot.application.initialize()
+        await bot._post_init(bot.application)
+        try:
+            for user_id in (1, 2):
+                await bot.application.process_update(create_update(fake_bot, user_id, DCCON_ID))
+            assert BotConfig.sticker_subscribers[DCCON_ID] == {1, 2}
+            await asyncio.gather(BotConfig.sticker_tasks[DCCON_ID], return_exceptions=True)
+        finally:
+            await bot._post_shutdown(bot.application)
+            await bot.application.shutdown()
+            await server.stop()
+
+        return {
+            kwargs["chat_id"] for method, kwargs in fake_bot.calls
+            if method == "send_message" and reply in kwargs["text"]
+        }
+
+    assert asyncio.run(main()) == {1, 2}
+    assert DCCON_ID not in BotConfig.sticker_tasks
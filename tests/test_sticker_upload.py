@@ -0,0 +1,55 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from telegram.error import BadRequest, TimedOut
+
+from elitemikobot.elitemikobot import BotConfig, EliteMikoBot
+from elitemikobot.logger import Logger
+from elitemikobot.sticker_data import StickerData
+
+
+class FailingBot:
+    def __init__(self, error: Exception) -> None:
+        self.error = error
+        self.calls = 0
+
+    async def upload_sticker_file(self, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+def upload(tmp_path, bot, sleeps):
+    file_path = tmp_path / "1.png"
+    file_path.write_bytes(b"png")
+    stub = SimpleNamespace(bot=bot, logger=Logger(name="EliteMikoBot_Log"))
+    manifest = SimpleNamespace(uploaded={})
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    async def main():
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(asyncio, "sleep", sleep)
+            mp.setattr(BotConfig, "DEVELOPER_ID", 1, raising=False)
+            await EliteMikoBot._upload_sticker_file(stub, StickerData(id=1), 1, file_path, "static", asyncio.Semaphore(1), manifest)
+
+    asyncio.run(main())
+
+
+# BadRequest는 NetworkError의 하위 클래스지만 재시도하지 않음
+def test_bad_request_is_not_retried(tmp_path):
+    bot, sleeps = FailingBot(BadRequest("Sticker_png_dimensions")), []
+    with pytest.raises(BadRequest):
+        upload(tmp_path, bot, sleeps)
+    assert bot.calls == 1
+    assert sleeps == []
+
+
+# 마지막 시도 후에는 대기하지 않음
+def test_no_sleep_after_last_attempt(tmp_path):
+    bot, sleeps = FailingBot(TimedOut()), []
+    with pytest.raises(RuntimeError):
+        upload(tmp_path, bot, sleeps)
+    assert bot.calls == BotConfig.STICKER_UPLOAD_MAX_ATTEMPTS
+    assert len(sleeps) == BotConfig.STICKER_UPLOAD_MAX_ATTEMPTS - 1
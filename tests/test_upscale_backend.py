@@ -0,0 +1,77 @@
+import pytest
+
+from elitemikobot.upscale_backend import (
+    LONG_GIF_PIXELS, InterpolationBackend, SuperResBackend, UpscaleConfig, Waifu2xBackend, choose_backend
+)
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    def set_available(waifu2x: bool, superres: bool) -> None:
+        monkeypatch.setattr(Waifu2xBackend, "available", classmethod(lambda cls: waifu2x))
+        monkeypatch.setattr(SuperResBackend, "available", classmethod(lambda cls: superres))
+
+    return set_available
+
+
+def test_auto_uses_interpolation_when_image_is_already_large(installed):
+    installed(True, True)
+    assert choose_backend("auto", 512, 600) == "interpolation"
+    assert choose_backend("auto", 300, 300, target=256) == "interpolation"
+    assert choose_backend("auto", 300, 300) == "waifu2x"
+
+
+# 프레임이 많은 GIF는 가벼운 모델 우선, 설치되지 않은 백엔드는 건너뜀
+def test_auto_prefers_light_model_for_long_gifs(installed):
+    long_frames = LONG_GIF_PIXELS // (100 * 100) + 1
+
+    installed(True, True)
+    assert choose_backend("auto", 100, 100, frames=2) == "waifu2x"
+    assert choose_backend("auto", 100, 100, frames=long_frames) == "superres"
+
+    installed(True, False)
+    assert choose_backend("auto", 100, 100, frames=long_frames) == "waifu2x"
+
+    installed(False, False)
+    assert choose_backend("auto", 100, 100) == "interpolation"
+
+
+def test_explicit_backend_falls_back_to_auto_when_unavailable(installed):
+    installed(True, False)
+    assert choose_backend("interpolation", 100, 100) == "interpolation"
+    assert choose_backend("waifu2x", 600, 600) == "waifu2x"
+    assert choose_backend("superres", 100, 100) == "waifu2x"
+    assert choose_backend("superres", 600, 600) == "interpolation"
+
+
+@pytest.fixture
+def config(monkeypatch):
+    monkeypatch.setattr(UpscaleConfig, "BACKEND", "auto")
+    monkeypatch.setattr(UpscaleConfig, "SUPERRES_MODEL", "")
+    monkeypatch.delenv("UPSCALE_BACKEND", raising=False)
+    monkeypatch.delenv("SUPERRES_MODEL", raising=False)
+    yield monkeypatch
+    SuperResBackend.available.cache_clear()
+
+
+def test_load_config_rejects_unknown_backend(config):
+    config.setenv("UPSCALE_BACKEND", "waifu3x")
+    with pytest.raises(ValueError):
+        UpscaleConfig.load_config()
+
+
+# 모델 파일이 없으면 시작은 하되 superres를 사용할 수 없음 (auto처럼 선택)
+def test_load_config_accepts_unavailable_backend(config, tmp_path):
+    config.setenv("UPSCALE_BACKEND", "superres")
+    config.setenv("SUPERRES_MODEL", str(tmp_path / "FSRCNN_x2.pb"))
+    UpscaleConfig.load_config()
+
+    assert UpscaleConfig.BACKEND == "superres"
+    assert UpscaleConfig.SUPERRES_MODEL == str(tmp_path / "FSRCNN_x2.pb")
+    assert not SuperResBackend.available()
+    assert choose_backend(UpscaleConfig.BACKEND, 600, 600) == InterpolationBackend.name
+
+
+def test_load_config_defaults_to_auto(config):
+    UpscaleConfig.load_config()
+    assert UpscaleConfig.BACKEND == "auto"
@@ -0,0 +1,64 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import aiohttp
+
+from elitemikobot.webhook import WebhookServer
+
+SECRET = "secret"
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 0,
+        "chat": {"id": 1, "type": "private"},
+        "text": "/start"
+    }
+}
+
+
+# port 0으로 실행한 webhook 서버에 요청을 보내고 (응답 코드 목록, update_queue에 들어간 업데이트) 반환
+def post_updates(requests: list):
+    async def main():
+        application = SimpleNamespace(bot=None, update_queue=asyncio.Queue())
+        server = WebhookServer(application, "127.0.0.1", 0, "/telegram", SECRET)
+        await server.start()
+        statuses = []
+        try:
+            async with aiohttp.ClientSession() as session:
+                for secret, body in requests:
+                    async with session.post(
+                        f"http://127.0.0.1:{server.port}/telegram",
+                        data=body,
+                        headers={WebhookServer.SECRET_HEADER: secret, "Content-Type": "application/json"}
+                    ) as response:
+                        statuses.append(response.status)
+        finally:
+            await server.stop()
+
+        updates = []
+        while not application.update_queue.empty():
+            updates.append(application.update_queue.get_nowait())
+        return statuses, updates
+
+    return asyncio.run(main())
+
+
+def test_wrong_secret_is_rejected():
+    statuses, updates = post_updates([("wrong", json.dumps(UPDATE)), ("", json.dumps(UPDATE))])
+    assert statuses == [403, 403]
+    assert updates == []
+
+
+def test_valid_update_reaches_update_queue():
+    statuses, updates = post_updates([(SECRET, json.dumps(UPDATE))])
+    assert statuses == [200]
+    assert [update.update_id for update in updates] == [1]
+    assert updates[0].message.text == "/start"
+
+
+def test_malformed_body_is_rejected():
+    statuses, updates = post_updates([(SECRET, "{not json"), (SECRET, "null")])
+    assert statuses == [400, 400]
+    assert updates == []
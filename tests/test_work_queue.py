@@ -0,0 +1,148 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+import pytest
+
+from benchmarks.stand_ins import SimulatedProcessor
+from elitemikobot.sticker_data import StickerData
+from elitemikobot.sticker_processor import RemoteStickerProcessor
+from elitemikobot.work_queue import HttpWorkQueue, SqliteWorkQueue, WorkQueueBackend
+from elitemikobot.work_queue_server import WorkQueueServer
+from elitemikobot.worker import Worker, WorkerConfig
+
+SECRET = "test-secret"
+
+
+# sqlite: 큐 DB를 직접 사용, http: 작업 큐 서버를 통해 사용 (봇/워커가 다른 서버에 있는 경우)
+@asynccontextmanager
+async def open_queues(kind: str, tmp_path, count: int = 1):
+    sqlite = SqliteWorkQueue(tmp_path / "queue" / "work_queue.sqlite3")
+    if kind == "sqlite":
+        yield [sqlite] * count
+        return
+
+    server = WorkQueueServer(sqlite, "127.0.0.1", 0, SECRET)
+    await server.start()
+    queues = [HttpWorkQueue(f"http://127.0.0.1:{server.port}", SECRET) for _ in range(count)]
+    try:
+        yield queues
+    finally:
+        for queue in queues:
+            await queue.close()
+        await server.stop()
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "http"])
+def test_claim_heartbeat_and_requeue_stale(tmp_path, kind):
+    async def main():
+        async with open_queues(kind, tmp_path) as (queue,):
+            first = await queue.put_job({"n": 1})
+            second = await queue.put_job({"n": 2})
+
+            claimed = await queue.claim_job("w1")
+            assert (claimed.id, claimed.payload, claimed.status, claimed.worker_id) == (first, {"n": 1}, WorkQueueBackend.RUNNING, "w1")
+            assert (await queue.claim_job("w2")).id == second
+            assert await queue.claim_job("w3") is None
+
+            await queue.heartbeat(first, "w1")
+            assert await queue.requeue_stale(60) == 0
+
+            # 하트비트가 끊긴 작업은 다시 대기 상태가 되어 다른 워커가 가져감
+            await asyncio.sleep(0.05)
+            await queue.heartbeat(second, "w2")
+            assert await queue.requeue_stale(0.02) == 1
+            job = await queue.get_job(first)
+            assert (job.status, job.worker_id) == (WorkQueueBackend.QUEUED, None)
+            assert (await queue.claim_job("w3")).id == first
+
+            await queue.finish_job(first, WorkQueueBackend.DONE, {"ok": True})
+            job = await queue.get_job(first)
+            assert (job.status, job.result) == (WorkQueueBackend.DONE, {"ok": True})
+            assert await queue.get_job("0" * 32) is None
+
+    asyncio.run(main())
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "http"])
+def test_events_and_files(tmp_path, kind):
+    async def main():
+        async with open_queues(kind, tmp_path) as (queue,):
+            job_id = await queue.put_job({})
+            await queue.post_event(job_id, "downloaded", {"num": 1})
+            await queue.post_event(job_id, "encoded", {"num": 1})
+            events = await queue.get_events(job_id)
+            assert [(event.stage, event.payload) for event in events] == [("downloaded", {"num": 1}), ("encoded", {"num": 1})]
+            assert [event.stage for event in await queue.get_events(job_id, events[0].seq)] == ["encoded"]
+
+            await queue.put_file(job_id, "1.png", b"png")
+            await queue.put_file(job_id, "2.webm", b"\x00" * 300_000)
+            assert await queue.get_files(job_id) == {"1.png": b"png", "2.webm": b"\x00" * 300_000}
+
+            # 결과 파일은 큐 DB 밖에 저장되고 작업을 삭제하면 함께 삭제됨
+            files_dir = tmp_path / "queue" / "work_queue_files" / job_id
+            assert sorted(path.name for path in files_dir.iterdir()) == ["1.png", "2.webm"]
+            await queue.delete_job(job_id)
+            assert not files_dir.exists()
+            assert await queue.get_job(job_id) is None
+            assert await queue.get_files(job_id) == {}
+
+    asyncio.run(main())
+
+
+def test_server_rejects_wrong_secret(tmp_path):
+    async def main():
+        server = WorkQueueServer(SqliteWorkQueue(tmp_path / "work_queue.sqlite3"), "127.0.0.1", 0, SECRET)
+        await server.start()
+        queue = HttpWorkQueue(f"http://127.0.0.1:{server.port}", "wrong")
+        try:
+            with pytest.raises(aiohttp.ClientResponseError) as error:
+                await queue.put_job({})
+            assert error.value.status == 403
+        finally:
+            await queue.close()
+            await server.stop()
+
+    asyncio.run(main())
+
+
+# 봇(RemoteStickerProcessor)이 넣은 작업을 워커가 처리하고, 봇이 결과 파일을 받아간 뒤 큐에서 삭제
+@pytest.mark.parametrize("kind", ["sqlite", "http"])
+def test_bot_worker_round_trip(tmp_path, monkeypatch, kind):
+    for name, value in {
+        "IMG_PATH": tmp_path / "worker" / "img",
+        "STICKER_IMG_PATH": tmp_path / "worker" / "sticker",
+        "JOB_PATH": tmp_path / "worker" / "jobs",
+        "SCRATCH_PATH": tmp_path / "worker" / "scratch",
+        "SCRATCH_QUOTA_MB": 0,
+        "RENDER_CACHE_PATH": tmp_path / "worker" / "render_cache",
+        "RENDER_CACHE_QUOTA_MB": 0,
+        "WORK_QUEUE_URL": kind,
+        "POLL_INTERVAL": 0.02,
+    }.items():
+        monkeypatch.setattr(WorkerConfig, name, value, raising=False)
+
+    async def main():
+        async with open_queues(kind, tmp_path, count=2) as (bot_queue, worker_queue):
+            worker = Worker(worker_queue, "w1")
+            worker.processor = SimulatedProcessor(WorkerConfig.STICKER_IMG_PATH, work_sec=0)
+            worker_task = asyncio.create_task(worker._run_loop())
+
+            remote = RemoteStickerProcessor(bot_queue, tmp_path / "bot" / "sticker", poll_interval_sec=0.02)
+            sticker_data = StickerData(id=9200001, user_id=1, user_name="user1")
+            try:
+                dccon_data = await asyncio.wait_for(remote.process(sticker_data), 10)
+            finally:
+                worker_task.cancel()
+                await asyncio.gather(worker_task, return_exceptions=True)
+
+            assert (dccon_data.count, sticker_data.count) == (2, 2)
+            out_dir = tmp_path / "bot" / "sticker" / "9200001"
+            assert sorted(path.name for path in out_dir.iterdir()) == ["1.png", "2.png"]
+            assert (out_dir / "1.png").read_bytes() == worker.processor._png
+            # 워커 작업 폴더와 큐의 작업/결과 파일은 모두 정리됨
+            assert not (WorkerConfig.STICKER_IMG_PATH / "9200001").exists()
+            assert list((tmp_path / "queue" / "work_queue_files").iterdir()) == []
+            assert await bot_queue.claim_job("w2") is None
+
+    asyncio.run(main())
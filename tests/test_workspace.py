@@ -0,0 +1,68 @@
+import asyncio
+import os
+import time
+
+from elitemikobot.deleter import Deleter
+from elitemikobot.workspace import WorkspaceManager
+
+
+def make_dir(root, key: str, mtime: float):
+    path = root / key
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "000.png").write_bytes(b"x" * 100)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+# 용량을 넘으면 사용하지 않는 폴더를 오래된 순서로 삭제, 사용 중인 폴더는 더 오래됐어도 유지
+def test_collect_evicts_idle_workspaces_oldest_first(tmp_path):
+    manager = WorkspaceManager(tmp_path, quota_mb=1)
+    manager.quota_bytes = 250
+    now = time.time()
+
+    async def main():
+        async with manager.use("in_use") as workspace:
+            make_dir(tmp_path, "in_use", now - 400)
+            workspace.last_used = 0
+            for key, age in (("old", 200), ("older", 300), ("new", 100)):
+                make_dir(tmp_path, key, now - age)
+            removed = await manager.collect()
+            left = sorted(path.name for path in tmp_path.iterdir())
+        return removed, left
+
+    removed, left = asyncio.run(main())
+    assert removed == 2
+    assert left == ["in_use", "new"]
+
+
+def test_collect_removes_expired_idle_workspaces(tmp_path):
+    manager = WorkspaceManager(tmp_path, ttl_sec=60)
+    make_dir(tmp_path, "expired", 1000)
+    make_dir(tmp_path, ".trash", 1000)
+
+    assert asyncio.run(manager.collect()) == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [".trash"]
+
+
+# 삭제 중인 경로가 있어도 다른 경로 삭제는 기다리지 않고, 같은 경로는 차례대로 삭제
+def test_deleter_locks_per_path(tmp_path):
+    busy = make_dir(tmp_path, "busy", 1000)
+    free = make_dir(tmp_path, "free", 1000)
+
+    async def main():
+        lock = Deleter._locks.setdefault(busy, asyncio.Lock())
+        await lock.acquire()
+
+        await asyncio.wait_for(Deleter.delete_paths([free]), timeout=1)
+        assert not free.exists()
+
+        waiting = asyncio.create_task(Deleter.delete_dccon(busy))
+        await asyncio.sleep(0.05)
+        assert not waiting.done() and busy.exists()
+
+        lock.release()
+        await asyncio.wait_for(waiting, timeout=1)
+        assert not busy.exists()
+
+    asyncio.run(main())
+    assert busy not in Deleter._locks and free not in Deleter._locks